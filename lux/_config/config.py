@@ -5,6 +5,7 @@ For more resources, see https://github.com/pandas-dev/pandas/blob/master/pandas/
 from collections import namedtuple
 from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 import lux
+import os
 import warnings
 
 RegisteredOption = namedtuple("RegisteredOption", "name action display_condition args")
@@ -28,6 +29,7 @@ class Config:
         self._sampling_start = 10000
         self._sampling_cap = 30000
         self._sampling_flag = True
+        self._sampling_strategy = "uniform"
         self._heatmap_flag = True
         self._plotting_backend = "vegalite"
         self._topk = 15
@@ -35,6 +37,22 @@ class Config:
         self._pandas_fallback = True
         self._interestingness_fallback = True
         self.heatmap_bin_size = 40
+        self._max_bar_groups = 1000
+        self._detection_sample_size = 200
+        self._detection_confidence = 1.0
+        self._max_unique_values = 1000
+        self._cache_size = 0
+        self._cache_dir = None
+        self._cache_dir_size = 1024
+        self._time_budget = None
+        self._action_time_budgets = {}
+        self._async_recommendations = False
+        self._lazy_display = False
+        self._lazy_display_delay = None
+        self._action_workers = 1
+        self._process_workers = 0
+        self._progressive_levels = []
+        self._ranking_strategy = "exhaustive"
 
     @property
     def topk(self):
@@ -206,6 +224,36 @@ class Config:
                 stacklevel=2,
             )
 
+    @property
+    def sampling_strategy(self):
+        """
+        Parameters
+        ----------
+        strategy : str
+            How the rows of large dataframes are sampled, either `uniform` (random sample) or `stratified`
+            (sample preserving the rare categories of the nominal attributes, whose rows are weighted so that
+            the counts, sums and means of the visualizations estimate the ones of the whole dataframe).
+        """
+        return self._sampling_strategy
+
+    @sampling_strategy.setter
+    def sampling_strategy(self, strategy: str) -> None:
+        """
+        Parameters
+        ----------
+        strategy : str
+            How the rows of large dataframes are sampled, either `uniform` (random sample) or `stratified`
+            (sample preserving the rare categories of the nominal attributes, whose rows are weighted so that
+            the counts, sums and means of the visualizations estimate the ones of the whole dataframe).
+        """
+        if isinstance(strategy, str) and strategy.lower() in ("uniform", "stratified"):
+            self._sampling_strategy = strategy.lower()
+        else:
+            warnings.warn(
+                "Parameter to lux.config.sampling_strategy must be either 'uniform' or 'stratified'.",
+                stacklevel=2,
+            )
+
     @property
     def heatmap(self):
         """
@@ -232,6 +280,499 @@ class Config:
                 stacklevel=2,
             )
 
+    @property
+    def max_bar_groups(self):
+        """
+        Parameters
+        ----------
+        max_groups : Union[int,bool]
+            Number of groups above which a bar chart only keeps its top groups, the remaining groups
+            being summarized by the executor.
+        """
+        return self._max_bar_groups
+
+    @max_bar_groups.setter
+    def max_bar_groups(self, max_groups: Union[int, bool]) -> None:
+        """
+        Parameters
+        ----------
+        max_groups : Union[int,bool]
+            False: if bar charts keep all of their groups
+            max_groups: number of groups above which only the top groups of a bar chart are kept
+        """
+        if max_groups is False or (type(max_groups) == int and max_groups > 0):
+            self._max_bar_groups = max_groups
+        else:
+            warnings.warn(
+                "Parameter to lux.config.max_bar_groups must be a positive integer or False.",
+                stacklevel=2,
+            )
+
+    @property
+    def detection_sample_size(self):
+        """
+        Parameters
+        ----------
+        sample_size : int
+            Number of distinct values of an attribute that are parsed to detect numbers and datetimes
+            stored as strings (or integers), before parsing all of the values if needed.
+        """
+        return self._detection_sample_size
+
+    @detection_sample_size.setter
+    def detection_sample_size(self, sample_size: int) -> None:
+        """
+        Parameters
+        ----------
+        sample_size : int
+            Number of distinct values of an attribute that are parsed to detect numbers and datetimes
+            stored as strings (or integers), before parsing all of the values if needed.
+        """
+        if type(sample_size) == int and sample_size > 0:
+            self._detection_sample_size = sample_size
+        else:
+            warnings.warn(
+                "Parameter to lux.config.detection_sample_size must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def detection_confidence(self):
+        """
+        Parameters
+        ----------
+        confidence : float
+            Minimum fraction of the values of an attribute that must be parsed as numbers (or datetimes)
+            for the attribute to be detected as such.
+        """
+        return self._detection_confidence
+
+    @detection_confidence.setter
+    def detection_confidence(self, confidence: float) -> None:
+        """
+        Parameters
+        ----------
+        confidence : float
+            Minimum fraction of the values of an attribute that must be parsed as numbers (or datetimes)
+            for the attribute to be detected as such, between 0 (exclusive) and 1 (all values).
+        """
+        if type(confidence) in (int, float) and 0 < confidence <= 1:
+            self._detection_confidence = float(confidence)
+        else:
+            warnings.warn(
+                "Parameter to lux.config.detection_confidence must be a number between 0 (exclusive) and 1.",
+                stacklevel=2,
+            )
+
+    @property
+    def max_unique_values(self):
+        """
+        Parameters
+        ----------
+        max_values : int
+            Maximum number of distinct values of an attribute kept in the frame metadata (`unique_values`).
+            Only the most frequent values of attributes with more distinct values are kept.
+        """
+        return self._max_unique_values
+
+    @max_unique_values.setter
+    def max_unique_values(self, max_values: int) -> None:
+        """
+        Parameters
+        ----------
+        max_values : int
+            Maximum number of distinct values of an attribute kept in the frame metadata (`unique_values`).
+            Only the most frequent values of attributes with more distinct values are kept.
+        """
+        if type(max_values) == int and max_values > 0:
+            self._max_unique_values = max_values
+        else:
+            warnings.warn(
+                "Parameter to lux.config.max_unique_values must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def cache_size(self):
+        """
+        Parameters
+        ----------
+        size : int
+            Maximum memory (in megabytes) of the process-wide cache of metadata and recommendations,
+            keyed by the fingerprint of the content of the dataframes. The cache is disabled when the size is 0.
+        """
+        return self._cache_size
+
+    @cache_size.setter
+    def cache_size(self, size: int) -> None:
+        """
+        Parameters
+        ----------
+        size : int
+            Maximum memory (in megabytes) of the process-wide cache of metadata and recommendations,
+            keyed by the fingerprint of the content of the dataframes. The cache is disabled when the size is 0.
+        """
+        if type(size) == int and size >= 0:
+            self._cache_size = size
+            from lux.core.cache import metadata_cache
+
+            if size == 0:
+                metadata_cache.clear()
+        else:
+            warnings.warn(
+                "Parameter to lux.config.cache_size must be a non-negative integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def cache_dir(self):
+        """
+        Parameters
+        ----------
+        directory : str
+            Directory where the metadata and recommendations of the dataframes are cached across sessions,
+            keyed by the path, size and modification time of the file they were read from, or else by the
+            fingerprint of their content, whose cost is linear in the size of the dataframe.
+            The on-disk cache is disabled when the directory is None.
+        """
+        return self._cache_dir
+
+    @cache_dir.setter
+    def cache_dir(self, directory: str) -> None:
+        """
+        Parameters
+        ----------
+        directory : str
+            Directory where the metadata and recommendations of the dataframes are cached across sessions,
+            keyed by the path, size and modification time of the file they were read from, or else by the
+            fingerprint of their content, whose cost is linear in the size of the dataframe.
+            The on-disk cache is disabled when the directory is None.
+        """
+        if directory is None or isinstance(directory, str):
+            self._cache_dir = None if directory is None else os.path.expanduser(directory)
+        else:
+            warnings.warn(
+                "Parameter to lux.config.cache_dir must be a string or None.",
+                stacklevel=2,
+            )
+
+    @property
+    def cache_dir_size(self):
+        """
+        Parameters
+        ----------
+        size : int
+            Maximum size (in megabytes) of the files of the on-disk cache in `lux.config.cache_dir`.
+            The least recently used files are removed when the files exceed this size.
+        """
+        return self._cache_dir_size
+
+    @cache_dir_size.setter
+    def cache_dir_size(self, size: int) -> None:
+        """
+        Parameters
+        ----------
+        size : int
+            Maximum size (in megabytes) of the files of the on-disk cache in `lux.config.cache_dir`.
+            The least recently used files are removed when the files exceed this size.
+        """
+        if type(size) == int and size > 0:
+            self._cache_dir_size = size
+        else:
+            warnings.warn(
+                "Parameter to lux.config.cache_dir_size must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def time_budget(self):
+        """
+        Parameters
+        ----------
+        budget : float
+            Time (in seconds) allowed to compute the recommendations of a dataframe, or None for no limit.
+            The actions are computed from the cheapest to the most expensive one, and the actions that
+            run out of time only show the visualizations computed so far.
+        """
+        return self._time_budget
+
+    @time_budget.setter
+    def time_budget(self, budget: float) -> None:
+        """
+        Parameters
+        ----------
+        budget : float
+            Time (in seconds) allowed to compute the recommendations of a dataframe, or None for no limit.
+            The actions are computed from the cheapest to the most expensive one, and the actions that
+            run out of time only show the visualizations computed so far.
+        """
+        if budget is None or (type(budget) in (int, float) and budget > 0):
+            self._time_budget = budget
+        else:
+            warnings.warn(
+                "Parameter to lux.config.time_budget must be a positive number or None.",
+                stacklevel=2,
+            )
+
+    @property
+    def action_time_budgets(self):
+        """
+        Parameters
+        ----------
+        budgets : dict
+            Time (in seconds) allowed to compute each action, by name of the registered action
+            (e.g., {"correlation": 0.5}), within the time budget of all the recommendations.
+        """
+        return self._action_time_budgets
+
+    @action_time_budgets.setter
+    def action_time_budgets(self, budgets: dict) -> None:
+        """
+        Parameters
+        ----------
+        budgets : dict
+            Time (in seconds) allowed to compute each action, by name of the registered action
+            (e.g., {"correlation": 0.5}), within the time budget of all the recommendations.
+        """
+        if isinstance(budgets, dict) and all(
+            type(budget) in (int, float) and budget > 0 for budget in budgets.values()
+        ):
+            self._action_time_budgets = dict(budgets)
+        else:
+            warnings.warn(
+                "Parameter to lux.config.action_time_budgets must be a dictionary of positive numbers.",
+                stacklevel=2,
+            )
+
+    @property
+    def async_recommendations(self):
+        """
+        Parameters
+        ----------
+        flag : bool
+            Whether the metadata and recommendations are computed in the background when a dataframe
+            is displayed, so that the table is displayed immediately and the visualizations of each
+            action are added to the widget as soon as they are computed.
+        """
+        return self._async_recommendations
+
+    @async_recommendations.setter
+    def async_recommendations(self, flag: bool) -> None:
+        """
+        Parameters
+        ----------
+        flag : bool
+            Whether the metadata and recommendations are computed in the background when a dataframe
+            is displayed, so that the table is displayed immediately and the visualizations of each
+            action are added to the widget as soon as they are computed.
+        """
+        if isinstance(flag, bool):
+            self._async_recommendations = flag
+            if flag:
+                from lux.action.scheduler import watch_cells
+
+                watch_cells()
+        else:
+            warnings.warn(
+                "The flag for asynchronous recommendations must be a boolean.",
+                stacklevel=2,
+            )
+
+    @property
+    def lazy_display(self):
+        """
+        Parameters
+        ----------
+        flag : bool
+            Whether the metadata and recommendations of a dataframe displayed as a Pandas table
+            (see `default_display`) are only computed when the user toggles to the Lux widget.
+        """
+        return self._lazy_display
+
+    @lazy_display.setter
+    def lazy_display(self, flag: bool) -> None:
+        """
+        Parameters
+        ----------
+        flag : bool
+            Whether the metadata and recommendations of a dataframe displayed as a Pandas table
+            (see `default_display`) are only computed when the user toggles to the Lux widget.
+        """
+        if isinstance(flag, bool):
+            self._lazy_display = flag
+        else:
+            warnings.warn(
+                "The flag for lazy display must be a boolean.",
+                stacklevel=2,
+            )
+
+    @property
+    def lazy_display_delay(self):
+        """
+        Parameters
+        ----------
+        delay : float
+            With `lazy_display`, time (in seconds) that the notebook must be idle after a dataframe is
+            displayed before its recommendations are computed in the background, or None to only compute
+            them when the user toggles to the Lux widget.
+        """
+        return self._lazy_display_delay
+
+    @lazy_display_delay.setter
+    def lazy_display_delay(self, delay: float) -> None:
+        """
+        Parameters
+        ----------
+        delay : float
+            With `lazy_display`, time (in seconds) that the notebook must be idle after a dataframe is
+            displayed before its recommendations are computed in the background, or None to only compute
+            them when the user toggles to the Lux widget.
+        """
+        if delay is None or (type(delay) in (int, float) and delay >= 0):
+            self._lazy_display_delay = delay
+            if delay is not None:
+                from lux.action.scheduler import watch_cells
+
+                watch_cells()
+        else:
+            warnings.warn(
+                "Parameter to lux.config.lazy_display_delay must be a non-negative number or None.",
+                stacklevel=2,
+            )
+
+    @property
+    def action_workers(self):
+        """
+        Parameters
+        ----------
+        workers : int
+            Number of threads computing the actions of the recommendations in parallel
+            (the actions are computed one after the other with 1 thread).
+        """
+        return self._action_workers
+
+    @action_workers.setter
+    def action_workers(self, workers: int) -> None:
+        """
+        Parameters
+        ----------
+        workers : int
+            Number of threads computing the actions of the recommendations in parallel
+            (the actions are computed one after the other with 1 thread).
+        """
+        if type(workers) is int and workers >= 1:
+            self._action_workers = workers
+        else:
+            warnings.warn(
+                "Parameter to lux.config.action_workers must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def process_workers(self):
+        """
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes computing the histograms and aggregations of large dataframes
+            over their columns published in shared memory, or 0 to compute them in the current process.
+        """
+        return self._process_workers
+
+    @process_workers.setter
+    def process_workers(self, workers: int) -> None:
+        """
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes computing the histograms and aggregations of large dataframes
+            over their columns published in shared memory, or 0 to compute them in the current process.
+        """
+        from lux.executor import parallel
+
+        if type(workers) is int and workers > 0 and not parallel.available():
+            warnings.warn(
+                "lux.config.process_workers requires multiprocessing.shared_memory (Python 3.8 or later), "
+                "the vis are computed in the current process.",
+                stacklevel=2,
+            )
+            self._process_workers = 0
+        elif type(workers) is int and workers >= 0:
+            self._process_workers = workers
+            if workers == 0:
+                parallel.shutdown()
+        else:
+            warnings.warn(
+                "Parameter to lux.config.process_workers must be a non-negative integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def progressive_levels(self):
+        """
+        Parameters
+        ----------
+        levels : list
+            Number of rows of the levels of the sample pyramid (e.g., [1000, 10000]) from which approximate
+            recommendations are shown while the recommendations are computed in the background
+            (see `async_recommendations`), or an empty list to only show the exact recommendations.
+        """
+        return self._progressive_levels
+
+    @progressive_levels.setter
+    def progressive_levels(self, levels: list) -> None:
+        """
+        Parameters
+        ----------
+        levels : list
+            Number of rows of the levels of the sample pyramid (e.g., [1000, 10000]) from which approximate
+            recommendations are shown while the recommendations are computed in the background
+            (see `async_recommendations`), or an empty list to only show the exact recommendations.
+        """
+        if isinstance(levels, (list, tuple)) and all(
+            type(level) is int and level > 0 for level in levels
+        ):
+            self._progressive_levels = sorted(set(levels))
+        else:
+            warnings.warn(
+                "Parameter to lux.config.progressive_levels must be a list of positive integers.",
+                stacklevel=2,
+            )
+
+    @property
+    def ranking_strategy(self):
+        """
+        Parameters
+        ----------
+        strategy : str
+            How the candidate visualizations of the Enhance and Filter actions are ranked, either
+            `exhaustive` (every candidate is scored on the sample of the dataframe) or `successive_halving`
+            (the candidates are scored on increasingly large subsamples, dropping those whose score is too
+            far from the top k ones to reach them, so that only the best ones are scored on the sample of
+            the dataframe).
+        """
+        return self._ranking_strategy
+
+    @ranking_strategy.setter
+    def ranking_strategy(self, strategy: str) -> None:
+        """
+        Parameters
+        ----------
+        strategy : str
+            How the candidate visualizations of the Enhance and Filter actions are ranked, either
+            `exhaustive` (every candidate is scored on the sample of the dataframe) or `successive_halving`
+            (the candidates are scored on increasingly large subsamples, dropping those whose score is too
+            far from the top k ones to reach them, so that only the best ones are scored on the sample of
+            the dataframe).
+        """
+        if isinstance(strategy, str) and strategy.lower() in ("exhaustive", "successive_halving"):
+            self._ranking_strategy = strategy.lower()
+        else:
+            warnings.warn(
+                "Parameter to lux.config.ranking_strategy must be either 'exhaustive' or 'successive_halving'.",
+                stacklevel=2,
+            )
+
     @property
     def default_display(self):
         """
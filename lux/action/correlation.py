@@ -13,11 +13,15 @@
 #  limitations under the License.
 
 import lux
-from lux.interestingness.interestingness import interestingness
+from lux.interestingness.interestingness import interestingness, pairwise_monotonicity
 from lux.processor.Compiler import Compiler
+from lux.processor.Parser import Parser
 from lux.core.frame import LuxDataFrame
+from lux.vis.Vis import Vis
 from lux.vis.VisList import VisList
+from lux.executor.PandasExecutor import PandasExecutor
 from lux.utils import utils
+import copy
 
 
 # change ignore_transpose to false for now.
@@ -47,6 +51,93 @@ def correlation(ldf: LuxDataFrame, ignore_transpose: bool = True):
         lux.Clause("?", data_model="measure"),
     ]
     intent.extend(filter_specs)
+    if lux.config.executor.name != "PandasExecutor":
+        return _correlation_vislist(ldf, intent, ignore_transpose)
+
+    wildcards = Compiler.populate_wildcard_options(Parser.parse(intent), ldf)
+    measures = [clause.attribute for clause in wildcards["attributes"][0]]
+    filters = wildcards["filters"] if len(wildcards["filters"]) > 0 else [None]
+    # enumerate the pairs in the same order as the compiled VisList, where x is the outer loop and
+    # y the inner one, keeping the transpose that comes last (i.e., {X,Y} is ignored if {Y,X} is present)
+    pairs = []
+    for x_idx, x in enumerate(measures):
+        for y_idx, y in enumerate(measures):
+            if x_idx == y_idx or (ignore_transpose and y_idx > x_idx):
+                continue
+            for fltr in filters:
+                if fltr is None or fltr.attribute not in (x, y):
+                    pairs.append((x_idx, y_idx, fltr))
+    examples = ""
+    example_measures = [x for x in measures if x not in [fltr.attribute for fltr in filter_specs]]
+    if len(example_measures) >= 2:
+        examples = f" (e.g., {example_measures[0]}, {example_measures[1]})"
+    recommendation = {
+        "action": "Correlation",
+        "description": "Show relationships between two <p class='highlight-descriptor'>quantitative</p> attributes.",
+        "long_description": f"Correlation searches through all pairwise relationship between two quantitative attributes\
+            {examples}. The visualizations are ranked from most to least linearly correlated based on \
+                their Pearson’s correlation score.",
+    }
+    # Doesn't make sense to compute correlation if less than 4 data values
+    if len(ldf) < 5 or len(pairs) == 0:
+        recommendation["collection"] = []
+        return recommendation
+
+    # Score all pairs at once with a correlation matrix over the (filtered) sample
+    lux.config.executor.execute_sampling(ldf)
+    scores = {}
+    for fltr in filters:
+        data = ldf._sampled
+        if fltr is not None:
+            data = PandasExecutor.apply_filter(data, fltr.attribute, fltr.filter_op, fltr.value)
+            data = data[data[fltr.attribute].notnull()]
+        if len(data) < 10:
+            scores[id(fltr)] = np.full((len(measures), len(measures)), -1.0)
+        else:
+            scores[id(fltr)] = pairwise_monotonicity(data, measures)
+    ranked = []
+    for x_idx, y_idx, fltr in pairs:
+        score = scores[id(fltr)][x_idx, y_idx]
+        if score != -1:
+            ranked.append((score, x_idx, y_idx, fltr))
+    if lux.config.sort != "none":
+        ranked.sort(key=lambda x: x[0], reverse=lux.config.sort != "ascending")
+    k = lux.config.topk
+    if k != False and isinstance(k, int):
+        ranked = ranked[: abs(k)]
+
+    # Only the visualizations that are shown are built and executed
+    output = []
+    for score, x_idx, y_idx, fltr in ranked:
+        vis_intent = [lux.Clause(attribute=measures[x_idx]), lux.Clause(attribute=measures[y_idx])]
+        if fltr is not None:
+            vis_intent.append(copy.deepcopy(fltr))
+        output.append(Vis(vis_intent, score=score))
+    recommendation["collection"] = VisList(output, ldf)
+    return recommendation
+
+
+def _correlation_vislist(ldf: LuxDataFrame, intent: list, ignore_transpose: bool = True):
+    """
+    Generates the Correlation action by compiling, executing and scoring the visualization of every pair of
+    measures, for executors that do not hold the data in memory.
+
+    Parameters
+    ----------
+    ldf : LuxDataFrame
+            LuxDataFrame with underspecified intent.
+
+    intent : list
+            List of Clause objects for a pair of measures and the filters of the ldf's intent
+
+    ignore_transpose: bool
+            Boolean flag to ignore pairs of attributes whose transpose are already computed (i.e., {X,Y} will be ignored if {Y,X} is already computed)
+
+    Returns
+    -------
+    recommendations : Dict[str,obj]
+            object with a collection of visualizations that result from the Correlation action.
+    """
     vlist = VisList(intent, ldf)
     examples = ""
     if len(vlist) > 1:
@@ -13,9 +13,11 @@
 #  limitations under the License.
 
 from lux.interestingness.interestingness import interestingness
+from lux.action import scheduler
 import lux
 from lux.executor.PandasExecutor import PandasExecutor
 from lux.executor.SQLExecutor import SQLExecutor
+import time
 import lux
 
 
@@ -50,7 +52,7 @@ def custom(ldf):
     return recommendation
 
 
-def custom_actions(ldf):
+def custom_actions(ldf, job=None):
     """
     Generates user-defined vis based on globally defined actions.
 
@@ -58,6 +60,9 @@ def custom_actions(ldf):
     ----------
     ldf : lux.core.frame
         LuxDataFrame with underspecified intent.
+    job : lux.action.scheduler.BackgroundJob, optional
+        Background computation the actions are part of, to which each action is pushed when it is computed,
+        by default None
 
     Returns
     -------
@@ -65,16 +70,49 @@ def custom_actions(ldf):
         object with a collection of visualizations that were previously registered.
     """
     if len(lux.config.actions) > 0 and len(ldf) > 0:
-        recommendations = []
-        for action_name in lux.config.actions.keys():
-            display_condition = lux.config.actions[action_name].display_condition
-            if display_condition is None or (display_condition is not None and display_condition(ldf)):
-                args = lux.config.actions[action_name].args
-                if args:
-                    recommendation = lux.config.actions[action_name].action(ldf, args)
+        # the actions are computed from the cheapest to the most expensive one when there is a time budget
+        # (possibly in parallel, see `lux.config.action_workers`), and returned in the order of registration
+        start = time.perf_counter()
+        recommendations = {}
+        skipped, truncated = [], []
+
+        def compute(option):
+            if job is not None and job.cancelled:
+                return None
+            deadline = scheduler.action_deadline(start, option)
+            if deadline is not None and time.perf_counter() > deadline:
+                skipped.append(option.name)
+                return None
+            with scheduler.running(deadline):
+                if option.args:
+                    recommendation = option.action(ldf, option.args)
                 else:
-                    recommendation = lux.config.actions[action_name].action(ldf)
-                recommendations.append(recommendation)
-        return recommendations
+                    recommendation = option.action(ldf)
+            if deadline is not None and scheduler.drop_unexecuted(recommendation) > 0:
+                truncated.append(recommendation["action"])
+            return recommendation
+
+        options = [
+            option
+            for option in scheduler.schedule(ldf, list(lux.config.actions.values()))
+            if option.display_condition is None or option.display_condition(ldf)
+        ]
+        for option, recommendation in scheduler.compute_actions(ldf, options, compute):
+            if recommendation is None:
+                continue
+            recommendations[option.name] = recommendation
+            if job is not None:
+                job.publish(recommendation)
+        if len(skipped) > 0:
+            ldf._message.add(
+                f"Lux skipped the {', '.join(skipped)} recommendations to stay within the time budget.",
+                priority=90,
+            )
+        if len(truncated) > 0:
+            ldf._message.add(
+                f"Lux only searched part of the {', '.join(truncated)} visualizations to stay within the time budget.",
+                priority=90,
+            )
+        return [recommendations[name] for name in lux.config.actions if name in recommendations]
     else:
         return []
@@ -13,6 +13,7 @@
 #  limitations under the License.
 
 import lux
+from lux.action import ranking
 from lux.interestingness.interestingness import interestingness
 from lux.processor.Compiler import Compiler
 from lux.utils import utils
@@ -62,13 +63,8 @@ def enhance(ldf):
         clause.channel = ""
     intent = filters + attr_specs
     intent.append("?")
-    vlist = lux.vis.VisList.VisList(intent, ldf)
-
-    # Then use the data populated in the vis list to compute score
-    for vis in vlist:
-        vis.score = interestingness(vis, ldf)
-
-    vlist.sort()
-    vlist = vlist.showK()
-    recommendation["collection"] = vlist
+    # the candidates are only compiled, and executed as they are ranked
+    vlist = lux.vis.VisList.VisList(intent)
+    vlist.refresh_source(ldf, execute=False)
+    recommendation["collection"] = ranking.top_k(vlist, ldf)
     return recommendation
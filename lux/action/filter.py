@@ -13,6 +13,7 @@
 #  limitations under the License.
 
 import lux
+from lux.action import ranking
 from lux.interestingness.interestingness import interestingness
 from lux.vis.Vis import Vis
 from lux.vis.VisList import VisList
@@ -132,14 +133,18 @@ def add_filter(ldf):
         # array of possible values for attribute
         arr = ldf[last.attribute].unique().tolist()
         output.append(lux.Clause(last.attribute, last.attribute, arr))
+    if recommendation["action"] != "Similarity":
+        # the candidates are only compiled, and executed as they are ranked
+        vlist = lux.vis.VisList.VisList(output)
+        vlist.refresh_source(ldf, execute=False)
+        recommendation["collection"] = ranking.top_k(vlist, ldf)
+        return recommendation
     vlist = lux.vis.VisList.VisList(output, ldf)
+    # similarity scoring normalizes the vis data in-place, so the scores are computed on a separate copy
     vlist_copy = lux.vis.VisList.VisList(output, ldf)
     for i in range(len(vlist_copy)):
         vlist[i].score = interestingness(vlist_copy[i], ldf)
     vlist.sort()
     vlist = vlist.showK()
-    if recommendation["action"] == "Similarity":
-        recommendation["collection"] = vlist[1:]
-    else:
-        recommendation["collection"] = vlist
+    recommendation["collection"] = vlist[1:]
     return recommendation
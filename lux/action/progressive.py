@@ -0,0 +1,182 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import copy
+import numpy as np
+import pandas as pd
+import lux
+
+# quantile of the normal distribution giving the 95% margins of error of the approximate counts
+MARGIN_Z = 1.96
+
+
+def levels(ldf) -> list:
+    """
+    Number of rows of the levels of the sample pyramid of a dataframe (see `lux.config.progressive_levels`),
+    leaving out the levels that are not smaller than the sample the recommendations are computed on
+
+    Parameters
+    ----------
+    ldf : lux.core.frame
+        LuxDataFrame the recommendations are computed for
+
+    Returns
+    -------
+    list
+        Number of rows of each level, in increasing order
+    """
+    n_rows = len(ldf)
+    if lux.config.sampling and n_rows > lux.config.sampling_start:
+        if n_rows > lux.config.sampling_cap:
+            n_rows = lux.config.sampling_cap
+        else:
+            n_rows = int(round(0.75 * n_rows))
+    return [n_level for n_level in lux.config.progressive_levels if n_level < n_rows]
+
+
+def refine(ldf, job) -> None:
+    """
+    Show approximate recommendations in the widget of a background job before the recommendations are
+    computed on the sample of the dataframe: the actions are computed on the smallest level of the sample
+    pyramid, then the visualizations they recommend are computed again on each larger level, and the widget
+    is updated in place each time. The approximate visualizations are flagged with the margin of error
+    of their counts, and replaced by the exact ones as each action is computed (see `BackgroundJob.publish`).
+
+    Parameters
+    ----------
+    ldf : lux.core.frame
+        LuxDataFrame the recommendations are computed for, whose metadata is computed
+    job : lux.action.scheduler.BackgroundJob
+        Background computation of the recommendations
+    """
+    from lux.action.custom import custom_actions
+
+    sizes = levels(ldf)
+    if len(sizes) == 0 or job.widget is None or job.cancelled:
+        return
+    order = level_order(ldf, sizes[-1])
+    rec_infolist = None
+    for n_rows in sizes:
+        level = level_frame(ldf, order[:n_rows])
+        if rec_infolist is None:
+            # the visualizations are ranked on the smallest level
+            rec_infolist = [rec for rec in custom_actions(level) if len(rec["collection"]) > 0]
+        else:
+            rec_infolist = [_execute_again(rec, level) for rec in rec_infolist]
+        if job.cancelled:
+            return
+        previews = [_flag_approximate(rec, n_rows, len(ldf)) for rec in rec_infolist]
+        job.preview(
+            previews,
+            "<ul><li>Lux is refining the visualizations, which are approximated from a random sample of "
+            f"{n_rows} rows (± 95% margin of error of the counts).</li></ul>",
+        )
+
+
+def error_bound(vis, n_rows: int, total: int) -> float:
+    """
+    Relative 95% margin of error of the counts of a visualization computed on a uniform sample of the rows
+    (the largest margin of its bars, which is the one of the smallest bar)
+
+    Parameters
+    ----------
+    vis : lux.vis.Vis
+        Visualization computed on the sample
+    n_rows : int
+        Number of rows of the sample
+    total : int
+        Number of rows of the dataframe
+
+    Returns
+    -------
+    float
+        Margin of error relative to the counts (at most 1), or None when the visualization has no counts
+    """
+    data = vis.data
+    column = "Number of Records" if vis.mark == "histogram" else "Record"
+    if data is None or vis.mark not in ("bar", "line", "histogram", "geographical"):
+        return None
+    if column not in data.columns:
+        return None
+    counts = data[column].to_numpy(dtype=float)
+    counts = counts[counts > 0]
+    if len(counts) == 0 or n_rows >= total:
+        return None
+    proportion = counts.min() / total
+    correction = (total - n_rows) / (total - 1)
+    margin = MARGIN_Z * np.sqrt((1 - proportion) / (n_rows * proportion) * correction)
+    return float(min(margin, 1.0))
+
+
+def level_order(ldf, n_rows: int) -> np.ndarray:
+    """
+    Positions of rows of the dataframe in random order, whose first rows form the levels of its sample
+    pyramid (of at most n_rows rows)
+    """
+    rows = ldf._sample_rows
+    if rows is not None and rows[1] == len(ldf) and rows[3] is None and len(rows[2]) >= n_rows:
+        # the levels are nested in the uniform sample of the dataframe
+        return rows[2]
+    return np.random.RandomState(1).permutation(len(ldf))
+
+
+def level_frame(ldf, positions, weighted: bool = True):
+    """
+    Dataframe sharing the data, metadata and encodings of ldf, whose sample is a level of the sample
+    pyramid of ldf (the rows at the positions). When weighted, the rows of the level are weighted so that
+    the counts and sums computed on it estimate the ones of ldf.
+    """
+    from lux.core.frame import LuxDataFrame
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    level = LuxDataFrame(ldf)
+    level._data_type = ldf._data_type
+    level.unique_values = ldf.unique_values
+    level.cardinality = ldf.cardinality
+    level._min_max = ldf._min_max
+    level._column_profile = ldf._column_profile
+    level._type_override = ldf._type_override
+    level.pre_aggregated = ldf.pre_aggregated
+    level._metadata_fresh = True
+    level._intent = ldf._intent
+    level._inferred_intent = ldf._inferred_intent
+    level._current_vis = ldf._current_vis
+    PandasExecutor._link_encodings(level, ldf)
+    level._sampled = ldf.take(positions)
+    if weighted:
+        level._sampled._sample_weights = pd.Series(
+            len(ldf) / len(positions), index=level._sampled.index, dtype=float
+        )
+    level._sample_level = len(positions)
+    return level
+
+
+def _execute_again(rec_info: dict, level) -> dict:
+    # same recommendation, with its visualizations computed on another level
+    collection = [copy.copy(vis) for vis in rec_info["collection"]]
+    lux.config.executor.execute(collection, level)
+    return {**rec_info, "collection": collection}
+
+
+def _flag_approximate(rec_info: dict, n_rows: int, total: int) -> dict:
+    collection = []
+    for vis in rec_info["collection"]:
+        bound = error_bound(vis, n_rows, total)
+        flag = "≈" if bound is None else f"≈ ±{bound:.0%}"
+        flagged = copy.copy(vis)
+        flagged.title = f"{vis.title} ({flag})" if vis.title else flag
+        # the widget specs are computed from the data of the vis (see `BackgroundJob.preview`)
+        flagged._source = None
+        collection.append(flagged)
+    return {**rec_info, "collection": collection}
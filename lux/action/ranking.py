@@ -0,0 +1,125 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import copy
+import math
+import lux
+from lux.action import progressive
+from lux.executor.PandasExecutor import PandasExecutor
+from lux.interestingness.interestingness import interestingness
+from lux.vis.VisList import VisList
+
+# number of rows of the sample the candidates are first pruned on
+HALVING_MIN_ROWS = 1000
+# factor by which the rows the candidates are scored on are increased at each round
+HALVING_FACTOR = 3
+
+
+def top_k(vlist: VisList, ldf) -> VisList:
+    """
+    Score the candidate visualizations of an action, and keep the top k ones (see `lux.config.topk`)
+    sorted by score, as `VisList.sort` and `VisList.showK` do.
+
+    With the "successive_halving" ranking strategy (see `lux.config.ranking_strategy`), the candidates are
+    scored on random samples of the dataframe three times larger at each round, until k candidates are
+    left or the sample reaches the one the visualizations are computed on. After each round, the
+    candidates that cannot reach the top k are dropped: those whose score is further from the k-th best
+    score than twice the largest change of score seen between the last two samples. The remaining
+    candidates are then executed and scored on the sample of the dataframe, so that their data and scores
+    are exact, while the candidates that are clearly out of the top k are only scored on small samples.
+
+    Parameters
+    ----------
+    vlist : VisList
+        Compiled candidate visualizations, which are not executed yet
+    ldf : lux.core.frame
+        LuxDataFrame the visualizations are recommended for
+
+    Returns
+    -------
+    VisList
+        Top k visualizations, executed and sorted by score
+    """
+    candidates = list(vlist)
+    if _use_halving(candidates, ldf):
+        k = abs(lux.config.topk)
+        n_sample = len(ldf._sampled)
+        order = progressive.level_order(ldf, n_sample)
+        # the first sample only serves to measure how much the scores change on the next one
+        n_rows = HALVING_MIN_ROWS // HALVING_FACTOR
+        previous = None
+        while len(candidates) > k and n_rows < n_sample:
+            # the scores do not depend on the scale of the counts, which are left unweighted
+            level = progressive.level_frame(ldf, order[:n_rows], weighted=False)
+            scored = [copy.copy(vis) for vis in candidates]
+            lux.config.executor.execute(scored, level)
+            scores = {
+                id(vis): interestingness(copy_vis, level) for vis, copy_vis in zip(candidates, scored)
+            }
+            if previous is not None:
+                candidates = _reachable(candidates, scores, _spread(previous, scores), k)
+            previous = scores
+            n_rows *= HALVING_FACTOR
+        vlist = VisList(candidates)
+    lux.config.executor.execute(vlist, ldf)
+    for vis in vlist:
+        vis.score = interestingness(vis, ldf)
+    vlist.sort()
+    return vlist.showK()
+
+
+def _use_halving(candidates: list, ldf) -> bool:
+    # the candidates are only pruned when the k best ones are shown, and are much fewer than the candidates
+    k = lux.config.topk
+    if lux.config.ranking_strategy != "successive_halving" or lux.config.sort == "none":
+        return False
+    if isinstance(k, bool) or not isinstance(k, int) or len(candidates) <= HALVING_FACTOR * abs(k):
+        return False
+    if not isinstance(lux.config.executor, PandasExecutor):
+        return False
+    PandasExecutor.execute_sampling(ldf)
+    return len(ldf._sampled) > HALVING_FACTOR * HALVING_MIN_ROWS
+
+
+def _spread(previous: dict, scores: dict) -> float:
+    # largest change of the valid scores (not -1) of the candidates between two samples
+    changes = [
+        abs(score - previous[key])
+        for key, score in scores.items()
+        if score != -1 and previous.get(key, -1) != -1
+    ]
+    changes = [change for change in changes if not math.isnan(change)]
+    return max(changes, default=math.inf)
+
+
+def _reachable(candidates: list, scores: dict, spread: float, k: int) -> list:
+    # candidates that may still be in the top k in the order of `lux.config.sort`, knowing that the scores
+    # of the candidates may each change by the spread on a larger sample, the invalid ones (-1) coming last
+    descending = lux.config.sort != "ascending"
+
+    def rank(vis):
+        score = scores[id(vis)]
+        return (score == -1, -score if descending else score)
+
+    # sorted is stable, so that candidates of equal score keep their order
+    ranked = sorted(candidates, key=rank)
+    kth = scores[id(ranked[k - 1])]
+    if kth == -1 or math.isnan(kth) or math.isinf(spread):
+        return ranked
+    bound = kth - 2 * spread if descending else kth + 2 * spread
+
+    def reachable(score):
+        return score != -1 and (score >= bound if descending else score <= bound)
+
+    return [vis for i, vis in enumerate(ranked) if i < k or reachable(scores[id(vis)])]
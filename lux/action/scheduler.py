@@ -0,0 +1,499 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+import threading
+import time
+import traceback
+import warnings
+import weakref
+import lux
+
+# deadline (in seconds, from time.perf_counter) of the action being computed in each thread, along with
+# the background job it is computed for (see `running`)
+_state = threading.local()
+# worker computing the recommendations in the background, and the jobs it was given (see `BackgroundJob`)
+_worker = None
+_jobs = weakref.WeakSet()
+# id of the notebook cell being executed, when known (see `watch_cells`)
+_current_cell = None
+# threads computing the actions in parallel (see `compute_actions`), along with their number
+_action_pool = None
+_action_pool_size = 0
+
+
+class JobCancelled(Exception):
+    """
+    Raised in the worker of a background job that is cancelled while it computes the metadata of the
+    dataframe, so that the modification that cancelled the job does not wait for the whole metadata
+    """
+
+
+def budget_expired() -> bool:
+    """
+    Whether the time budget of the action being computed has run out, or the background job it is computed
+    for has been cancelled, in which case the executor leaves the remaining visualizations of the action
+    without data (see `PandasExecutor.execute`)
+    """
+    job = getattr(_state, "job", None)
+    if job is not None and job.cancelled:
+        return True
+    deadline = getattr(_state, "deadline", None)
+    return deadline is not None and time.perf_counter() > deadline
+
+
+def check_cancelled() -> None:
+    """
+    Raise `JobCancelled` when the background job computed in this thread has been cancelled
+    """
+    job = getattr(_state, "job", None)
+    if job is not None and job.cancelled:
+        raise JobCancelled()
+
+
+@contextmanager
+def running(deadline: float, job=None):
+    """
+    Enforce the deadline (in seconds, from time.perf_counter) while computing an action, along with the
+    cancellation of the background job it is computed for (by default, the job of the current thread)
+    """
+    previous = (getattr(_state, "deadline", None), getattr(_state, "job", None))
+    _state.deadline = deadline
+    if job is not None:
+        _state.job = job
+    try:
+        yield
+    finally:
+        _state.deadline, _state.job = previous
+
+
+def estimate_cost(ldf, option) -> float:
+    """
+    Estimate the cost of an action on a dataframe, from the number of rows that are processed (a sample of
+    large dataframes) and the number and cardinality of the attributes that the action visualizes.
+
+    Parameters
+    ----------
+    ldf : lux.core.frame
+        LuxDataFrame the recommendations are computed for
+    option : RegisteredOption
+        Registered action
+
+    Returns
+    -------
+    float
+        Relative cost of the action
+    """
+    from lux.action.correlation import correlation
+    from lux.action.univariate import univariate
+
+    n_rows = len(ldf)
+    if lux.config.sampling:
+        n_rows = min(n_rows, lux.config.sampling_cap)
+    inverted_data_type = lux.config.executor.invert_data_type(ldf.data_type)
+    if option.action is correlation:
+        attributes = inverted_data_type["quantitative"]
+    elif option.action is univariate and option.args:
+        attributes = inverted_data_type.get(option.args[0], [])
+    else:
+        attributes = list(ldf.columns)
+    cardinality = ldf.cardinality or {}
+    return float(sum(n_rows + cardinality.get(attr, 0) for attr in attributes))
+
+
+def schedule(ldf, options: list) -> list:
+    """
+    Order the actions to compute within the time budget (`lux.config.time_budget`) from the cheapest
+    to the most expensive one, so that the cheap actions are not skipped because of an expensive one.
+
+    Parameters
+    ----------
+    ldf : lux.core.frame
+        LuxDataFrame the recommendations are computed for
+    options : list
+        Registered actions, in the order of registration
+
+    Returns
+    -------
+    list
+        Registered actions, in the order they are computed
+    """
+    if lux.config.time_budget is None and not lux.config.action_time_budgets:
+        return list(options)
+    costs = {option.name: estimate_cost(ldf, option) for option in options}
+    # sorted is stable, so that actions of equal cost keep the order of registration
+    return sorted(options, key=lambda option: costs[option.name])
+
+
+def compute_actions(ldf, options: list, compute):
+    """
+    Compute the actions, in parallel on `lux.config.action_workers` threads when there are more than one.
+    An action that raises an error is skipped with a warning (unless `lux.config.pandas_fallback` is
+    disabled), so that it does not prevent the other actions from being displayed.
+
+    Parameters
+    ----------
+    ldf : lux.core.frame
+        LuxDataFrame the recommendations are computed for
+    options : list
+        Registered actions, in the order they are started
+    compute : callable
+        Function computing the recommendation of a registered action (or None when it is skipped)
+
+    Yields
+    ------
+    tuple
+        Registered action and its recommendation, in the order the actions complete
+    """
+    workers = min(lux.config.action_workers, len(options))
+    if workers <= 1:
+        for option in options:
+            try:
+                recommendation = compute(option)
+            except JobCancelled:
+                raise
+            except Exception:
+                if not lux.config.pandas_fallback:
+                    raise
+                _warn_action_failed(option)
+                continue
+            yield option, recommendation
+        return
+    _prepare_shared_state(ldf)
+    # the actions are cancelled along with the background job they are computed for
+    job = getattr(_state, "job", None)
+
+    def compute_for_job(option):
+        with running(None, job):
+            return compute(option)
+
+    futures = {_get_action_pool(workers).submit(compute_for_job, option): option for option in options}
+    try:
+        for future in as_completed(futures):
+            option = futures[future]
+            try:
+                recommendation = future.result()
+            except JobCancelled:
+                raise
+            except Exception:
+                if not lux.config.pandas_fallback:
+                    raise
+                _warn_action_failed(option)
+                continue
+            yield option, recommendation
+    finally:
+        # the actions that were not started are not needed anymore when the iteration stops early
+        for future in futures:
+            future.cancel()
+
+
+def _warn_action_failed(option) -> None:
+    warnings.warn(
+        f"\nUnexpected error in computing the {option.name} recommendations, which are not displayed.\n"
+        + traceback.format_exc(),
+        stacklevel=2,
+    )
+
+
+def _get_action_pool(workers: int) -> ThreadPoolExecutor:
+    global _action_pool, _action_pool_size
+    if _action_pool is None or _action_pool_size != workers:
+        if _action_pool is not None:
+            _action_pool.shutdown(wait=False)
+        _action_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lux-action")
+        _action_pool_size = workers
+    return _action_pool
+
+
+def _prepare_shared_state(ldf) -> None:
+    # fill the state that the actions otherwise initialize lazily on the dataframe, so that the threads
+    # computing the actions share it instead of computing it concurrently
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    if isinstance(lux.config.executor, PandasExecutor):
+        PandasExecutor.execute_sampling(ldf)
+        if ldf._vis_cache is None:
+            ldf._vis_cache = {}
+    if ldf._baseline_data is None:
+        ldf._baseline_data = {}
+
+
+def action_deadline(start: float, option) -> float:
+    """
+    Deadline of an action computed as part of recommendations started at `start` (from time.perf_counter):
+    the earliest of the deadline of all the recommendations (`lux.config.time_budget`) and of the budget
+    of the action from now (`lux.config.action_time_budgets`), or None when there is no budget
+    """
+    deadlines = []
+    if lux.config.time_budget is not None:
+        deadlines.append(start + lux.config.time_budget)
+    if option.name in lux.config.action_time_budgets:
+        deadlines.append(time.perf_counter() + lux.config.action_time_budgets[option.name])
+    return min(deadlines) if deadlines else None
+
+
+def drop_unexecuted(recommendation: dict) -> int:
+    """
+    Remove the visualizations of an action that were left without data when its budget ran out
+
+    Returns
+    -------
+    int
+        Number of visualizations removed
+    """
+    from lux.vis.VisList import VisList
+
+    collection = recommendation["collection"]
+    if collection is None:
+        return 0
+    executed = [vis for vis in collection if vis.data is not None]
+    n_dropped = len(collection) - len(executed)
+    if n_dropped > 0:
+        if isinstance(collection, VisList):
+            source = collection._source
+            collection = VisList(executed)
+            collection._source = source
+        else:
+            collection = executed
+        recommendation["collection"] = collection
+    return n_dropped
+
+
+class BackgroundJob:
+    """
+    Computation of the recommendations of a dataframe in a worker thread, which pushes the visualizations
+    of each action to the displayed widget as soon as the action is computed.
+    The job is cancelled when the dataframe is modified or displayed again, or when the notebook cell
+    that displayed it is executed again. The modification waits for the worker to release the dataframe
+    (see `LuxDataFrame._compute_recs`), so that it is not overwritten by the computed metadata, which
+    the worker does as soon as it has profiled the current column or computed the current visualization
+    (see `check_cancelled` and `budget_expired`).
+
+    Parameters
+    ----------
+    widget : LuxWidget
+        Widget displayed while the recommendations are computed, or None when the recommendations are
+        computed ahead of their display (see `LuxDataFrame._precompute_recs_when_idle`)
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.cell = _current_cell
+        self.future = None
+        self._cancelled = threading.Event()
+        # widget specs of the recommendations pushed so far, by id of the recommendation
+        self._specs = {}
+        # function waiting for the notebook to be idle for `_delay` seconds before it is run (see `submit`)
+        self._function = None
+        self._delay = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        self.postpone()
+
+    def submit(self, function, delay: float = None) -> None:
+        """
+        Run the function in the worker thread, unless the job is cancelled in the meantime
+
+        Parameters
+        ----------
+        function : callable
+            Function computing the recommendations
+        delay : float, optional
+            Time (in seconds) that the notebook must be idle before the function is run, by default None
+            (the function is run as soon as the worker is available). The delay starts again after each
+            cell executed in the meantime.
+        """
+        _jobs.add(self)
+        if delay is None:
+            self._start(function)
+        else:
+            self._function = function
+            self._delay = delay
+            self.resume()
+
+    def postpone(self) -> None:
+        """
+        Stop waiting for the delay of the job until `resume` is called (e.g., while a cell is executed)
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def resume(self) -> None:
+        """
+        Wait for the delay of the job again, from now
+        """
+        with self._lock:
+            if self._function is None or self.cancelled:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self._delay, self._start_when_idle)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def wait(self, timeout: float = None) -> None:
+        """
+        Wait until the job is done (or cancelled).
+        A job still waiting for its delay is cancelled instead, since the recommendations are needed now.
+        """
+        with self._lock:
+            if self.future is None:
+                self._cancelled.set()
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+        if self.future is not None:
+            self.future.result(timeout)
+
+    def _start_when_idle(self) -> None:
+        with self._lock:
+            if self._function is None or self.cancelled:
+                return
+            function = self._function
+            self._function = self._timer = None
+            self._start(function)
+
+    def _start(self, function) -> None:
+        global _worker
+        if _worker is None:
+            _worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lux")
+        self.future = _worker.submit(self._run, function)
+
+    def publish(self, recommendation: dict) -> None:
+        """
+        Push the visualizations of an action to the widget, in place of the approximate ones of the action
+        (see `preview`)
+        """
+        from lux.core.frame import LuxDataFrame
+
+        if self.widget is None or self.cancelled or len(recommendation["collection"]) == 0:
+            return
+        specs = LuxDataFrame.rec_to_JSON([recommendation])
+        self._specs[id(recommendation)] = specs
+        self._show(specs)
+
+    def preview(self, rec_infolist: list, message: str) -> None:
+        """
+        Show approximate recommendations in the widget, until the ones of each action are published
+        (see `lux.action.progressive`)
+
+        Parameters
+        ----------
+        rec_infolist : list
+            Approximate recommendations, as the list of the results of the actions
+        message : str
+            Message of the widget while the recommendations are approximate
+        """
+        from lux.core.frame import LuxDataFrame
+
+        if self.widget is None or self.cancelled:
+            return
+        for rec_info in rec_infolist:
+            self._show(LuxDataFrame.rec_to_JSON([rec_info]))
+        self.widget.message = message
+
+    def _show(self, specs: list) -> None:
+        # replace the specs of the same actions shown in the widget, or add them after the others
+        actions = {spec["action"] for spec in specs}
+        recommendations = []
+        for spec in self.widget.recommendations:
+            if spec["action"] not in actions:
+                recommendations.append(spec)
+            elif specs:
+                recommendations.extend(specs)
+                specs = []
+        self.widget.recommendations = recommendations + specs
+
+    def specs(self, rec_infolist: list) -> list:
+        """
+        Widget specs of the recommendations that were pushed to the widget, or None if some are missing
+        """
+        if any(id(rec_info) not in self._specs for rec_info in rec_infolist):
+            return None
+        return [spec for rec_info in rec_infolist for spec in self._specs[id(rec_info)]]
+
+    def finish(self, widget):
+        """
+        Copy the final state of the recommendations from the widget rendered for them to the displayed widget
+
+        Returns
+        -------
+        LuxWidget
+            Displayed widget
+        """
+        if self.widget is None:
+            return widget
+        if widget is not None and widget is not self.widget:
+            self.widget.current_vis = widget.current_vis
+            self.widget.recommendations = widget.recommendations
+            self.widget.intent = widget.intent
+            self.widget.message = widget.message
+        return self.widget
+
+    def _run(self, function) -> None:
+        if self.cancelled:
+            return
+        try:
+            function()
+        except Exception:
+            if self.widget is not None:
+                self.widget.message = (
+                    "<ul><li>Unexpected error in computing the recommendations.</li></ul>"
+                )
+            warnings.warn(
+                "\nUnexpected error in computing the recommendations in the background.\n"
+                + traceback.format_exc(),
+                stacklevel=2,
+            )
+
+
+def watch_cells() -> None:
+    """
+    Cancel the background jobs of a notebook cell when it is executed again, and postpone the jobs waiting
+    for the notebook to be idle while cells are executed (when running in IPython)
+    """
+    try:
+        from IPython import get_ipython
+    except ImportError:
+        return
+    shell = get_ipython()
+    if shell is None or _on_pre_run_cell in shell.events.callbacks["pre_run_cell"]:
+        return
+    shell.events.register("pre_run_cell", _on_pre_run_cell)
+    shell.events.register("post_run_cell", _on_post_run_cell)
+
+
+def _on_pre_run_cell(info=None) -> None:
+    global _current_cell
+    _current_cell = getattr(info, "cell_id", None)
+    for job in list(_jobs):
+        if _current_cell is not None and job.cell == _current_cell:
+            job.cancel()
+        else:
+            job.postpone()
+
+
+def _on_post_run_cell(result=None) -> None:
+    for job in list(_jobs):
+        job.resume()
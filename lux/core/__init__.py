@@ -13,6 +13,7 @@
 #  limitations under the License.
 
 import pandas as pd
+from .cache import FILE_READERS, keyed_reader
 from .frame import LuxDataFrame
 from .groupby import LuxDataFrameGroupBy
 from .series import LuxSeries
@@ -60,9 +61,17 @@ def setOption(overridePandas=True):
         ) = pd.io.stata.DataFrame = pd.io.api.DataFrame = pd.core.frame.DataFrame = LuxDataFrame
         pd.Series = pd.core.series.Series = pd.core.groupby.ops.Series = LuxSeries
         pd.core.groupby.generic.DataFrameGroupBy = LuxDataFrameGroupBy
+        for name in FILE_READERS:
+            reader = getattr(pd, name, None)
+            if reader is not None and not hasattr(reader, "_lux_reader"):
+                setattr(pd, name, keyed_reader(reader))
     else:
         pd.DataFrame = pd.io.parsers.DataFrame = pd.core.frame.DataFrame = originalDF
         pd.Series = originalSeries
+        for name in FILE_READERS:
+            reader = getattr(pd, name, None)
+            if hasattr(reader, "_lux_reader"):
+                setattr(pd, name, reader._lux_reader)
 
 
 setOption(overridePandas=True)
@@ -0,0 +1,417 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from collections import OrderedDict
+import copy
+import functools
+import glob
+import hashlib
+import os
+import pickle
+import sys
+import numpy as np
+import pandas as pd
+import lux
+
+# number of items of a container whose size is measured to estimate the size of the whole container
+ESTIMATE_SAMPLE_SIZE = 100
+# version of the layout of the entries written to `lux.config.cache_dir`, to be bumped when it changes
+DISK_CACHE_FORMAT = 5
+# pandas readers whose dataframes are keyed by the file they are read from (see `file_key`)
+FILE_READERS = [
+    "read_csv",
+    "read_table",
+    "read_fwf",
+    "read_json",
+    "read_excel",
+    "read_parquet",
+    "read_feather",
+    "read_orc",
+    "read_pickle",
+    "read_stata",
+    "read_sas",
+    "read_spss",
+]
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    """
+    Fingerprint of the content of a dataframe: its shape, column names (along with their types), dtypes,
+    the type and level names of its index and the level names of its columns, along with the hash of all
+    of its values and index labels. Hashing the values is linear in the size of the dataframe, as is
+    computing its metadata, but takes a fraction of its time.
+
+    Two dataframes with the same fingerprint are assumed to hold the same data, so that the metadata and
+    recommendations computed for one of them can be reused for the other (see `MetadataCache`).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe to fingerprint
+
+    Returns
+    -------
+    str
+        Hexadecimal digest, or None when the values of the dataframe cannot be hashed (e.g., lists)
+    """
+    digest = hashlib.sha1()
+    header = (
+        df.shape,
+        # the repr tells apart the column 1 from the column "1", the type the columns of matching reprs
+        [(type(column).__name__, repr(column)) for column in df.columns],
+        [str(dtype) for dtype in df.dtypes],
+        str(df.index.dtype),
+        [repr(name) for name in df.index.names],
+        [repr(name) for name in df.columns.names],
+    )
+    digest.update(repr(header).encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(df.index).to_numpy().tobytes())
+        # hash by position, since the column names may be duplicated or of mixed types
+        for i in range(df.shape[1]):
+            hashes = pd.util.hash_pandas_object(df.iloc[:, i], index=False)
+            digest.update(hashes.to_numpy().tobytes())
+    except TypeError:
+        return None
+    return digest.hexdigest()
+
+
+def file_key(reader: str, args: tuple, kwargs: dict) -> tuple:
+    """
+    Key of the dataframe read from a local file by a pandas reader: the path, size and modification time
+    of the file, along with the reader and its other arguments. Unlike the fingerprint of the dataframe
+    (see `fingerprint`), it is computed without reading the values, in constant time whatever the size of
+    the file. A file rewritten with the same size and modification time is not told apart.
+
+    Parameters
+    ----------
+    reader : str
+        Name of the pandas reader (e.g., "read_csv")
+    args : tuple
+        Positional arguments of the reader, the first of which is the path of the file
+    kwargs : dict
+        Keyword arguments of the reader
+
+    Returns
+    -------
+    tuple
+        Key of the dataframe, or None when the dataframe is not read from a local file (e.g., from a URL
+        or a buffer)
+    """
+    if not args or not isinstance(args[0], (str, os.PathLike)):
+        return None
+    try:
+        path = os.path.abspath(os.fspath(args[0]))
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    if not os.path.isfile(path):
+        return None
+    arguments = repr((args[1:], sorted(kwargs.items(), key=lambda item: item[0])))
+    return ("file", reader, path, stat.st_size, stat.st_mtime_ns, arguments)
+
+
+def keyed_reader(reader):
+    """
+    Wrap a pandas reader so that, when the cache is enabled, the dataframes it reads from a local file are
+    keyed in the metadata cache by the file rather than by the fingerprint of their content (see `file_key`)
+
+    Parameters
+    ----------
+    reader : callable
+        pandas reader (e.g., `pd.read_csv`)
+
+    Returns
+    -------
+    callable
+        Wrapped reader, which keeps the original one as `_lux_reader`
+    """
+
+    @functools.wraps(reader)
+    def read(*args, **kwargs):
+        from lux.core.frame import LuxDataFrame
+
+        if not metadata_cache.enabled:
+            return reader(*args, **kwargs)
+        key = file_key(reader.__name__, args, kwargs)
+        df = reader(*args, **kwargs)
+        # the file may have been written while it was read
+        if key is not None and isinstance(df, LuxDataFrame):
+            if file_key(reader.__name__, args, kwargs) == key:
+                df._source_key = key
+        return df
+
+    read._lux_reader = reader
+    return read
+
+
+class MetadataCache:
+    """
+    Process-wide cache of the metadata, sample and recommendations of dataframes, keyed by the fingerprint
+    of their content (see `fingerprint`), so that a new dataframe holding the same data as a previous one
+    (e.g., after re-reading a file, or `df.copy()`) gets them back without recomputation.
+
+    The least recently used entries are evicted when the estimated size of the cache exceeds
+    `lux.config.cache_size` megabytes (the in-memory cache is disabled when the size is 0).
+    When `lux.config.cache_dir` is set, the entries are also written to this directory (see `DiskCache`),
+    so that they are found again in later sessions.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self.nbytes = 0
+        self.disk = DiskCache()
+
+    @property
+    def enabled(self) -> bool:
+        return lux.config.cache_size > 0 or lux.config.cache_dir is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key) -> dict:
+        """
+        Entry recorded for the key (marked as the most recently used), or None
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif lux.config.cache_dir is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self._put_in_memory(key, entry)
+        return entry
+
+    def put(self, key, entry: dict) -> None:
+        """
+        Record the entry for the key, then evict the least recently used entries to keep the cache
+        within `lux.config.cache_size` megabytes (an entry larger than the whole cache is not kept).
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry, which includes the fingerprint of the dataframe
+        entry : dict
+            Fields of the entry ("metadata", "samples" and "recs")
+        """
+        self._put_in_memory(key, entry)
+        if lux.config.cache_dir is not None:
+            self.disk.put(key, entry)
+
+    def _put_in_memory(self, key, entry: dict) -> None:
+        self.discard(key)
+        if lux.config.cache_size == 0:
+            # only keep the entry of the last dataframe read from or written to `lux.config.cache_dir`,
+            # so that it is not read again from the disk while its recommendations are computed
+            self.clear()
+            self._entries[key] = entry
+            self._sizes[key] = 0
+            return
+        self._entries[key] = entry
+        self._sizes[key] = _estimate_size(entry)
+        self.nbytes += self._sizes[key]
+        capacity = lux.config.cache_size * 2**20
+        while self._entries and self.nbytes > capacity:
+            self.discard(next(iter(self._entries)))
+
+    def discard(self, key) -> None:
+        if key in self._entries:
+            del self._entries[key]
+            self.nbytes -= self._sizes.pop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._sizes.clear()
+        self.nbytes = 0
+
+
+def copy_recommendations(rec_infolist: list, source) -> list:
+    """
+    Copy the recommendations of a dataframe (`_rec_info`), attaching their vis to another source.
+    The processed data of the vis is shared with the original recommendations.
+
+    Parameters
+    ----------
+    rec_infolist : list
+        Recommendations, as the list of the results of the actions
+    source : LuxDataFrame
+        Dataframe the copied vis are attached to, or None when they are kept in the cache
+
+    Returns
+    -------
+    list
+        Copied recommendations
+    """
+    copied = []
+    for rec_info in rec_infolist:
+        collection = copy.copy(rec_info["collection"])
+        if isinstance(collection, list):
+            vis_list = collection = [copy.copy(vis) for vis in collection]
+        else:
+            collection._source = source
+            collection._widget = None
+            vis_list = collection._collection = [copy.copy(vis) for vis in collection._collection]
+            collection._input_lst = vis_list
+        for vis in vis_list:
+            if vis._source is not None:
+                vis._source = source
+        copied.append({**rec_info, "collection": collection})
+    return copied
+
+
+class DiskCache:
+    """
+    Cache of the entries of the `MetadataCache` in the `lux.config.cache_dir` directory, with one pickle
+    file per entry. The file of an entry is named after its key along with the versions of Lux, pandas and
+    of the layout of the entries, so that the entries written by other versions are never read (they are
+    evicted eventually). The least recently used files are removed when the files exceed
+    `lux.config.cache_dir_size` megabytes.
+    """
+
+    def get(self, key) -> dict:
+        """
+        Entry written for the key, or None (unreadable entries are removed)
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                payload = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            _remove(path)
+            return None
+        if not isinstance(payload, dict) or payload.get("key") != key:
+            return None
+        try:
+            # mark the file as recently used
+            os.utime(path)
+        except OSError:
+            pass
+        return _entry_from_disk(payload["entry"])
+
+    def put(self, key, entry: dict) -> None:
+        """
+        Write the entry for the key (entries that cannot be pickled are skipped), then remove the least
+        recently used files to keep the directory within `lux.config.cache_dir_size` megabytes.
+        """
+        path = self._path(key)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(lux.config.cache_dir, exist_ok=True)
+            with open(temporary_path, "wb") as file:
+                pickle.dump({"key": key, "entry": _entry_to_disk(entry)}, file, protocol=4)
+            os.replace(temporary_path, path)
+        except Exception:
+            _remove(temporary_path)
+            return
+        self._evict()
+
+    def clear(self) -> None:
+        for path in self._files():
+            _remove(path)
+
+    def _path(self, key) -> str:
+        versions = (DISK_CACHE_FORMAT, lux.__version__, pd.__version__, np.__version__)
+        name = hashlib.sha1(repr((key, versions)).encode()).hexdigest()
+        return os.path.join(lux.config.cache_dir, f"{name}.pkl")
+
+    def _files(self) -> list:
+        return glob.glob(os.path.join(lux.config.cache_dir, "*.pkl"))
+
+    def _evict(self) -> None:
+        files = []
+        for path in self._files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        capacity = lux.config.cache_dir_size * 2**20
+        for _, size, path in sorted(files):
+            if total <= capacity:
+                break
+            _remove(path)
+            total -= size
+
+
+def _entry_to_disk(entry: dict) -> dict:
+    # dataframes are pickled as their block managers, since pickling a LuxDataFrame includes its
+    # recommendations and widget (the files are named after the version of pandas, see `DiskCache`)
+    recs = {}
+    for recs_key, (rec_infolist, messages, specs) in entry["recs"].items():
+        rec_infolist = copy_recommendations(rec_infolist, None)
+        for vis in _iter_vis(rec_infolist):
+            if vis._vis_data is not None:
+                vis._vis_data = vis._vis_data._mgr
+        recs[recs_key] = (rec_infolist, messages, specs)
+    return {"metadata": entry["metadata"], "samples": entry["samples"], "recs": recs}
+
+
+def _entry_from_disk(entry: dict) -> dict:
+    from lux.core.frame import LuxDataFrame
+
+    for rec_infolist, _, _ in entry["recs"].values():
+        for vis in _iter_vis(rec_infolist):
+            if vis._vis_data is not None:
+                vis._vis_data = LuxDataFrame(vis._vis_data)
+    return entry
+
+
+def _iter_vis(rec_infolist: list):
+    for rec_info in rec_infolist:
+        collection = rec_info["collection"]
+        yield from getattr(collection, "_collection", collection)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _estimate_size(obj, seen=None) -> int:
+    # shallow estimate of the memory held by the cached objects (the values shared with live dataframes
+    # are counted as well, since the cache keeps them alive)
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(np.sum(obj.memory_usage(index=True)))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        items = list(obj.keys()) + list(obj.values())
+    elif isinstance(obj, (list, tuple, set)):
+        items = list(obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        items = list(vars(obj).values())
+    else:
+        return sys.getsizeof(obj)
+    if len(items) > ESTIMATE_SAMPLE_SIZE:
+        # extrapolate from the first items of large containers (e.g., the records of the vis specs)
+        sampled = sum(_estimate_size(item, seen) for item in items[:ESTIMATE_SAMPLE_SIZE])
+        return sys.getsizeof(obj) + sampled * len(items) // ESTIMATE_SAMPLE_SIZE
+    return sys.getsizeof(obj) + sum(_estimate_size(item, seen) for item in items)
+
+
+metadata_cache = MetadataCache()
@@ -0,0 +1,218 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+
+
+class ValueCatalog(Mapping):
+    """
+    Catalog of the distinct values of the attributes of a dataframe (`unique_values` in the frame metadata).
+    For each attribute, the catalog holds the exact number of distinct values, and at most `limit` of these
+    values in an array: all of them for low-cardinality attributes, and only the most frequent ones
+    (heavy hitters, along with their counts) for the others.
+
+    Indexing the catalog with an attribute returns the list of values kept for this attribute.
+
+    Parameters
+    ----------
+    limit : int, optional
+        Maximum number of values kept per attribute, by default None (all values are kept)
+    """
+
+    def __init__(self, limit: int = None):
+        self.limit = limit
+        self._values = {}
+        self._counts = {}
+        self._distinct_counts = {}
+        self._all_values = {}
+        self._orders = {}
+
+    def add(self, attribute, values, counts=None, distinct_count: int = None) -> None:
+        """
+        Record the distinct values of an attribute.
+        When there are more values than the limit of the catalog, only the `limit` values with the largest
+        counts are kept (or the first ones, when the counts are not given).
+
+        Parameters
+        ----------
+        attribute : str
+            Name of the attribute
+        values : array-like
+            Distinct values of the attribute, or its most frequent values when `distinct_count` is given
+        counts : array-like, optional
+            Number of occurrences of each value, by default None
+        distinct_count : int, optional
+            Number of distinct values of the attribute, by default None (the number of values given)
+        """
+        if not isinstance(values, np.ndarray):
+            values = _to_object_array(values)
+        if counts is not None:
+            counts = np.asarray(counts)
+        if distinct_count is None:
+            distinct_count = len(values)
+        if self.limit is not None and len(values) > self.limit:
+            if counts is not None:
+                top = np.sort(np.argsort(-counts, kind="stable")[: self.limit])
+                values, counts = values[top], counts[top]
+            else:
+                values = values[: self.limit]
+        self._values[attribute] = values
+        self._counts[attribute] = counts
+        self._distinct_counts[attribute] = distinct_count
+        self._all_values.pop(attribute, None)
+        self._orders.pop(attribute, None)
+
+    def copy(self, attributes: list = None) -> "ValueCatalog":
+        """
+        Shallow copy of the catalog (the arrays of values are shared), restricted to the given attributes
+
+        Parameters
+        ----------
+        attributes : list, optional
+            Attributes to copy, in order, by default None (all attributes)
+        """
+        if attributes is None:
+            attributes = list(self._values)
+        catalog = ValueCatalog(limit=self.limit)
+        for attribute in attributes:
+            catalog._values[attribute] = self._values[attribute]
+            catalog._counts[attribute] = self._counts[attribute]
+            catalog._distinct_counts[attribute] = self._distinct_counts[attribute]
+            if attribute in self._all_values:
+                catalog._all_values[attribute] = self._all_values[attribute]
+            if attribute in self._orders:
+                catalog._orders[attribute] = self._orders[attribute]
+        return catalog
+
+    def __getitem__(self, attribute) -> list:
+        return list(self._values[attribute])
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"ValueCatalog({dict(self)})"
+
+    def is_complete(self, attribute) -> bool:
+        """
+        Whether all the distinct values of the attribute are kept in the catalog
+        """
+        return len(self._values[attribute]) == self._distinct_counts[attribute]
+
+    def distinct_count(self, attribute) -> int:
+        """
+        Exact number of distinct values of the attribute (missing values count as one distinct value)
+        """
+        return self._distinct_counts[attribute]
+
+    def counts(self, attribute) -> list:
+        """
+        Number of occurrences of each value kept for the attribute (in the same order as the values),
+        or None when the counts are unknown
+        """
+        counts = self._counts[attribute]
+        return None if counts is None else list(counts)
+
+    def all_values(self, attribute, lookup=None) -> list:
+        """
+        All the distinct values of the attribute: the values kept in the catalog when it is complete for the
+        attribute (see `is_complete`), or else the values returned by lookup, which is only called once per
+        attribute (the values are then kept in the catalog, apart from its most frequent values)
+
+        Parameters
+        ----------
+        attribute : str
+            Name of the attribute
+        lookup : callable, optional
+            Function returning all the distinct values of the attribute (e.g., from the dataframe),
+            by default None (the values kept in the catalog are returned)
+
+        Returns
+        -------
+        list
+            Distinct values of the attribute
+        """
+        if self.is_complete(attribute) or lookup is None:
+            return self[attribute]
+        if attribute not in self._all_values:
+            self._all_values[attribute] = list(lookup())
+        return self._all_values[attribute]
+
+    def order(self, attribute, lookup=None) -> tuple:
+        """
+        All the distinct values of the attribute in sorted order (see `sort_values`), which is computed once
+        per attribute and kept in the catalog, so that the bar and line charts of the attribute are ordered
+        and zero-padded without sorting its values again
+
+        Parameters
+        ----------
+        attribute : str
+            Name of the attribute
+        lookup : callable, optional
+            Function returning all the distinct values of the attribute, called when the catalog only holds
+            its most frequent values (see `all_values`), by default None (the values kept are sorted)
+
+        Returns
+        -------
+        tuple
+            (list of ordered values, whether the values could be sorted)
+        """
+        if attribute not in self._orders:
+            self._orders[attribute] = sort_values(self.all_values(attribute, lookup))
+        return self._orders[attribute]
+
+    def contains(self, attribute, value) -> bool:
+        """
+        Whether the value is one of the values kept for the attribute.
+        When the catalog is not complete for the attribute (see `is_complete`), values that are not
+        among its most frequent ones are not found.
+        """
+        return value in self[attribute]
+
+
+def sort_values(values: list) -> tuple:
+    """
+    Sort the unique values of an attribute, with a single missing value (if any) placed last
+
+    Parameters
+    ----------
+    values : list
+        Unique values of the attribute (see `unique_values` in the frame metadata)
+
+    Returns
+    -------
+    tuple
+        (list of ordered values, whether the values could be sorted)
+    """
+    is_null = [pd.api.types.is_scalar(val) and pd.isna(val) for val in values]
+    non_null = [val for val, null in zip(values, is_null) if not null]
+    # group-by keys hold missing values as NaN, even when the column stores None
+    nulls = [np.nan if val is None else val for val, null in zip(values, is_null) if null][:1]
+    try:
+        return sorted(non_null) + nulls, True
+    except TypeError:
+        return non_null + nulls, False
+
+
+def _to_object_array(values) -> np.ndarray:
+    # avoid np.asarray inferring a common dtype (or nesting) from the values
+    array = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        array[i] = value
+    return array
@@ -13,7 +13,10 @@
 #  limitations under the License.
 
 import pandas as pd
+import numpy as np
 from lux.core.series import LuxSeries
+from lux.core.catalog import ValueCatalog
+from lux.core.cache import metadata_cache, fingerprint, copy_recommendations
 from lux.vis.Clause import Clause
 from lux.vis.Vis import Vis
 from lux.vis.VisList import VisList
@@ -25,6 +28,7 @@ from typing import Dict, Union, List, Callable
 # from lux.executor.Executor import *
 import warnings
 import traceback
+import threading
 import lux
 
 
@@ -73,6 +77,22 @@ class LuxDataFrame(pd.DataFrame):
         lux.config.executor = PandasExecutor()
 
         self._sampled = None
+        # (sampling configuration, number of rows, row positions, weights or None) of the sample
+        # of the current version of the data, see `PandasExecutor._take_sample`
+        self._sample_rows = None
+        # weights of the rows of a stratified sample (see `lux.executor.sampling`)
+        self._sample_weights = None
+        # number of rows of the sample of a level of the sample pyramid (see `lux.action.progressive`)
+        self._sample_level = None
+        self._baseline_data = None
+        # processed data of the executed vis, reused until the columns of the vis change
+        self._vis_cache = None
+        # dictionary encodings of nominal columns, built lazily by the executor
+        self._encodings = None
+        # incremented whenever the encodings expire, so that the dataframes derived from this one
+        # stop deriving their encodings from it (see `PandasExecutor._link_encodings`)
+        self._encodings_version = 0
+        self._encoding_source = None
         self._toggle_pandas_display = True
         self._message = Message()
         self._pandas_only = False
@@ -81,6 +101,23 @@ class LuxDataFrame(pd.DataFrame):
         self.unique_values = None
         self.cardinality = None
         self._min_max = None
+        self._column_profile = None
+        # columns whose metadata has expired, when the metadata of the other columns is still fresh
+        self._stale_columns = None
+        # metadata of the dataframe this one was derived from (see `_link_metadata`)
+        self._lineage = None
+        # key of the content of the dataframe in the metadata cache (see `_get_cache_key`)
+        self._cache_key = None
+        # key of the file the dataframe was read from, until it is modified (see `cache.file_key`)
+        self._source_key = None
+        # widget specs of the recommendations, along with the recommendations and the rendering
+        # configuration they were generated from (see `to_JSON`)
+        self._rec_specs = None
+        # computation of the recommendations in the background (see `_maintain_recs_in_background`)
+        self._recs_job = None
+        # held while the metadata and recommendations are computed or expired, since they may be computed
+        # by the worker of a background job while the dataframe is modified (see `_compute_recs`)
+        self._state_lock = threading.RLock()
         self.pre_aggregated = None
         self._type_override = {}
         warnings.formatwarning = lux.warning_format
@@ -105,64 +142,347 @@ class LuxDataFrame(pd.DataFrame):
 
     @property
     def data_type(self):
-        if not self._data_type:
+        if not self._data_type or self._stale_columns:
             self.maintain_metadata()
         return self._data_type
 
     def maintain_metadata(self):
-        # Check that metadata has not yet been computed
-        if not hasattr(self, "_metadata_fresh") or not self._metadata_fresh:
-            # only compute metadata information if the dataframe is non-empty
-            if len(self) > 0:
+        if getattr(self, "_metadata_fresh", False):
+            # the lock is not needed by the threads computing the actions (see `scheduler.compute_actions`)
+            return
+        # the metadata may be computed by the worker of a background job (see `_compute_recs`)
+        with self._state_lock:
+            # Check that metadata has not yet been computed
+            if not hasattr(self, "_metadata_fresh") or not self._metadata_fresh:
+                # only compute metadata information if the dataframe is non-empty
+                if len(self) > 0:
+                    cache_key = self._get_cache_key()
+                    cached = metadata_cache.get(cache_key) if cache_key is not None else None
+                    if cached is not None:
+                        (
+                            self._data_type,
+                            self.unique_values,
+                            self.cardinality,
+                            self._min_max,
+                            self._column_profile,
+                        ) = cached["metadata"]
+                        if self._sample_rows is None:
+                            self._sample_rows = cached["samples"].get(_sampling_config())
+                    else:
+                        self._compute_metadata()
+                    self._infer_structure()
+                    self._stale_columns = None
+                    self._lineage = None
+                    self._metadata_fresh = True
+                    if cache_key is not None and cached is None:
+                        metadata = (
+                            self._data_type,
+                            self.unique_values,
+                            self.cardinality,
+                            self._min_max,
+                            self._column_profile,
+                        )
+                        metadata_cache.put(cache_key, {"metadata": metadata, "samples": {}, "recs": {}})
+
+    def _compute_metadata(self):
+        from lux.action.scheduler import JobCancelled
+
+        try:
+            if self._lineage is not None:
+                lux.config.executor.derive_metadata(self, self._lineage)
+            elif self._stale_columns is not None:
+                # only profile the columns that were added or modified
+                attributes = [attr for attr in self.columns if attr in self._stale_columns]
+                lux.config.executor.compute_stats(self, attributes)
+                lux.config.executor.compute_dataset_metadata(self, attributes)
+            else:
                 lux.config.executor.compute_stats(self)
                 lux.config.executor.compute_dataset_metadata(self)
-                self._infer_structure()
-                self._metadata_fresh = True
+        except JobCancelled:
+            # the background job computing the metadata was cancelled (see `_compute_recs`): the metadata
+            # computed so far is dropped, except for the columns that were still fresh
+            if self._stale_columns is None:
+                self._lineage = None
+                self._data_type = None
+                self.unique_values = None
+                self.cardinality = None
+                self._min_max = None
+                self._column_profile = None
+            raise
 
-    def expire_recs(self):
+    def _get_cache_key(self):
         """
-        Expires and resets all recommendations
+        Key of the content of the dataframe in the process-wide metadata cache (see `lux.core.cache`),
+        made of its fingerprint (or the key of the file it was read from, when it is unmodified), type
+        overrides and the configuration the metadata depends on.
+
+        Returns
+        -------
+        tuple
+            Key of the dataframe, or None when the cache is disabled or the dataframe cannot be fingerprinted
         """
-        self._recs_fresh = False
-        self._recommendation = {}
-        self._widget = None
-        self._rec_info = None
-        self._sampled = None
+        if self._cache_key is None and metadata_cache.enabled:
+            content = self._source_key if self._source_key is not None else fingerprint(self)
+            if content is not None:
+                overrides = repr(sorted(self._type_override.items(), key=repr))
+                config = (
+                    lux.config.max_unique_values,
+                    lux.config.detection_sample_size,
+                    lux.config.detection_confidence,
+                )
+                self._cache_key = (content, overrides, config)
+        return self._cache_key
+
+    def expire_recs(self, attributes=None):
+        """
+        Expires and resets all recommendations.
+        The processed data of the vis that do not involve the given attributes is kept, so that it is reused
+        when the recommendations are regenerated.
 
-    def expire_metadata(self):
+        Parameters
+        ----------
+        attributes : list, optional
+            Attributes whose values (or data types) have changed, by default None (all columns).
+            An empty list only resets the recommendations (e.g., when the intent changes).
+        """
+        # stop the background job before waiting for it to release the state of the dataframe
+        if self._recs_job is not None:
+            self._recs_job.cancel()
+        with self._state_lock:
+            self._recs_fresh = False
+            self._recommendation = {}
+            self._widget = None
+            self._rec_info = None
+            self._rec_specs = None
+            self._recs_job = None
+            if attributes is None:
+                self._sampled = None
+                self._sample_rows = None
+                self._baseline_data = None
+                self._vis_cache = None
+            elif len(attributes) > 0:
+                # the rows of the sample are taken again at the same positions, unless the sample is
+                # stratified by the values of the nominal attributes
+                self._sampled = None
+                if self._sample_rows is not None and self._sample_rows[3] is not None:
+                    self._sample_rows = None
+                self._baseline_data = _drop_vis_entries(self._baseline_data, attributes)
+                self._vis_cache = _drop_vis_entries(self._vis_cache, attributes)
+
+    def expire_metadata(self, attributes=None):
         """
         Expire all saved metadata to trigger a recomputation the next time the data is required.
+
+        Parameters
+        ----------
+        attributes : list, optional
+            Attributes whose values have changed, by default None (all columns).
+            When the metadata is fresh, only the metadata of these attributes is expired and recomputed.
         """
-        self._metadata_fresh = False
-        self._data_type = None
-        self.unique_values = None
-        self.cardinality = None
-        self._min_max = None
-        self.pre_aggregated = None
+        if self._recs_job is not None:
+            self._recs_job.cancel()
+        with self._state_lock:
+            self._cache_key = None
+            self._source_key = None
+            fresh = getattr(self, "_metadata_fresh", False) or self._stale_columns is not None
+            if attributes is not None and fresh and self._column_profile is not None:
+                self._stale_columns = (self._stale_columns or set()) | set(attributes)
+                self._metadata_fresh = False
+                return
+            self._stale_columns = None
+            self._lineage = None
+            self._metadata_fresh = False
+            self._data_type = None
+            self.unique_values = None
+            self.cardinality = None
+            self._min_max = None
+            self._column_profile = None
+            self.pre_aggregated = None
+
+    def expire_encodings(self, attribute=None):
+        """
+        Expire the dictionary encodings of the columns, or only the encoding of the given attribute.
+
+        Parameters
+        ----------
+        attribute : str, optional
+            Attribute whose values have changed, by default None (all columns)
+        """
+        self._encoding_source = None
+        self._encodings_version += 1
+        if attribute is None:
+            self._encodings = None
+        elif self._encodings is not None:
+            # replace rather than update the dict, since the dataframes filtered from this one refer to it
+            self._encodings = {attr: enc for attr, enc in self._encodings.items() if attr != attribute}
+
+    def _link_metadata(self, result, key=None):
+        """
+        Record that result holds some of the rows and columns of this dataframe, so that the metadata of
+        result is derived from the one of this dataframe (see `PandasExecutor.derive_metadata`)
+        instead of being computed from scratch.
+
+        Parameters
+        ----------
+        result : LuxDataFrame
+            Projection or row subset of this dataframe (e.g., df[["a", "b"]], df[df.a > 5] or df.head())
+        key : optional
+            Key used to select the rows of result, by default None (the rows are located by index)
+        """
+        if not isinstance(result, LuxDataFrame) or result is self:
+            return
+        same_rows = result.index is self.index or (
+            len(result) == len(self) and result.index.equals(self.index)
+        )
+        if (
+            getattr(self, "_metadata_fresh", False)
+            and self._column_profile is not None
+            and self.columns.is_unique
+            and self.columns.nlevels == 1
+        ):
+            # the metadata is replaced rather than updated when the values of this dataframe change
+            result._lineage = {
+                "data_type": self._data_type,
+                "unique_values": self.unique_values,
+                "cardinality": self.cardinality,
+                "min_max": self._min_max,
+                "column_profile": self._column_profile,
+                "projection": same_rows,
+            }
+        from lux.executor.PandasExecutor import PandasExecutor
+
+        if same_rows:
+            PandasExecutor._link_encodings(result, self)
+        elif self._encodings:
+            # the rows are only located when there are encodings to derive the ones of result from
+            rows = self._locate_rows(result, key)
+            if rows is not None:
+                PandasExecutor._link_encodings(result, self, rows)
+
+    def _locate_rows(self, result, key=None):
+        """
+        Positions of the rows of result in this dataframe, or None when they cannot be located
+        """
+        if getattr(key, "dtype", None) == bool and len(key) == len(self):
+            if isinstance(key, pd.Series) and not key.index.equals(self.index):
+                return None
+            return np.flatnonzero(np.asarray(key))
+        if isinstance(key, slice) and all(
+            part is None or pd.api.types.is_integer(part) for part in (key.start, key.stop, key.step)
+        ):
+            rows = np.arange(len(self))[key]
+            # integer slices of a float index select labels rather than positions
+            if len(rows) == len(result) and result.index.equals(self.index[rows]):
+                return rows
+        if self.index.is_unique:
+            rows = self.index.get_indexer(result.index)
+            if not (rows == -1).any():
+                return rows
+        return None
 
     #####################
     ## Override Pandas ##
     #####################
-    def __getattr__(self, name):
-        ret_value = super(LuxDataFrame, self).__getattr__(name)
-        self.expire_metadata()
-        self.expire_recs()
-        return ret_value
+    def __getitem__(self, key):
+        result = super(LuxDataFrame, self).__getitem__(key)
+        self._link_metadata(result, key)
+        return result
 
     def _set_axis(self, axis, labels):
         super(LuxDataFrame, self)._set_axis(axis, labels)
+        self.expire_encodings()
         self.expire_metadata()
         self.expire_recs()
 
     def _update_inplace(self, *args, **kwargs):
         super(LuxDataFrame, self)._update_inplace(*args, **kwargs)
+        self.expire_encodings()
         self.expire_metadata()
         self.expire_recs()
 
+    # Reading the dataframe (e.g., df.age or df["age"]) keeps the metadata and recommendations,
+    # writing to it expires them, keeping the processed data of the vis of the other columns.
     def _set_item(self, key, value):
         super(LuxDataFrame, self)._set_item(key, value)
-        self.expire_metadata()
-        self.expire_recs()
+        self.expire_encodings(key)
+        self.expire_metadata([key])
+        self.expire_recs([key])
+
+    def insert(self, loc, column, value, allow_duplicates=False):
+        super(LuxDataFrame, self).insert(loc, column, value, allow_duplicates=allow_duplicates)
+        self.expire_encodings(column)
+        self.expire_metadata([column])
+        self.expire_recs([column])
+
+    def __delitem__(self, key):
+        super(LuxDataFrame, self).__delitem__(key)
+        self.expire_encodings(key)
+        self.expire_metadata([key])
+        self.expire_recs([key])
+
+    def _iset_item(self, loc, *args, **kwargs):
+        super(LuxDataFrame, self)._iset_item(loc, *args, **kwargs)
+        self.expire_encodings(self.columns[loc])
+        self.expire_metadata([self.columns[loc]])
+        self.expire_recs([self.columns[loc]])
+
+    def _set_value(self, index, col, value, takeable=False):
+        super(LuxDataFrame, self)._set_value(index, col, value, takeable=takeable)
+        attribute = self.columns[col] if takeable else col
+        self.expire_encodings(attribute)
+        self.expire_metadata([attribute])
+        self.expire_recs([attribute])
+
+    # the signatures of the cacher hooks differ across pandas versions (e.g., `inplace` since pandas 1.4)
+    def _maybe_update_cacher(self, *args, **kwargs):
+        super(LuxDataFrame, self)._maybe_update_cacher(*args, **kwargs)
+        # values were set in-place through an indexer (e.g., df.loc[...] = ...)
+        if kwargs.get("clear", args[0] if len(args) > 0 else False):
+            self.expire_encodings()
+            self.expire_metadata()
+            self.expire_recs()
+
+    def _maybe_cache_changed(self, *args, **kwargs):
+        super(LuxDataFrame, self)._maybe_cache_changed(*args, **kwargs)
+        item = kwargs.get("item", args[0] if len(args) > 0 else None)
+        self.expire_encodings(item)
+        self.expire_metadata([item])
+        self.expire_recs([item])
+
+    # since pandas 1.3, values set through df.loc and df.iloc are mostly written to the blocks directly,
+    # without going through the cacher hooks
+    @property
+    def loc(self):
+        return _LuxLocIndexer("loc", self)
+
+    @property
+    def iloc(self):
+        return _LuxILocIndexer("iloc", self)
+
+    def _expire_indexed(self, key, takeable: bool) -> None:
+        """
+        Expire the encodings, metadata and recommendations of the columns written through df.loc[key]
+        (or df.iloc[key] when takeable), or of all the columns when they cannot be told from the key
+        """
+        attribute = None
+        if isinstance(key, tuple) and len(key) == 2 and self.columns.is_unique:
+            column = key[1]
+            if (
+                takeable
+                and pd.api.types.is_integer(column)
+                and -len(self.columns) <= column < len(self.columns)
+            ):
+                attribute = self.columns[column]
+            elif not takeable and pd.api.types.is_hashable(column) and column in self.columns:
+                attribute = column
+        if attribute is None:
+            self.expire_encodings()
+            self.expire_metadata()
+            self.expire_recs()
+        else:
+            self.expire_encodings(attribute)
+            self.expire_metadata([attribute])
+            self.expire_recs([attribute])
 
     def _infer_structure(self):
         # If the dataframe is very small and the index column is not a range index, then it is likely that this is an aggregated data
@@ -208,10 +528,10 @@ class LuxDataFrame(pd.DataFrame):
 
     def clear_intent(self):
         self.intent = []
-        self.expire_recs()
+        self.expire_recs([])
 
     def set_intent(self, intent: List[Union[str, Clause]]):
-        self.expire_recs()
+        self.expire_recs([])
         self._intent = intent
         self._parse_validate_compile_intent()
 
@@ -244,7 +564,7 @@ class LuxDataFrame(pd.DataFrame):
         vis : Vis
             Input Vis object
         """
-        self.expire_recs()
+        self.expire_recs([])
         self._intent = vis._inferred_intent
         self._parse_validate_compile_intent()
 
@@ -278,9 +598,10 @@ class LuxDataFrame(pd.DataFrame):
                 raise ValueError(
                     f'Invalid data type option specified for {attr}. Please use one of the following supported types: ["nominal", "quantitative", "id", "temporal"]'
                 )
-            self.data_type[attr] = types[attr]
-
-        self.expire_recs()
+        # replace rather than update the data types, since they may be shared with other dataframes
+        self._data_type = {**self.data_type, **types}
+        self._cache_key = None
+        self.expire_recs(list(types))
 
     def to_pandas(self):
         import lux.core
@@ -289,6 +610,9 @@ class LuxDataFrame(pd.DataFrame):
 
     @property
     def recommendation(self):
+        if self._recs_job is not None:
+            # wait for the recommendations computed in the background
+            self._recs_job.wait()
         if self._recommendation is not None and self._recommendation == {}:
             from lux.processor.Compiler import Compiler
 
@@ -341,7 +665,7 @@ class LuxDataFrame(pd.DataFrame):
 
     def compute_SQL_stats(self):
         # precompute statistics
-        self.unique_values = {}
+        self.unique_values = ValueCatalog()
         self._min_max = {}
 
         self.get_SQL_unique_values()
@@ -374,13 +698,14 @@ class LuxDataFrame(pd.DataFrame):
         self.cardinality = cardinality
 
     def get_SQL_unique_values(self):
-        unique_vals = {}
+        # the SQL executor bins quantitative attributes based on all their values, so the catalog is not capped
+        unique_vals = ValueCatalog()
         for attr in list(self.columns):
             unique_query = pd.read_sql(
                 f"SELECT Distinct({attr}) FROM {self.table_name}",
                 lux.config.SQLconnection,
             )
-            unique_vals[attr] = list(unique_query[attr])
+            unique_vals.add(attr, unique_query[attr].to_numpy())
         self.unique_values = unique_vals
 
     def compute_SQL_data_type(self):
@@ -429,8 +754,9 @@ class LuxDataFrame(pd.DataFrame):
         if recommendations["collection"] is not None and len(recommendations["collection"]) > 0:
             rec_infolist.append(recommendations)
 
-    def maintain_recs(self, is_series="DataFrame"):
+    def maintain_recs(self, is_series="DataFrame", job=None):
         # `rec_df` is the dataframe to generate the recommendations on
+        # `job` is the background computation of the recommendations (see `_maintain_recs_in_background`)
         # check to see if globally defined actions have been registered/removed
         if lux.config.update_actions["flag"] == True:
             self._recs_fresh = False
@@ -478,8 +804,13 @@ class LuxDataFrame(pd.DataFrame):
             from lux.action.row_group import row_group
             from lux.action.column_group import column_group
 
+            n_messages = len(rec_df._message.messages)
+            cached_recs = rec_df._get_cached_recs()
+            if cached_recs is not None:
+                rec_infolist = cached_recs
+                lux.config.update_actions["flag"] = False
             # TODO: Rewrite these as register action inside default actions
-            if rec_df.pre_aggregated:
+            elif rec_df.pre_aggregated:
                 if rec_df.columns.name is not None:
                     rec_df._append_rec(rec_infolist, row_group(rec_df))
                 rec_df._append_rec(rec_infolist, column_group(rec_df))
@@ -487,9 +818,15 @@ class LuxDataFrame(pd.DataFrame):
                 self.index.nlevels >= 2 or self.columns.nlevels >= 2
             ):
                 from lux.action.custom import custom_actions
+                from lux.action import progressive
 
+                if job is not None:
+                    # show approximate recommendations while they are computed (see `lux.config.progressive_levels`)
+                    progressive.refine(rec_df, job)
                 # generate vis from globally registered actions and append to dataframe
-                custom_action_collection = custom_actions(rec_df)
+                custom_action_collection = custom_actions(rec_df, job)
+                if job is not None and job.cancelled:
+                    return
                 for rec in custom_action_collection:
                     rec_df._append_rec(rec_infolist, rec)
                 lux.config.update_actions["flag"] = False
@@ -502,12 +839,187 @@ class LuxDataFrame(pd.DataFrame):
                 if len(vlist) > 0:
                     rec_df._recommendation[action_type] = vlist
             rec_df._rec_info = rec_infolist
+            if job is not None and job.specs(rec_infolist) is not None:
+                # reuse the specs of the visualizations pushed to the widget while they were computed
+                rec_df._rec_specs = (rec_infolist, _rendering_config(), job.specs(rec_infolist))
             self._widget = rec_df.render_widget()
+            rec_df._cache_recs(rec_infolist, rec_df._message.messages[n_messages:])
         # re-render widget for the current dataframe if previous rec is not recomputed
         elif show_prev:
             self._widget = rec_df.render_widget()
+        if job is not None:
+            if job.cancelled:
+                return
+            self._widget = job.finish(self._widget)
         self._recs_fresh = True
 
+    def _maintain_recs_in_background(self):
+        """
+        Display a widget without recommendations, and compute the metadata and recommendations in a worker
+        thread (see `lux.action.scheduler.BackgroundJob`), which pushes the visualizations of each action to
+        the widget as soon as they are computed
+        """
+        from lux.action.scheduler import BackgroundJob
+
+        if self._recs_job is not None:
+            self._recs_job.cancel()
+        if (
+            getattr(self, "_recs_fresh", False)
+            and self._widget is not None
+            and self._prev is None
+            and not lux.config.update_actions["flag"]
+        ):
+            return
+        check_import_lux_widget()
+        import luxwidget
+
+        widget = luxwidget.LuxWidget(
+            currentVis={},
+            recommendations=[],
+            intent=LuxDataFrame.intent_to_string(self._intent),
+            message="<ul><li>Lux is computing the recommendations...</li></ul>",
+        )
+        self._widget = widget
+        self._recs_job = job = BackgroundJob(widget)
+        job.submit(lambda: self._compute_recs(job))
+
+    def _precompute_recs_when_idle(self):
+        """
+        Compute the metadata and recommendations of a dataframe displayed lazily (see `_repr_html_`) in a
+        worker thread once the notebook has been idle for `lux.config.lazy_display_delay` seconds, so that
+        the widget is ready when the user toggles to Lux. A modification of the dataframe cancels the
+        computation, and only waits for the current column or vis (see `_compute_recs`).
+        """
+        from lux.action.scheduler import BackgroundJob
+
+        if self._recs_job is not None:
+            self._recs_job.cancel()
+            self._recs_job = None
+        if lux.config.lazy_display_delay is None or (
+            getattr(self, "_recs_fresh", False) and self._widget is not None and self._prev is None
+        ):
+            return
+        self._recs_job = job = BackgroundJob(None)
+        job.submit(lambda: self._compute_recs(job), delay=lux.config.lazy_display_delay)
+
+    def _compute_recs(self, job=None):
+        # metadata, current vis and recommendations needed to display the widget
+        from lux.action import scheduler
+
+        with self._state_lock:
+            # the dataframe may have been modified while the job was waiting for the lock
+            if job is not None and job.cancelled:
+                return
+            if job is None:
+                self._compute_widget()
+                return
+            # the modification that cancels the job waits for the lock, which the worker releases as soon as
+            # it has profiled the current column or computed the current vis (see `BackgroundJob`)
+            try:
+                with scheduler.running(None, job):
+                    self._compute_widget(job)
+            except scheduler.JobCancelled:
+                pass
+
+    def _compute_widget(self, job=None):
+        if not self.index.nlevels >= 2 or self.columns.nlevels >= 2:
+            self.maintain_metadata()
+
+            if self._intent != [] and (not hasattr(self, "_compiled") or not self._compiled):
+                from lux.processor.Compiler import Compiler
+
+                self.current_vis = Compiler.compile_intent(self, self._intent)
+        self.maintain_recs(job=job)
+
+    def _prepare_widget(self):
+        # compute the widget (in the background with `lux.config.async_recommendations`) and observe it
+        if lux.config.async_recommendations:
+            self._maintain_recs_in_background()
+        else:
+            if self._recs_job is not None:
+                # use the recommendations computed ahead of the display (see `_precompute_recs_when_idle`)
+                self._recs_job.wait()
+                self._recs_job = None
+            self._compute_recs()
+
+        # Observers(callback_function, listen_to_this_variable)
+        self._widget.observe(self.remove_deleted_recs, names="deletedIndices")
+        self._widget.observe(self.set_intent_on_click, names="selectedIntentIndex")
+
+    def _get_recs_cache_key(self):
+        # the recommendations are only cached for the dataframes without intent, along with the
+        # configuration that they depend on
+        if self._intent or not getattr(self, "_metadata_fresh", False) or self._get_cache_key() is None:
+            return None
+        config = (
+            tuple(lux.config.actions),
+            lux.config.topk,
+            lux.config.sort,
+            lux.config.heatmap,
+            lux.config.max_bar_groups,
+            _sampling_config(),
+            lux.config.time_budget,
+            repr(sorted(lux.config.action_time_budgets.items())),
+        )
+        return (bool(self.pre_aggregated), config)
+
+    def _get_cached_recs(self):
+        """
+        Recommendations computed for another dataframe with the same content (see `lux.core.cache`),
+        attached to this dataframe, or None
+        """
+        recs_key = self._get_recs_cache_key()
+        cached = metadata_cache.get(self._cache_key) if recs_key is not None else None
+        if cached is None or recs_key not in cached["recs"]:
+            return None
+        rec_infolist, messages, specs = cached["recs"][recs_key]
+        for message in messages:
+            self._message.add_unique(message["text"], message["priority"])
+        rec_infolist = copy_recommendations(rec_infolist, self)
+        if _rendering_config() in specs:
+            self._rec_specs = (rec_infolist, _rendering_config(), specs[_rendering_config()])
+        return rec_infolist
+
+    def _cache_recs(self, rec_infolist, messages):
+        """
+        Record the recommendations of the dataframe (along with its sample and their widget specs) in the
+        metadata cache, with the messages added while they were computed
+        """
+        recs_key = self._get_recs_cache_key()
+        if recs_key is None:
+            return
+        cached = metadata_cache.get(self._cache_key)
+        rendering = _rendering_config()
+        if (
+            cached is not None
+            and recs_key in cached["recs"]
+            and (rendering in cached["recs"][recs_key][2] or lux.config.plotting_style is not None)
+        ):
+            return
+        if cached is None:
+            metadata = (
+                self._data_type,
+                self.unique_values,
+                self.cardinality,
+                self._min_max,
+                self._column_profile,
+            )
+            cached = {"metadata": metadata, "samples": {}, "recs": {}}
+        # replace rather than update the entry, so that its size is estimated again
+        cached = dict(cached)
+        if self._sample_rows is not None:
+            cached["samples"] = {**cached["samples"], _sampling_config(): self._sample_rows}
+        specs = {}
+        if cached["recs"].get(recs_key) is not None:
+            rec_infolist, messages, specs = cached["recs"][recs_key]
+        if self._rec_specs is not None and self._rec_specs[0] is self._rec_info:
+            # custom plotting styles are functions, which are not cached
+            if self._rec_specs[1] == rendering and lux.config.plotting_style is None:
+                specs = {**specs, rendering: self._rec_specs[2]}
+        recs = (copy_recommendations(rec_infolist, None), list(messages), specs)
+        cached["recs"] = {**cached["recs"], recs_key: recs}
+        metadata_cache.put(self._cache_key, cached)
+
     #######################################################
     ############## LuxWidget Result Display ###############
     #######################################################
@@ -599,6 +1111,7 @@ class LuxDataFrame(pd.DataFrame):
             for index in self._widget.deletedIndices[action]:
                 self._recommendation[action].remove_index(index - deletedSoFar)
                 deletedSoFar += 1
+        self._rec_specs = None
 
     def set_intent_on_click(self, change):
         from IPython.display import display, clear_output
@@ -629,25 +1142,18 @@ class LuxDataFrame(pd.DataFrame):
                 display(self.display_pandas())
                 self._pandas_only = False
             # else:
-            if not self.index.nlevels >= 2 or self.columns.nlevels >= 2:
-                self.maintain_metadata()
-
-                if self._intent != [] and (not hasattr(self, "_compiled") or not self._compiled):
-                    from lux.processor.Compiler import Compiler
-
-                    self.current_vis = Compiler.compile_intent(self, self._intent)
-
             if lux.config.default_display == "lux":
                 self._toggle_pandas_display = False
             else:
                 self._toggle_pandas_display = True
 
-            # df_to_display.maintain_recs() # compute the recommendations (TODO: This can be rendered in another thread in the background to populate self._widget)
-            self.maintain_recs()
-
-            # Observers(callback_function, listen_to_this_variable)
-            self._widget.observe(self.remove_deleted_recs, names="deletedIndices")
-            self._widget.observe(self.set_intent_on_click, names="selectedIntentIndex")
+            # with lazy display, the widget of a dataframe displayed as a Pandas table is only computed
+            # when the user toggles to Lux (or in the background, once the notebook is idle)
+            deferred = self._toggle_pandas_display and lux.config.lazy_display
+            if deferred:
+                self._precompute_recs_when_idle()
+            else:
+                self._prepare_widget()
 
             button = widgets.Button(
                 description="Toggle Pandas/Lux",
@@ -664,6 +1170,17 @@ class LuxDataFrame(pd.DataFrame):
                     if self._toggle_pandas_display:
                         display(self.display_pandas())
                     else:
+                        nonlocal deferred
+                        if deferred:
+                            try:
+                                self._prepare_widget()
+                            except Exception:
+                                if not lux.config.pandas_fallback:
+                                    raise
+                                _warn_pandas_fallback()
+                                display(self.display_pandas())
+                                return
+                            deferred = False
                         # b.layout.display = "none"
                         display(self._widget)
                         # b.layout.display = "inline-block"
@@ -675,13 +1192,7 @@ class LuxDataFrame(pd.DataFrame):
             raise
         except Exception:
             if lux.config.pandas_fallback:
-                warnings.warn(
-                    "\nUnexpected error in rendering Lux widget and recommendations. "
-                    "Falling back to Pandas display.\n"
-                    "Please report the following issue on Github: https://github.com/lux-org/lux/issues \n",
-                    stacklevel=2,
-                )
-                warnings.warn(traceback.format_exc())
+                _warn_pandas_fallback()
                 display(self.display_pandas())
             else:
                 raise
@@ -768,8 +1279,17 @@ class LuxDataFrame(pd.DataFrame):
             widget_spec["current_vis"] = {}
         widget_spec["recommendation"] = []
 
-        # Recommended Collection
-        recCollection = LuxDataFrame.rec_to_JSON(rec_infolist)
+        # Recommended Collection (the specs of the recommendations are kept until they expire)
+        rendering = _rendering_config()
+        if (
+            self._rec_specs is not None
+            and self._rec_specs[0] is rec_infolist
+            and self._rec_specs[1] == rendering
+        ):
+            recCollection = self._rec_specs[2]
+        else:
+            recCollection = LuxDataFrame.rec_to_JSON(rec_infolist)
+            self._rec_specs = (rec_infolist, rendering, recCollection)
         widget_spec["recommendation"].extend(recCollection)
         return widget_spec
 
@@ -890,12 +1410,21 @@ class LuxDataFrame(pd.DataFrame):
     def head(self, n: int = 5):
         self._prev = self
         self._history.append_event("head", n=5)
-        return super(LuxDataFrame, self).head(n)
+        result = super(LuxDataFrame, self).head(n)
+        self._link_metadata(result, slice(0, len(result)))
+        return result
 
     def tail(self, n: int = 5):
         self._prev = self
         self._history.append_event("tail", n=5)
-        return super(LuxDataFrame, self).tail(n)
+        result = super(LuxDataFrame, self).tail(n)
+        self._link_metadata(result, slice(len(self) - len(result), len(self)))
+        return result
+
+    def dropna(self, *args, **kwargs):
+        result = super(LuxDataFrame, self).dropna(*args, **kwargs)
+        self._link_metadata(result)
+        return result
 
     def info(self, *args, **kwargs):
         self._pandas_only = True
@@ -921,3 +1450,55 @@ class LuxDataFrame(pd.DataFrame):
             groupby_obj._history.append_event("groupby", *args, **kwargs)
         groupby_obj.pre_aggregated = True
         return groupby_obj
+
+
+class _LuxLocIndexer(pd.core.indexing._LocIndexer):
+    def __setitem__(self, key, value):
+        super(_LuxLocIndexer, self).__setitem__(key, value)
+        self.obj._expire_indexed(key, takeable=False)
+
+
+class _LuxILocIndexer(pd.core.indexing._iLocIndexer):
+    def __setitem__(self, key, value):
+        super(_LuxILocIndexer, self).__setitem__(key, value)
+        self.obj._expire_indexed(key, takeable=True)
+
+
+def _drop_vis_entries(cache: dict, attributes: list) -> dict:
+    """
+    Entries of a cache keyed by vis signatures (see `PandasExecutor._get_vis_key`) that do not involve
+    any of the attributes
+    """
+    if cache is None:
+        return None
+    attributes = set(attributes)
+    return {
+        key: value
+        for key, value in cache.items()
+        if not any(isinstance(part, tuple) and part[0] in attributes for part in key)
+    }
+
+
+def _sampling_config():
+    # configuration the sample of a dataframe depends on
+    return (
+        lux.config.sampling,
+        lux.config.sampling_start,
+        lux.config.sampling_cap,
+        lux.config.sampling_strategy,
+    )
+
+
+def _rendering_config():
+    # configuration the widget specs of the recommendations depend on
+    return (lux.config.plotting_backend, lux.config.plotting_style)
+
+
+def _warn_pandas_fallback():
+    warnings.warn(
+        "\nUnexpected error in rendering Lux widget and recommendations. "
+        "Falling back to Pandas display.\n"
+        "Please report the following issue on Github: https://github.com/lux-org/lux/issues \n",
+        stacklevel=3,
+    )
+    warnings.warn(traceback.format_exc())
@@ -13,16 +13,28 @@
 #  limitations under the License.
 
 import pandas as pd
+import numpy as np
 from lux.vis.VisList import VisList
-from lux.vis.Vis import Vis
+from lux.vis.Vis import Vis, MAX_BARS
 from lux.core.frame import LuxDataFrame
+from lux.core.catalog import ValueCatalog, sort_values
 from lux.executor.Executor import Executor
+from lux.executor import parallel, sampling
+from lux.action import scheduler
 from lux.utils import utils
 from lux.utils.date_utils import is_datetime_series
-from lux.utils.utils import check_import_lux_widget, check_if_id_like
+from lux.utils.utils import check_import_lux_widget
 import warnings
+import weakref
 import lux
 
+# arguments of pd.factorize giving missing values a code of their own (pandas 1.5 replaced na_sentinel=None,
+# which was removed in pandas 2.0, by use_na_sentinel=False)
+if tuple(int(part) for part in pd.__version__.split(".")[:2]) >= (1, 5):
+    FACTORIZE_KEEP_NA = {"use_na_sentinel": False}
+else:
+    FACTORIZE_KEEP_NA = {"na_sentinel": None}
+
 
 class PandasExecutor(Executor):
     """
@@ -43,17 +55,31 @@ class PandasExecutor(Executor):
         SAMPLE_START = lux.config.sampling_start
         SAMPLE_CAP = lux.config.sampling_cap
         SAMPLE_FRAC = 0.75
+        if ldf._sample_level is not None:
+            # the sample is a level of the sample pyramid (see `lux.action.progressive`)
+            return
+        if ldf._sampled is not None and ldf._sampled is not ldf and ldf._sample_rows is None:
+            # sample propagated from the dataframe this one was derived from, whose rows differ
+            ldf._sampled = None
 
-        if SAMPLE_FLAG and len(ldf) > SAMPLE_CAP:
+        if SAMPLE_FLAG and len(ldf) > SAMPLE_START and lux.config.sampling_strategy == "stratified":
+            if ldf._sampled is None:  # memoize unfiltered sample df
+                n_rows = min(SAMPLE_CAP, int(round(SAMPLE_FRAC * len(ldf))))
+                PandasExecutor._take_sample(ldf, n_rows, stratified=True)
+            ldf._message.add_unique(
+                f"Large dataframe detected: Lux is only visualizing a stratified sample of {len(ldf._sampled)} rows.",
+                priority=99,
+            )
+        elif SAMPLE_FLAG and len(ldf) > SAMPLE_CAP:
             if ldf._sampled is None:  # memoize unfiltered sample df
-                ldf._sampled = ldf.sample(n=SAMPLE_CAP, random_state=1)
+                PandasExecutor._take_sample(ldf, SAMPLE_CAP)
             ldf._message.add_unique(
                 f"Large dataframe detected: Lux is only visualizing a random sample capped at {SAMPLE_CAP} rows.",
                 priority=99,
             )
         elif SAMPLE_FLAG and len(ldf) > SAMPLE_START:
             if ldf._sampled is None:  # memoize unfiltered sample df
-                ldf._sampled = ldf.sample(frac=SAMPLE_FRAC, random_state=1)
+                PandasExecutor._take_sample(ldf, int(round(SAMPLE_FRAC * len(ldf))))
             ldf._message.add_unique(
                 f"Large dataframe detected: Lux is only visualizing a random sample of {len(ldf._sampled)} rows.",
                 priority=99,
@@ -61,6 +87,39 @@ class PandasExecutor(Executor):
         else:
             ldf._sampled = ldf
 
+    @staticmethod
+    def _take_sample(ldf: LuxDataFrame, n_rows: int, stratified: bool = False):
+        """
+        Take the sample of the dataframe (`_sampled`) at the row positions drawn for the current version of
+        its data (`_sample_rows`), which are kept when the recommendations expire without the rows of the
+        dataframe changing (e.g., new intent, or new values of a column), so that the sample is not drawn
+        again. The positions are only drawn when the dataframe has none for the current sampling configuration.
+
+        Parameters
+        ----------
+        ldf : lux.core.frame
+            LuxDataFrame to sample
+        n_rows : int
+            Number of rows of the sample (expected number of rows for a stratified sample)
+        stratified : bool, optional
+            Whether the sample is stratified (see `lux.executor.sampling.stratified_sample`), by default False
+        """
+        from lux.core.frame import _sampling_config
+
+        config = _sampling_config()
+        rows = ldf._sample_rows
+        if rows is None or rows[0] != config or rows[1] != len(ldf):
+            drawn = sampling.stratified_sample(ldf, n_rows, random_state=1) if stratified else None
+            if drawn is None:
+                # same rows as ldf.sample(n=n_rows, random_state=1)
+                positions = np.random.RandomState(1).choice(len(ldf), size=n_rows, replace=False)
+                drawn = (positions, None)
+            rows = ldf._sample_rows = (config, len(ldf)) + drawn
+        _, _, positions, weights = rows
+        ldf._sampled = ldf.take(positions)
+        if weights is not None:
+            ldf._sampled._sample_weights = pd.Series(weights, index=ldf._sampled.index)
+
     @staticmethod
     def execute(vislist: VisList, ldf: LuxDataFrame):
         """
@@ -82,22 +141,146 @@ class PandasExecutor(Executor):
         None
         """
         PandasExecutor.execute_sampling(ldf)
+        # Reuse the processed data of the vis that were already executed on the same columns
+        if ldf._vis_cache is None:
+            ldf._vis_cache = {}
+        vis_keys = {}
+        pending = []
+        for vis in vislist:
+            key = PandasExecutor._get_vis_key(vis)
+            if key is not None and key in ldf._vis_cache:
+                (
+                    vis._vis_data,
+                    vis._filter_size,
+                    vis._omitted_groups,
+                    vis._omitted_total,
+                    vis._omitted_squares,
+                    vis._postbin,
+                ) = ldf._vis_cache[key]
+            else:
+                vis_keys[id(vis)] = key
+                pending.append(vis)
+        vislist = pending
+        filter_executed = {}
+        shared_results = {}
+        # Aggregated visualizations that only differ by the value of a single equality filter form a family,
+        # which is answered by grouping on the filter attribute instead of filtering once per value
+        families = {}
         for vis in vislist:
+            family_key = PandasExecutor._get_family_key(vis)
+            if family_key is not None:
+                families.setdefault(family_key, []).append(vis)
+        for family_key, family in families.items():
+            if len(family) > 1:
+                filter_attr, groupby_attrs = family_key
+                measures = [PandasExecutor._get_measure_key(vis) for vis in family]
+                weights = PandasExecutor.get_sample_weights(ldf._sampled, ldf)
+                results = PandasExecutor.execute_shared_aggregate(
+                    ldf._sampled, (filter_attr,) + groupby_attrs, measures, weights
+                )
+                if weights is None:
+                    filter_counts = ldf._sampled[filter_attr].value_counts(dropna=False)
+                else:
+                    filter_values = ldf._sampled[filter_attr].to_numpy()
+                    filter_counts = pd.Series(weights).groupby(filter_values, dropna=False).sum()
+                partitions = {}
+                for measure in set(measures):
+                    partitions[measure] = PandasExecutor._partition_by_value(
+                        results[measure], filter_attr
+                    )
+                for vis, measure in zip(family, measures):
+                    filter_value = utils.get_filter_specs(vis._inferred_intent)[0].value
+                    vis_partitions, empty_partition = partitions[measure]
+                    vis._vis_data = ldf._sampled
+                    filter_executed[id(vis)] = True
+                    shared_results[id(vis)] = vis_partitions.get(filter_value, empty_partition)
+                    vis._filter_size = PandasExecutor._estimate_filter_size(
+                        filter_counts.get(filter_value, 0), ldf, weighted=weights is not None
+                    )
+
+        # Visualizations that share the same filter are filtered only once
+        filtered_data = {}
+        # Aggregated visualizations that share the same filter and group-by key form a batch
+        batches = {}
+        for vis in vislist:
+            if id(vis) in shared_results:
+                continue
             # The vis data starts off being original or sampled dataframe
             vis._vis_data = ldf._sampled
-            filter_executed = PandasExecutor.execute_filter(vis)
+            vis._filter_size = None
+            filter_key = PandasExecutor._get_filter_key(vis)
+            if filter_key is not None and filter_key in filtered_data:
+                vis._vis_data = filtered_data[filter_key]
+                filter_executed[id(vis)] = len(filter_key) > 0
+            else:
+                filter_executed[id(vis)] = PandasExecutor.execute_filter(vis)
+                if filter_key is not None:
+                    filtered_data[filter_key] = vis.data
+            if filter_executed[id(vis)]:
+                weights = PandasExecutor.get_sample_weights(vis.data, ldf)
+                vis._filter_size = PandasExecutor._estimate_filter_size(
+                    len(vis.data) if weights is None else weights.sum(),
+                    ldf,
+                    weighted=weights is not None,
+                )
+            if vis.mark == "bar" or vis.mark == "line" or vis.mark == "geographical":
+                batch_key = PandasExecutor._get_batch_key(vis, filter_key)
+                if batch_key is not None:
+                    batches.setdefault(batch_key, []).append(vis)
+
+        # Compute the histograms and batches of the unfiltered vis of large dataframes in worker processes
+        binned_results = {}
+        # (the weighted samples, see `lux.config.sampling_strategy`, are aggregated in the current process)
+        if (
+            parallel.enabled(ldf._sampled)
+            and PandasExecutor.get_sample_weights(ldf._sampled, ldf) is None
+        ):
+            binned_results = PandasExecutor._execute_in_processes(
+                ldf, vislist, batches, filter_executed, shared_results
+            )
+
+        # Compute all measures of a batch in a single group-by pass
+        for batch_key, batch in batches.items():
+            if len(batch) > 1 and id(batch[0]) not in shared_results:
+                measures = [PandasExecutor._get_measure_key(vis) for vis in batch]
+                weights = PandasExecutor.get_sample_weights(batch[0].data, ldf)
+                results = PandasExecutor.execute_shared_aggregate(
+                    batch[0].data, batch_key[1], measures, weights
+                )
+                for vis, measure in zip(batch, measures):
+                    shared_results[id(vis)] = results[measure]
+
+        for vis in vislist:
+            if scheduler.budget_expired():
+                # the remaining vis are left without data once the time budget has run out (or the
+                # background job they are computed for is cancelled)
+                vis._vis_data = None
+                continue
+            if id(vis) in shared_results:
+                PandasExecutor.execute_aggregate(
+                    vis,
+                    isFiltered=filter_executed[id(vis)],
+                    groupby_result=shared_results[id(vis)],
+                    ldf=ldf,
+                )
+                continue
+            if id(vis) in binned_results:
+                vis._vis_data = binned_results[id(vis)]
+                continue
             # Select relevant data based on attribute information
             attributes = set([])
             for clause in vis._inferred_intent:
                 if clause.attribute != "Record":
                     attributes.add(clause.attribute)
             # TODO: Add some type of cap size on Nrows ?
-            vis._vis_data = vis.data[list(attributes)]
+            parent = vis.data
+            vis._vis_data = parent[list(attributes)]
+            PandasExecutor._link_encodings(vis.data, parent)
 
             if vis.mark == "bar" or vis.mark == "line" or vis.mark == "geographical":
-                PandasExecutor.execute_aggregate(vis, isFiltered=filter_executed)
+                PandasExecutor.execute_aggregate(vis, isFiltered=filter_executed[id(vis)], ldf=ldf)
             elif vis.mark == "histogram":
-                PandasExecutor.execute_binning(vis)
+                PandasExecutor.execute_binning(vis, PandasExecutor.get_sample_weights(vis.data, ldf))
             elif vis.mark == "scatter":
                 HBIN_START = 5000
                 if lux.config.heatmap and len(ldf) > HBIN_START:
@@ -109,31 +292,171 @@ class PandasExecutor(Executor):
                     # vis._mark = "heatmap"
                     # PandasExecutor.execute_2D_binning(vis) # Lazy Evaluation (Early pruning based on interestingness)
 
+        for vis in vislist:
+            if vis_keys[id(vis)] is not None and vis._vis_data is not None:
+                ldf._vis_cache[vis_keys[id(vis)]] = (
+                    vis._vis_data,
+                    vis._filter_size,
+                    vis._omitted_groups,
+                    vis._omitted_total,
+                    vis._omitted_squares,
+                    vis._postbin,
+                )
+
     @staticmethod
-    def execute_aggregate(vis: Vis, isFiltered=True):
+    def _execute_in_processes(ldf, vislist, batches, filter_executed, shared_results) -> dict:
         """
-        Aggregate data points on an axis for bar or line charts
+        Compute the histograms and the group-by batches of the unfiltered vis in worker processes
+        (see `lux.executor.parallel`), adding the group-by results of the batches to shared_results.
+        The vis whose columns cannot be shared with the workers are left to be computed as usual.
+
+        Returns
+        -------
+        dict
+            Maps the id of each histogram computed to its binned data
+        """
+        histograms = {}
+        for vis in vislist:
+            if vis.mark == "histogram" and not filter_executed[id(vis)]:
+                bin_attribute = list(filter(lambda x: x.bin_size != 0, vis._inferred_intent))[0]
+                histograms[id(vis)] = (bin_attribute.attribute, bin_attribute.bin_size)
+        aggregates = {}
+        for batch_key, batch in batches.items():
+            if batch_key[0] == ():
+                measures = [PandasExecutor._get_measure_key(vis) for vis in batch]
+                aggregates[batch_key] = (batch_key[1], measures)
+        if not histograms and not aggregates:
+            return {}
+        binned, aggregated = parallel.execute(ldf._sampled, histograms, aggregates)
+        for batch_key, results in aggregated.items():
+            for vis, measure in zip(batches[batch_key], aggregates[batch_key][1]):
+                shared_results[id(vis)] = results[measure]
+        return {vis_id: data for vis_id, data in binned.items() if data is not None}
+
+    @staticmethod
+    def _estimate_filter_size(n_sampled_rows, ldf: LuxDataFrame, weighted: bool = False) -> int:
+        """
+        Scale the number of rows satisfying a filter on the sampled dataframe up to the full dataframe.
 
         Parameters
         ----------
-        vis: lux.Vis
-            lux.Vis object that represents a visualization
+        n_sampled_rows : int
+            Number of rows of the sampled dataframe that satisfy the filter, or their total weight when
+            weighted (see `get_sample_weights`)
         ldf : lux.core.frame
-            LuxDataFrame with specified intent.
+            LuxDataFrame whose sample was filtered
+        weighted : bool, optional
+            Whether the rows are counted by their weight, by default False
 
         Returns
         -------
-        None
+        int
+            Estimated number of rows of the full dataframe that satisfy the filter
         """
-        import numpy as np
+        if weighted:
+            return int(round(n_sampled_rows))
+        n_sampled = len(ldf._sampled)
+        if n_sampled == 0 or n_sampled == len(ldf):
+            return int(n_sampled_rows)
+        return int(round(n_sampled_rows * len(ldf) / n_sampled))
+
+    @staticmethod
+    def get_sample_weights(df: pd.DataFrame, ldf: LuxDataFrame):
+        """
+        Weights of the rows of a dataframe derived from the sample of ldf (e.g., a filter or projection of
+        the sample), when the sample is stratified (see `lux.executor.sampling.stratified_sample`).
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Rows of the sample of ldf
+        ldf : lux.core.frame
+            LuxDataFrame whose sample the rows are taken from, or None
+
+        Returns
+        -------
+        numpy.ndarray
+            Weight of each row of df, or None when the rows are not weighted
+        """
+        if ldf is None or ldf._sampled is None:
+            return None
+        weights = getattr(ldf._sampled, "_sample_weights", None)
+        if weights is None:
+            return None
+        if df.index is weights.index:
+            return weights.to_numpy()
+        return weights.reindex(df.index).to_numpy()
+
+    @staticmethod
+    def _get_vis_key(vis: Vis):
+        """
+        Hashable signature of a Vis (mark, and attribute, channel, aggregation, binning, data type and filter
+        of each clause) along with the executor options, used to reuse the processed data of the vis across
+        recommendations.
+        Returns None if the signature can not be hashed (e.g., list of filter values).
+        """
+        # the processed data also depends on the sampling, binning and bar chart options
+        # (the executor keeps all the groups of a bar chart when `_omitted_groups` is None)
+        config = lux.config
+        key = (
+            vis.mark,
+            vis._omitted_groups is None,
+            config.sampling,
+            config.sampling_start,
+            config.sampling_cap,
+            config.sampling_strategy,
+            config.heatmap,
+            config.max_bar_groups,
+        ) + tuple(
+            (
+                clause.attribute,
+                clause.channel,
+                clause._aggregation_name,
+                clause.bin_size,
+                clause.data_type,
+                clause.filter_op,
+                clause.value,
+            )
+            for clause in vis._inferred_intent
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @staticmethod
+    def _get_filter_key(vis: Vis):
+        """
+        Hashable signature of the filters of a Vis, used to share filtered data across visualizations.
+        Returns None if the filter values can not be hashed (e.g., list of values).
+        """
+        filters = utils.get_filter_specs(vis._inferred_intent)
+        key = tuple((fltr.attribute, fltr.filter_op, fltr.value) for fltr in filters)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @staticmethod
+    def _get_aggregate_spec(vis: Vis):
+        """
+        Retrieve the group-by attribute, measure attribute, aggregation function and color attribute of an aggregated Vis
 
+        Returns
+        -------
+        tuple
+            (groupby_attr, measure_attr, agg_func, color_attr), where color_attr is None if the Vis has no color.
+            Returns None if the Vis should not be aggregated.
+        """
         x_attr = vis.get_attr_by_channel("x")[0]
         y_attr = vis.get_attr_by_channel("y")[0]
-        has_color = False
         groupby_attr = ""
         measure_attr = ""
+        agg_func = None
         if x_attr.aggregation is None or y_attr.aggregation is None:
-            return
+            return None
         if y_attr.aggregation != "":
             groupby_attr = x_attr
             measure_attr = y_attr
@@ -142,19 +465,294 @@ class PandasExecutor(Executor):
             groupby_attr = y_attr
             measure_attr = x_attr
             agg_func = x_attr.aggregation
-        if groupby_attr.attribute in vis.data.unique_values.keys():
-            attr_unique_vals = vis.data.unique_values[groupby_attr.attribute]
-        # checks if color is specified in the Vis
+        color_attr = None
         if len(vis.get_attr_by_channel("color")) == 1:
             color_attr = vis.get_attr_by_channel("color")[0]
-            color_attr_vals = vis.data.unique_values[color_attr.attribute]
-            color_cardinality = len(color_attr_vals)
+        return groupby_attr, measure_attr, agg_func, color_attr
+
+    @staticmethod
+    def _get_batch_key(vis: Vis, filter_key):
+        """
+        Key identifying the aggregated visualizations that can be computed by the same group-by pass.
+        Returns None if the Vis can not be batched (e.g., custom aggregation function).
+        """
+        if filter_key is None:
+            return None
+        spec = PandasExecutor._get_aggregate_spec(vis)
+        if spec is None:
+            return None
+        groupby_attr, measure_attr, agg_func, color_attr = spec
+        if groupby_attr == "" or measure_attr == "" or not isinstance(agg_func, str):
+            return None
+        groupby_attrs = (groupby_attr.attribute,)
+        if color_attr is not None:
+            groupby_attrs += (color_attr.attribute,)
+        return filter_key, groupby_attrs
+
+    @staticmethod
+    def _get_measure_key(vis: Vis):
+        """
+        (measure attribute, aggregation function) pair of an aggregated Vis
+        """
+        measure_attr, agg_func = PandasExecutor._get_aggregate_spec(vis)[1:3]
+        return measure_attr.attribute, agg_func
+
+    @staticmethod
+    def _get_family_key(vis: Vis):
+        """
+        Key identifying the aggregated visualizations that only differ by the value of their single equality filter
+        (e.g., the candidates of the Filter action). Returns None if the Vis does not belong to such a family.
+        """
+        if not (vis.mark == "bar" or vis.mark == "line" or vis.mark == "geographical"):
+            return None
+        filters = utils.get_filter_specs(vis._inferred_intent)
+        if len(filters) != 1:
+            return None
+        fltr = filters[0]
+        # NaN and datetime filter values do not reliably match their group key, so they are filtered as usual
+        if fltr.filter_op != "=" or utils.like_nan(fltr.value):
+            return None
+        if not isinstance(fltr.value, (str, int, float, np.number)):
+            return None
+        batch_key = PandasExecutor._get_batch_key(vis, ())
+        if batch_key is None:
+            return None
+        return fltr.attribute, batch_key[1]
+
+    @staticmethod
+    def _partition_by_value(result: pd.DataFrame, filter_attr):
+        """
+        Split a group-by result on the filter attribute into one dataframe per filter value
+
+        Returns
+        -------
+        tuple
+            (dict mapping each filter value to its partition, empty partition for values absent from the data)
+        """
+        partitions = {}
+        for value, partition in result.groupby(filter_attr, sort=False, history=False):
+            partitions[value] = partition.drop(columns=filter_attr).reset_index(drop=True)
+        empty_partition = result.iloc[0:0].drop(columns=filter_attr)
+        return partitions, empty_partition
+
+    @staticmethod
+    def execute_shared_aggregate(
+        df: pd.DataFrame, groupby_attrs: tuple, measures: list, weights: np.ndarray = None
+    ) -> dict:
+        """
+        Compute the aggregations of several visualizations that share the same group-by key in a single pass
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            (Filtered) dataframe to aggregate
+        groupby_attrs : tuple
+            Group-by attribute, followed by the color attribute if any
+        measures : list
+            List of (measure attribute, aggregation function) pairs, where "Record" denotes a count of rows
+        weights : numpy.ndarray, optional
+            Weight of each row (see `get_sample_weights`), by default None. The counts, sums and means are
+            weighted, the other aggregations are not.
+
+        Returns
+        -------
+        dict
+            Maps each (measure attribute, aggregation function) pair to a dataframe with the group-by attributes and the aggregated measure
+        """
+        weighted_results = {}
+        if weights is not None:
+            weighted = [measure for measure in measures if PandasExecutor._is_weighted(measure)]
+            if weighted:
+                weighted_results = PandasExecutor._execute_weighted_aggregate(
+                    df, groupby_attrs, weighted, weights
+                )
+            measures = [measure for measure in measures if measure not in weighted_results]
+            if not measures:
+                return weighted_results
+        groupby_attrs = list(groupby_attrs)
+        agg_spec = {}
+        for attr, agg_func in measures:
+            if attr != "Record" and agg_func not in agg_spec.get(attr, []):
+                agg_spec.setdefault(attr, []).append(agg_func)
+        groups, decoders = PandasExecutor._groupby_encoded(df, groupby_attrs)
+        if agg_spec:
+            groupby_result = groups.agg(agg_spec)
+        results = {}
+        for attr, agg_func in measures:
+            if attr == "Record":
+                result = groups.size().rename("Record")
+            else:
+                result = groupby_result[(attr, agg_func)].rename(attr)
+            result.index = PandasExecutor._decode_index(result.index, decoders)
+            results[(attr, agg_func)] = result.reset_index().__finalize__(df)
+        results.update(weighted_results)
+        return results
+
+    @staticmethod
+    def _is_weighted(measure) -> bool:
+        # aggregations that are estimated from the weights of the rows of a stratified sample
+        attr, agg_func = measure
+        return attr == "Record" or agg_func in ("count", "sum", "mean")
+
+    @staticmethod
+    def _execute_weighted_aggregate(
+        df: pd.DataFrame, groupby_attrs: tuple, measures: list, weights: np.ndarray
+    ) -> dict:
+        """
+        Weighted counts, sums and means of the groups of the dataframe (see `execute_shared_aggregate`)
+        """
+        keys = []
+        decoders = []
+        for attr in groupby_attrs:
+            encoding = PandasExecutor.get_encoding(df, attr)
+            if encoding is not None and encoding[2]:
+                codes, categories, _ = encoding
+                keys.append(np.where(codes == -1, len(categories), codes))
+                decoders.append((attr, np.append(np.asarray(categories, dtype=object), np.nan)))
+            else:
+                keys.append(df[attr].to_numpy())
+                decoders.append((attr, None))
+        # total weight of the rows, and weighted sum and total weight of the non-missing values of each measure
+        columns = [weights]
+        for attr, _ in measures:
+            if attr != "Record":
+                values = df[attr].to_numpy(dtype=float, na_value=np.nan)
+                valid = ~np.isnan(values)
+                columns.append(np.where(valid, values * weights, 0.0))
+                columns.append(np.where(valid, weights, 0.0))
+        sums = pd.DataFrame(np.column_stack(columns)).groupby(
+            keys if len(keys) > 1 else keys[0], dropna=False, history=False
+        )
+        sums = sums.sum()
+        sums.index.names = list(groupby_attrs)
+        index = PandasExecutor._decode_index(sums.index, decoders)
+        results = {}
+        position = 1
+        for attr, agg_func in measures:
+            if attr == "Record":
+                # the estimated counts are rounded to the nearest integer
+                values = np.round(sums[0].to_numpy()).astype(np.int64)
+            else:
+                total, count = sums[position].to_numpy(), sums[position + 1].to_numpy()
+                position += 2
+                if agg_func == "sum":
+                    values = total
+                elif agg_func == "count":
+                    values = np.round(count).astype(np.int64)
+                else:
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        values = total / count
+            result = pd.Series(values, index=index, name=attr)
+            results[(attr, agg_func)] = result.reset_index().__finalize__(df)
+        return results
+
+    @staticmethod
+    def _groupby_encoded(df: pd.DataFrame, groupby_attrs: list):
+        """
+        Group the dataframe by the given attributes, where nominal attributes are grouped on their dictionary codes
+        (see `get_encoding`) rather than on their values. Only the remaining columns are selected for aggregation.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Dataframe to group
+        groupby_attrs : list
+            List of group-by attributes
+
+        Returns
+        -------
+        tuple
+            (group-by object, list of (attribute, array that decodes its codes or None) for each group-by attribute)
+        """
+        keys = []
+        decoders = []
+        for attr in groupby_attrs:
+            encoding = PandasExecutor.get_encoding(df, attr)
+            if encoding is not None and encoding[2]:
+                codes, categories, _ = encoding
+                # missing values are given the last code, so that they are grouped last as with dropna=False
+                # (the codes are passed as an index, since pandas prints the arrays it looks up as column names)
+                keys.append(pd.Index(np.where(codes == -1, len(categories), codes)))
+                decoders.append((attr, np.append(np.asarray(categories, dtype=object), np.nan)))
+            else:
+                keys.append(attr)
+                decoders.append((attr, None))
+        if len(keys) == 1:
+            keys = keys[0]
+        groups = df.groupby(keys, dropna=False, history=False)
+        columns = [col for col in df.columns if col not in groupby_attrs]
+        if any(decoder is not None for _, decoder in decoders) and len(columns) > 0:
+            groups = groups[columns]
+        return groups, decoders
+
+    @staticmethod
+    def _decode_index(index: pd.Index, decoders: list) -> pd.Index:
+        """
+        Map the codes of the encoded levels of a group-by result index back to their values
+        """
+        if all(decoder is None for _, decoder in decoders):
+            return index
+        if isinstance(index, pd.MultiIndex):
+            levels = []
+            for i, (attr, decoder) in enumerate(decoders):
+                level = index.get_level_values(i)
+                if decoder is not None:
+                    level = pd.Index(decoder.take(level), dtype=object)
+                levels.append(level)
+            return pd.MultiIndex.from_arrays(levels, names=[attr for attr, _ in decoders])
+        attr, decoder = decoders[0]
+        return pd.Index(decoder.take(index), dtype=object, name=attr)
+
+    @staticmethod
+    def execute_aggregate(vis: Vis, isFiltered=True, groupby_result=None, ldf: LuxDataFrame = None):
+        """
+        Aggregate data points on an axis for bar or line charts
+
+        Parameters
+        ----------
+        vis: lux.Vis
+            lux.Vis object that represents a visualization
+        groupby_result : pandas.DataFrame, optional
+            Group-by result already computed for this vis as part of a batch (see `execute_shared_aggregate`),
+            by default None (the group-by is computed on vis.data)
+        ldf : lux.core.frame, optional
+            LuxDataFrame with specified intent, by default None (vis.data)
+
+        Returns
+        -------
+        None
+        """
+        import numpy as np
+
+        aggregate_spec = PandasExecutor._get_aggregate_spec(vis)
+        if aggregate_spec is None:
+            return
+        groupby_attr, measure_attr, agg_func, color_attr = aggregate_spec
+        has_color = False
+        # order of the values of the group-by attribute (None when it is not in the metadata, e.g. the index)
+        order, sortable = None, True
+        if groupby_attr.attribute in vis.data.unique_values:
+            order, sortable = PandasExecutor._get_category_order(vis, groupby_attr.attribute, ldf)
+        # checks if color is specified in the Vis
+        if color_attr is not None:
+            color_order, _ = PandasExecutor._get_category_order(vis, color_attr.attribute, ldf)
+            color_cardinality = len(color_order)
             # NOTE: might want to have a check somewhere to not use categorical variables with greater than some number of categories as a Color variable----------------
             has_color = True
         else:
             color_cardinality = 1
         if measure_attr != "":
-            if measure_attr.attribute == "Record":
+            weights = PandasExecutor.get_sample_weights(vis.data, ldf)
+            if groupby_result is None and weights is not None and isinstance(agg_func, str):
+                # aggregate the rows of a stratified sample by their weight
+                measure = (measure_attr.attribute, agg_func)
+                if PandasExecutor._is_weighted(measure):
+                    keys = (groupby_attr.attribute,) + ((color_attr.attribute,) if has_color else ())
+                    results = PandasExecutor.execute_shared_aggregate(vis.data, keys, [measure], weights)
+                    groupby_result = results[measure]
+            if groupby_result is not None:
+                vis._vis_data = groupby_result
+            elif measure_attr.attribute == "Record":
                 # need to get the index name so that we can rename the index column to "Record"
                 # if there is no index, default to "index"
                 index_name = vis.data.index.name
@@ -165,88 +763,76 @@ class PandasExecutor(Executor):
                 # if color is specified, need to group by groupby_attr and color_attr
 
                 if has_color:
-                    vis._vis_data = (
-                        vis.data.groupby(
-                            [groupby_attr.attribute, color_attr.attribute], dropna=False, history=False
-                        )
-                        .count()
-                        .reset_index()
-                        .rename(columns={index_name: "Record"})
+                    groups, decoders = PandasExecutor._groupby_encoded(
+                        vis.data, [groupby_attr.attribute, color_attr.attribute]
                     )
+                    groupby_result = groups.count()
+                    groupby_result.index = PandasExecutor._decode_index(groupby_result.index, decoders)
+                    vis._vis_data = groupby_result.reset_index().rename(columns={index_name: "Record"})
                     vis._vis_data = vis.data[[groupby_attr.attribute, color_attr.attribute, "Record"]]
                 else:
-                    vis._vis_data = (
-                        vis.data.groupby(groupby_attr.attribute, dropna=False, history=False)
-                        .count()
-                        .reset_index()
-                        .rename(columns={index_name: "Record"})
+                    groups, decoders = PandasExecutor._groupby_encoded(
+                        vis.data, [groupby_attr.attribute]
                     )
+                    groupby_result = groups.count()
+                    groupby_result.index = PandasExecutor._decode_index(groupby_result.index, decoders)
+                    vis._vis_data = groupby_result.reset_index().rename(columns={index_name: "Record"})
                     vis._vis_data = vis.data[[groupby_attr.attribute, "Record"]]
             else:
                 # if color is specified, need to group by groupby_attr and color_attr
                 if has_color:
-                    groupby_result = vis.data.groupby(
-                        [groupby_attr.attribute, color_attr.attribute], dropna=False, history=False
+                    groups, decoders = PandasExecutor._groupby_encoded(
+                        vis.data, [groupby_attr.attribute, color_attr.attribute]
                     )
                 else:
-                    groupby_result = vis.data.groupby(
-                        groupby_attr.attribute, dropna=False, history=False
+                    groups, decoders = PandasExecutor._groupby_encoded(
+                        vis.data, [groupby_attr.attribute]
                     )
-                groupby_result = groupby_result.agg(agg_func)
+                groupby_result = groups.agg(agg_func)
+                groupby_result.index = PandasExecutor._decode_index(groupby_result.index, decoders)
                 intermediate = groupby_result.reset_index()
                 vis._vis_data = intermediate.__finalize__(vis.data)
-            result_vals = list(vis.data[groupby_attr.attribute])
-            # create existing group by attribute combinations if color is specified
-            # this is needed to check what combinations of group_by_attr and color_attr values have a non-zero number of elements in them
+            keys = [groupby_attr.attribute]
             if has_color:
-                res_color_combi_vals = []
-                result_color_vals = list(vis.data[color_attr.attribute])
-                for i in range(0, len(result_vals)):
-                    res_color_combi_vals.append([result_vals[i], result_color_vals[i]])
+                keys.append(color_attr.attribute)
+            if vis._omitted_groups is not None:
+                vis._omitted_groups = 0
+                vis._omitted_total = None
+                vis._omitted_squares = None
+                max_groups = lux.config.max_bar_groups
+                # For bar charts of high-cardinality attributes, only keep the groups that are rendered
+                if max_groups and vis.mark == "bar" and not isFiltered and not has_color:
+                    if len(vis.data) > max_groups:
+                        PandasExecutor._keep_top_groups(vis, measure_attr)
             # For filtered aggregation that have missing groupby-attribute values, set these aggregated value as 0, since no datapoints
-            if isFiltered or has_color and attr_unique_vals:
-                N_unique_vals = len(attr_unique_vals)
-                if len(result_vals) != N_unique_vals * color_cardinality:
-                    columns = vis.data.columns
-                    if has_color:
-                        df = pd.DataFrame(
-                            {
-                                columns[0]: attr_unique_vals * color_cardinality,
-                                columns[1]: pd.Series(color_attr_vals).repeat(N_unique_vals),
-                            }
-                        )
-                        vis._vis_data = vis.data.merge(
-                            df,
-                            on=[columns[0], columns[1]],
-                            how="right",
-                            suffixes=["", "_right"],
-                        )
-                        for col in columns[2:]:
-                            vis.data[col] = vis.data[col].fillna(0)  # Triggers __setitem__
-                        assert len(list(vis.data[groupby_attr.attribute])) == N_unique_vals * len(
-                            color_attr_vals
-                        ), f"Aggregated data missing values compared to original range of values of `{groupby_attr.attribute, color_attr.attribute}`."
-
-                        # Keep only the three relevant columns not the *_right columns resulting from merge
-                        vis._vis_data = vis.data.iloc[:, :3]
-
-                    else:
-                        df = pd.DataFrame({columns[0]: attr_unique_vals})
-
-                        vis._vis_data = vis.data.merge(
-                            df, on=columns[0], how="right", suffixes=["", "_right"]
-                        )
-
-                        for col in columns[1:]:
-                            vis.data[col] = vis.data[col].fillna(0)
-                        assert (
-                            len(list(vis.data[groupby_attr.attribute])) == N_unique_vals
-                        ), f"Aggregated data missing values compared to original range of values of `{groupby_attr.attribute}`."
-
-            vis._vis_data = vis._vis_data.dropna(subset=[measure_attr.attribute])
-            try:
-                vis._vis_data = vis._vis_data.sort_values(by=groupby_attr.attribute, ascending=True)
-            except TypeError:
+            if (
+                order is not None
+                and (isFiltered or has_color and len(order) > 0)
+                and len(vis.data) != len(order) * color_cardinality
+            ):
+                if has_color:
+                    target = pd.MultiIndex.from_product([order, color_order], names=keys)
+                    # Keep only the three relevant columns
+                    value_columns = [col for col in vis.data.columns if col not in keys][:1]
+                else:
+                    target = pd.Index(order, name=keys[0])
+                    value_columns = [col for col in vis.data.columns if col not in keys]
+                padded = vis.data.set_index(keys)[value_columns].reindex(target).fillna(0)
+                vis._vis_data = padded.reset_index().__finalize__(vis.data)
+                assert len(vis.data) == len(order) * (
+                    len(color_order) if has_color else 1
+                ), f"Aggregated data missing values compared to original range of values of `{keys}`."
+            else:
+                vis._vis_data = vis._vis_data.dropna(subset=[measure_attr.attribute])
+                if order is None:
+                    order, sortable = sort_values(list(vis.data[groupby_attr.attribute].unique()))
+                # order the groups following the order of the group-by attribute values (stable for color)
+                positions = pd.Index(order).get_indexer(vis.data[groupby_attr.attribute])
+                if (positions == -1).any():
+                    sortable = False
+                elif not (np.diff(positions) >= 0).all():
+                    vis._vis_data = vis.data.iloc[np.argsort(positions, kind="stable")]
+            if not sortable:
                 warnings.warn(
                     f"\nLux detects that the attribute '{groupby_attr.attribute}' maybe contain mixed type."
                     + f"\nTo visualize this attribute, you may want to convert the '{groupby_attr.attribute}' into a uniform type as follows:"
@@ -254,11 +840,84 @@ class PandasExecutor(Executor):
                 )
                 vis._vis_data[groupby_attr.attribute] = vis._vis_data[groupby_attr.attribute].astype(str)
                 vis._vis_data = vis._vis_data.sort_values(by=groupby_attr.attribute, ascending=True)
-            vis._vis_data = vis._vis_data.reset_index()
-            vis._vis_data = vis._vis_data.drop(columns="index")
+            vis._vis_data = vis._vis_data.reset_index(drop=True)
 
     @staticmethod
-    def execute_binning(vis: Vis):
+    def _keep_top_groups(vis: Vis, measure_attr, k: int = MAX_BARS):
+        """
+        Keep the k groups of a bar chart with the largest aggregated values, recording the number of groups
+        left out along with the sum and the sum of squares of their values, from which the unevenness of the
+        whole bar chart is scored (see `interestingness.unevenness`), whatever the aggregation
+
+        Parameters
+        ----------
+        vis: lux.Vis
+            lux.Vis object that represents a bar chart
+        measure_attr : lux.Clause
+            Clause of the aggregated measure
+        k : int, optional
+            Number of groups to keep, by default the number of bars rendered (see `lux.vis.Vis.MAX_BARS`)
+        """
+        values = vis.data[measure_attr.attribute].reset_index(drop=True)
+        top = values.nlargest(k).index.to_numpy()
+        vis._omitted_groups = len(values) - len(top)
+        omitted = values.drop(top)
+        vis._omitted_total = omitted.sum()
+        vis._omitted_squares = (omitted.astype(float) ** 2).sum()
+        vis._vis_data = vis.data.iloc[top]
+
+    @staticmethod
+    def _get_attribute_values(vis: Vis, attribute, ldf: LuxDataFrame = None) -> list:
+        """
+        All the distinct values of an attribute of the vis, as recorded in the value catalog of the data
+        (`unique_values` in the frame metadata). When the catalog only holds the most frequent values of the
+        attribute, the values are looked up once on the dataframe and kept in the catalog
+        (see `ValueCatalog.all_values`).
+
+        Parameters
+        ----------
+        vis: lux.Vis
+            lux.Vis object that represents a visualization
+        attribute : str
+            Name of the attribute
+        ldf : lux.core.frame, optional
+            LuxDataFrame of the vis, by default None (vis.data)
+
+        Returns
+        -------
+        list
+            Distinct values of the attribute
+        """
+        if ldf is None:
+            ldf = vis.data
+        return vis.data.unique_values.all_values(attribute, lambda: ldf[attribute].unique())
+
+    @staticmethod
+    def _get_category_order(vis: Vis, attribute, ldf: LuxDataFrame = None) -> tuple:
+        """
+        All the distinct values of an attribute of the vis in sorted order, as kept in the value catalog of
+        the data (see `ValueCatalog.order`), so that they are only sorted once per attribute
+
+        Parameters
+        ----------
+        vis: lux.Vis
+            lux.Vis object that represents a visualization
+        attribute : str
+            Name of the attribute
+        ldf : lux.core.frame, optional
+            LuxDataFrame of the vis, by default None (vis.data)
+
+        Returns
+        -------
+        tuple
+            (list of ordered values, whether the values could be sorted)
+        """
+        if ldf is None:
+            ldf = vis.data
+        return vis.data.unique_values.order(attribute, lambda: ldf[attribute].unique())
+
+    @staticmethod
+    def execute_binning(vis: Vis, weights: np.ndarray = None):
         """
         Binning of data points for generating histograms
 
@@ -266,8 +925,8 @@ class PandasExecutor(Executor):
         ----------
         vis: lux.Vis
             lux.Vis object that represents a visualization
-        ldf : lux.core.frame
-            LuxDataFrame with specified intent.
+        weights : numpy.ndarray, optional
+            Weight of each row of the vis data (see `get_sample_weights`), by default None
 
         Returns
         -------
@@ -280,8 +939,12 @@ class PandasExecutor(Executor):
         if not np.isnan(vis.data[bin_attr]).all():
             # np.histogram breaks if array contain NaN
             series = vis.data[bin_attr].dropna()
+            if weights is not None:
+                weights = weights[vis.data[bin_attr].notna().to_numpy()]
             # TODO:binning runs for name attribte. Name attribute has datatype quantitative which is wrong.
-            counts, bin_edges = np.histogram(series, bins=bin_attribute.bin_size)
+            counts, bin_edges = np.histogram(series, bins=bin_attribute.bin_size, weights=weights)
+            if weights is not None:
+                counts = np.round(counts)
             # bin_edges of size N+1, so need to compute bin_start as the bin location
             bin_start = bin_edges[0:-1]
             # TODO: Should vis.data be a LuxDataFrame or a Pandas DataFrame?
@@ -332,101 +995,320 @@ class PandasExecutor(Executor):
                 warnings.warn("Filter on NaN must be used with equality operations (i.e., `=` or `!=`)")
             else:
                 if op == "=":
-                    return df[df[attribute].isna()]
+                    return PandasExecutor._take_rows(df, df[attribute].isna())
                 elif op == "!=":
-                    return df[~df[attribute].isna()]
+                    return PandasExecutor._take_rows(df, ~df[attribute].isna())
         # Applying filter in regular, non-NaN cases
-        if op == "=":
-            return df[df[attribute] == val]
+        if op == "=" or op == "!=":
+            # equality filters on nominal attributes compare the dictionary codes instead of the values
+            mask = PandasExecutor._encoded_equals(df, attribute, val)
+            if mask is None:
+                mask = df[attribute] == val
+            return PandasExecutor._take_rows(df, mask if op == "=" else ~mask)
         elif op == "<":
-            return df[df[attribute] < val]
+            return PandasExecutor._take_rows(df, df[attribute] < val)
         elif op == ">":
-            return df[df[attribute] > val]
+            return PandasExecutor._take_rows(df, df[attribute] > val)
         elif op == "<=":
-            return df[df[attribute] <= val]
+            return PandasExecutor._take_rows(df, df[attribute] <= val)
         elif op == ">=":
-            return df[df[attribute] >= val]
-        elif op == "!=":
-            return df[df[attribute] != val]
+            return PandasExecutor._take_rows(df, df[attribute] >= val)
         return df
 
+    @staticmethod
+    def _encoded_equals(df: pd.DataFrame, attribute: str, val: object):
+        """
+        Boolean mask of the rows whose attribute is equal to val, computed on the dictionary codes of the attribute
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask, or None if the attribute is not dictionary encoded
+        """
+        encoding = PandasExecutor.get_encoding(df, attribute)
+        if encoding is None:
+            return None
+        codes, categories, _ = encoding
+        try:
+            code = categories.get_loc(val)
+        except KeyError:
+            return np.zeros(len(codes), dtype=bool)
+        except TypeError:
+            return None
+        if not isinstance(code, (int, np.integer)):
+            return None
+        return codes == code
+
+    @staticmethod
+    def _take_rows(df: pd.DataFrame, mask) -> pd.DataFrame:
+        """
+        Select the rows of the dataframe given by a boolean mask. The filtered dataframe derives its dictionary
+        encodings from the ones of df, instead of encoding its columns again.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        result = df[mask]
+        PandasExecutor._link_encodings(result, df, mask)
+        return result
+
+    @staticmethod
+    def _link_encodings(child: pd.DataFrame, parent: pd.DataFrame, rows=None):
+        """
+        Record that the rows of child are the rows of parent at the given positions (or selected by a boolean
+        mask, all the rows if None), so that the dictionary encodings of child can be derived from the ones
+        of parent. Only a weak reference to parent is kept, so that a small subset of a large dataframe
+        does not keep it and its encodings alive.
+        """
+        if isinstance(child, LuxDataFrame) and isinstance(parent, LuxDataFrame) and child is not parent:
+            if rows is not None:
+                rows = np.asarray(rows)
+                if rows.dtype == bool:
+                    rows = np.flatnonzero(rows)
+            child._encoding_source = (weakref.ref(parent), parent._encodings_version, rows)
+
+    @staticmethod
+    def get_encoding(df: pd.DataFrame, attribute):
+        """
+        Dictionary encoding of a nominal (object dtype) attribute, built lazily and cached on the LuxDataFrame.
+        The codes of missing values are -1, and when possible the categories are sorted so that
+        the order of the codes follows the order of the values.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Dataframe containing the attribute
+        attribute : str
+            Attribute to encode
+
+        Returns
+        -------
+        tuple
+            (numpy.ndarray of integer codes, pandas.Index of categories, whether the categories are sorted),
+            or None if the attribute is not dictionary encoded
+        """
+        if not isinstance(df, LuxDataFrame):
+            return None
+        if df._encodings is None:
+            df._encodings = {}
+        if attribute in df._encodings:
+            return df._encodings[attribute]
+        encoding = None
+        series = df[attribute]
+        if isinstance(series, pd.Series) and series.dtype == object:
+            if df._encoding_source is not None:
+                parent_ref, version, rows = df._encoding_source
+                parent = parent_ref()
+                # the encodings of parent expire whenever its values change
+                if parent is not None and parent._encodings_version == version:
+                    parent_encoding = PandasExecutor.get_encoding(parent, attribute)
+                    if parent_encoding is not None:
+                        codes, categories, is_sorted = parent_encoding
+                        encoding = (codes if rows is None else codes.take(rows), categories, is_sorted)
+            if encoding is None:
+                try:
+                    codes, categories = pd.factorize(series, sort=True)
+                    encoding = (codes, categories, True)
+                except TypeError:
+                    # values of mixed types can not be sorted
+                    codes, categories = pd.factorize(series)
+                    encoding = (codes, categories, False)
+        df._encodings[attribute] = encoding
+        return encoding
+
     @staticmethod
     def execute_2D_binning(vis: Vis):
-        pd.reset_option("mode.chained_assignment")
-        with pd.option_context("mode.chained_assignment", None):
-            x_attr = vis.get_attr_by_channel("x")[0].attribute
-            y_attr = vis.get_attr_by_channel("y")[0].attribute
-
-            vis._vis_data["xBin"] = pd.cut(vis._vis_data[x_attr], bins=lux.config.heatmap_bin_size)
-            vis._vis_data["yBin"] = pd.cut(vis._vis_data[y_attr], bins=lux.config.heatmap_bin_size)
-
-            color_attr = vis.get_attr_by_channel("color")
-            if len(color_attr) > 0:
-                color_attr = color_attr[0]
-                groups = vis._vis_data.groupby(["xBin", "yBin"], history=False)[color_attr.attribute]
-                if color_attr.data_type == "nominal":
-                    # Compute mode and count. Mode aggregates each cell by taking the majority vote for the category variable. In cases where there is ties across categories, pick the first item (.iat[0])
-                    result = groups.agg(
-                        [
-                            ("count", "count"),
-                            (color_attr.attribute, lambda x: pd.Series.mode(x).iat[0]),
-                        ]
-                    ).reset_index()
-                elif color_attr.data_type == "quantitative":
-                    # Compute the average of all values in the bin
-                    result = groups.agg(
-                        [("count", "count"), (color_attr.attribute, "mean")]
-                    ).reset_index()
-                result = result.dropna()
+        """
+        Bin the x and y attributes of a scatterplot into a heatmap_bin_size x heatmap_bin_size grid.
+        Each non-empty cell holds the number of records, along with the mode (for a nominal color attribute)
+        or the average (for a quantitative color attribute) of the color attribute.
+
+        Parameters
+        ----------
+        vis: lux.Vis
+            lux.Vis object that represents a scatterplot
+
+        Returns
+        -------
+        None
+        """
+        n_bins = lux.config.heatmap_bin_size
+        x_attr = vis.get_attr_by_channel("x")[0].attribute
+        y_attr = vis.get_attr_by_channel("y")[0].attribute
+        x_values = vis._vis_data[x_attr].to_numpy(dtype=float, na_value=np.nan)
+        y_values = vis._vis_data[y_attr].to_numpy(dtype=float, na_value=np.nan)
+        valid = ~(np.isnan(x_values) | np.isnan(y_values))
+        x_edges, x_codes = PandasExecutor._compute_bin_codes(
+            x_values, valid, vis._min_max.get(x_attr), n_bins
+        )
+        y_edges, y_codes = PandasExecutor._compute_bin_codes(
+            y_values, valid, vis._min_max.get(y_attr), n_bins
+        )
+        # flattened cell index, ordered by x bin then y bin
+        cells = x_codes * n_bins + y_codes
+
+        result = {}
+        color_attr = vis.get_attr_by_channel("color")
+        if len(color_attr) > 0:
+            color_attr = color_attr[0]
+            color_values = vis._vis_data[color_attr.attribute][valid]
+            has_color = color_values.notnull().to_numpy()
+            cells = cells[has_color]
+            color_values = color_values[has_color]
+            counts = np.bincount(cells, minlength=n_bins * n_bins)
+            if color_attr.data_type == "quantitative":
+                # Compute the average of all values in the bin
+                sums = np.bincount(
+                    cells,
+                    weights=color_values.to_numpy(dtype=float, na_value=np.nan),
+                    minlength=n_bins * n_bins,
+                )
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    color_result = sums / counts
             else:
-                groups = vis._vis_data.groupby(["xBin", "yBin"], history=False)[x_attr]
-                result = groups.count().reset_index(name=x_attr)
-                result = result.rename(columns={x_attr: "count"})
-                result = result[result["count"] != 0]
+                # Compute mode and count. Mode aggregates each cell by taking the majority vote for the category variable.
+                # In cases where there is ties across categories, pick the first category in sorted order
+                try:
+                    color_codes, categories = pd.factorize(color_values, sort=True)
+                except TypeError:
+                    color_codes, categories = pd.factorize(color_values)
+                n_categories = len(categories)
+                contingency = np.bincount(
+                    cells * n_categories + color_codes, minlength=n_bins * n_bins * n_categories
+                ).reshape(n_bins * n_bins, n_categories)
+                color_result = (
+                    np.asarray(categories)[contingency.argmax(axis=1)] if n_categories > 0 else None
+                )
+            non_empty = np.flatnonzero(counts)
+            result["count"] = counts[non_empty]
+            result[color_attr.attribute] = color_result[non_empty] if len(non_empty) > 0 else []
+        else:
+            counts = np.bincount(cells, minlength=n_bins * n_bins)
+            non_empty = np.flatnonzero(counts)
+            result["count"] = counts[non_empty]
+
+        # convert type to facilitate weighted correlation interestingess calculation
+        x_bins = non_empty // n_bins
+        y_bins = non_empty % n_bins
+        result["xBinStart"] = x_edges[x_bins]
+        result["xBinEnd"] = x_edges[x_bins + 1]
+        result["yBinStart"] = y_edges[y_bins]
+        result["yBinEnd"] = y_edges[y_bins + 1]
+        vis._vis_data = pd.DataFrame(result)
 
-            # convert type to facilitate weighted correlation interestingess calculation
-            result["xBinStart"] = result["xBin"].apply(lambda x: x.left).astype("float")
-            result["xBinEnd"] = result["xBin"].apply(lambda x: x.right)
+    @staticmethod
+    def _compute_bin_codes(values: np.ndarray, valid: np.ndarray, bounds, n_bins: int):
+        """
+        Assign the valid values to n_bins equal-width bins spanning the given (min, max) bounds.
 
-            result["yBinStart"] = result["yBin"].apply(lambda x: x.left).astype("float")
-            result["yBinEnd"] = result["yBin"].apply(lambda x: x.right)
+        Parameters
+        ----------
+        values : numpy.ndarray
+            Values to be binned
+        valid : numpy.ndarray
+            Boolean mask of the values to keep
+        bounds : tuple
+            (min, max) of the attribute, the range of the valid values is used if None
+        n_bins : int
+            Number of bins
 
-            vis._vis_data = result.drop(columns=["xBin", "yBin"])
+        Returns
+        -------
+        tuple
+            Array of the n_bins + 1 bin edges and array of the bin index of each valid value
+        """
+        values = values[valid]
+        if bounds is None or not np.isfinite(bounds).all():
+            bounds = (values.min(), values.max()) if len(values) > 0 else (0.0, 1.0)
+        low, high = float(bounds[0]), float(bounds[1])
+        # clip in case the data drifted away from the precomputed bounds
+        low, high = min(low, values.min(initial=low)), max(high, values.max(initial=high))
+        if low == high:
+            # widen the range by .1% on both sides, as done by pd.cut
+            low -= 0.001 * abs(low) if low != 0 else 0.001
+            high += 0.001 * abs(high) if high != 0 else 0.001
+        edges = np.linspace(low, high, n_bins + 1)
+        codes = np.floor((values - low) / (high - low) * n_bins).astype(int)
+        return edges, np.clip(codes, 0, n_bins - 1)
 
     #######################################################
     ############ Metadata: data type, model #############
     #######################################################
-    def compute_dataset_metadata(self, ldf: LuxDataFrame):
-        ldf._data_type = {}
-        self.compute_data_type(ldf)
+    def compute_dataset_metadata(self, ldf: LuxDataFrame, attributes: list = None):
+        if attributes is None:
+            ldf._data_type = {}
+        else:
+            # only the data types of the modified attributes are recomputed (see `compute_stats`)
+            ldf._data_type = {
+                attr: ldf._data_type[attr]
+                for attr in list(ldf.columns) + [ldf.index.name]
+                if attr in ldf._data_type
+            }
+        self.compute_data_type(ldf, attributes)
+
+    def derive_metadata(self, ldf: LuxDataFrame, lineage: dict):
+        """
+        Derive the metadata of a dataframe holding some of the rows and columns of another dataframe
+        from the metadata of the latter (see `LuxDataFrame._link_metadata`).
+        A projection (same rows) reuses the metadata of its columns as is. A row subset reuses the data
+        types of its columns, and only recomputes the statistics of its own rows (on the dictionary encodings
+        of the original dataframe restricted to these rows), leaving out the ones of the type detection.
 
-    def compute_data_type(self, ldf: LuxDataFrame):
+        Parameters
+        ----------
+        ldf : lux.core.frame
+            Derived LuxDataFrame
+        lineage : dict
+            Metadata of the original dataframe ("data_type", "unique_values", "cardinality", "min_max" and
+            "column_profile"), and whether ldf holds all the rows of the original dataframe ("projection")
+        """
+        ldf._data_type = lineage["data_type"]
+        attributes = [attr for attr in ldf.columns if attr not in ldf._data_type]
+        if lineage["projection"]:
+            ldf.unique_values = lineage["unique_values"]
+            ldf.cardinality = lineage["cardinality"]
+            ldf._min_max = lineage["min_max"]
+            ldf._column_profile = lineage["column_profile"]
+            self.compute_stats(ldf, attributes)
+        else:
+            self.compute_stats(ldf, detection=False)
+            if len(attributes) > 0:
+                # the data types of the attributes that are not in the original dataframe are detected
+                self.compute_stats(ldf, attributes)
+        self.compute_dataset_metadata(ldf, attributes)
+
+    def compute_data_type(self, ldf: LuxDataFrame, attributes: list = None):
         from pandas.api.types import is_datetime64_any_dtype as is_datetime
 
-        for attr in list(ldf.columns):
+        confidence = lux.config.detection_confidence
+        for attr in list(ldf.columns) if attributes is None else attributes:
+            # stop when the background job computing the metadata is cancelled
+            scheduler.check_cancelled()
             if attr in ldf._type_override:
                 ldf._data_type[attr] = ldf._type_override[attr]
             else:
+                profile = self._get_column_profile(ldf, attr)
                 temporal_var_list = ["month", "year", "day", "date", "time", "weekday"]
                 if is_datetime(ldf[attr]):
                     ldf._data_type[attr] = "temporal"
-                elif self._is_datetime_string(ldf[attr]):
+                elif profile["dtype_class"] == "string" and self._is_datetime_parsable(
+                    profile, confidence
+                ):
                     ldf._data_type[attr] = "temporal"
                 elif isinstance(attr, pd._libs.tslibs.timestamps.Timestamp):
                     ldf._data_type[attr] = "temporal"
                 elif str(attr).lower() in temporal_var_list:
                     ldf._data_type[attr] = "temporal"
-                elif self._is_datetime_number(ldf[attr]):
+                elif profile["dtype_class"] == "integer" and self._is_datetime_parsable(
+                    profile, confidence
+                ):
                     ldf._data_type[attr] = "temporal"
                 elif self._is_geographical_attribute(ldf[attr]):
                     ldf._data_type[attr] = "geographical"
                 elif pd.api.types.is_float_dtype(ldf.dtypes[attr]):
                     # int columns gets coerced into floats if contain NaN
-                    convertible2int = pd.api.types.is_integer_dtype(ldf[attr].convert_dtypes())
                     if (
-                        convertible2int
-                        and ldf.cardinality[attr] != len(ldf)
-                        and ldf.cardinality[attr] < 20
+                        profile["integral"]
+                        and profile["cardinality"] != len(ldf)
+                        and profile["cardinality"] < 20
                     ):
                         ldf._data_type[attr] = "nominal"
                     else:
@@ -434,17 +1316,17 @@ class PandasExecutor(Executor):
                 elif pd.api.types.is_integer_dtype(ldf.dtypes[attr]):
                     # See if integer value is quantitative or nominal by checking if the ratio of cardinality/data size is less than 0.4 and if there are less than 10 unique values
                     if ldf.pre_aggregated:
-                        if ldf.cardinality[attr] == len(ldf):
+                        if profile["cardinality"] == len(ldf):
                             ldf._data_type[attr] = "nominal"
-                    if ldf.cardinality[attr] / len(ldf) < 0.4 and ldf.cardinality[attr] < 20:
+                    if profile["cardinality"] / len(ldf) < 0.4 and profile["cardinality"] < 20:
                         ldf._data_type[attr] = "nominal"
                     else:
                         ldf._data_type[attr] = "quantitative"
-                    if check_if_id_like(ldf, attr):
+                    if self._is_id_like(attr, profile, len(ldf)):
                         ldf._data_type[attr] = "id"
                 # Eliminate this clause because a single NaN value can cause the dtype to be object
                 elif pd.api.types.is_string_dtype(ldf.dtypes[attr]):
-                    if check_if_id_like(ldf, attr):
+                    if self._is_id_like(attr, profile, len(ldf)):
                         ldf._data_type[attr] = "id"
                     else:
                         ldf._data_type[attr] = "nominal"
@@ -474,25 +1356,6 @@ class PandasExecutor(Executor):
             warn_msg += f"\n\tdf.set_data_type({{'{attr}':'quantitative'}})"
             warnings.warn(warn_msg, stacklevel=2)
 
-    @staticmethod
-    def _is_datetime_string(series):
-        if series.dtype == object:
-            not_numeric = False
-            try:
-                pd.to_numeric(series)
-            except Exception as e:
-                not_numeric = True
-
-            datetime_col = None
-            if not_numeric:
-                try:
-                    datetime_col = pd.to_datetime(series)
-                except Exception as e:
-                    return False
-            if datetime_col is not None:
-                return True
-        return False
-
     @staticmethod
     def _is_geographical_attribute(series):
         # run detection algorithm
@@ -500,42 +1363,313 @@ class PandasExecutor(Executor):
         return utils.like_geo(name)
 
     @staticmethod
-    def _is_datetime_number(series):
-        if series.dtype == int:
-            try:
-                temp = series.astype(str)
-                pd.to_datetime(temp)
-                return True
-            except Exception:
-                return False
-        return False
+    def _is_datetime_parsable(profile: dict, confidence: float) -> bool:
+        """
+        Whether enough values of the profiled attribute can be parsed as datetimes
+        """
+        return profile["datetime_parse"] is not None and profile["datetime_parse"] >= confidence
 
-    def compute_stats(self, ldf: LuxDataFrame):
-        # precompute statistics
-        ldf.unique_values = {}
-        ldf._min_max = {}
-        ldf.cardinality = {}
+    @staticmethod
+    def _is_id_like(attr, profile: dict, n_rows: int) -> bool:
+        """
+        Check whether an attribute looks like an identifier, based on the profile of the attribute
+        """
+        import re
+
+        # Strong signals
+        # so that aggregated reset_index fields don't get misclassified
+        high_cardinality = profile["cardinality"] > 500
+        attribute_contain_id = re.search(r"id|ID|iD|Id", str(attr)) is not None
+        almost_all_vals_unique = profile["cardinality"] >= 0.98 * n_rows
+        if profile["dtype_class"] == "string":
+            # For string IDs, usually serial numbers or codes with alphanumerics have a consistent length (eg., CG-39405) with little deviation.
+            str_length_uniformity = profile["str_length_std"] < 3
+            return (
+                high_cardinality
+                and (attribute_contain_id or almost_all_vals_unique)
+                and str_length_uniformity
+            )
+        else:
+            if attribute_contain_id:
+                almost_all_vals_unique = profile["cardinality"] >= 0.75 * n_rows
+            return high_cardinality and (almost_all_vals_unique or profile["evenly_spaced"])
+
+    def _get_column_profile(self, ldf: LuxDataFrame, attr) -> dict:
+        """
+        Profile of an attribute computed by `compute_stats`, profiling the attribute if it is not available
+        """
+        if ldf._column_profile is not None and attr in ldf._column_profile:
+            return ldf._column_profile[attr]
+        return PandasExecutor.profile_column(ldf[attr], PandasExecutor.get_encoding(ldf, attr))
 
-        for attribute in ldf.columns:
+    @staticmethod
+    def profile_column(series: pd.Series, encoding: tuple = None, detection: bool = True) -> dict:
+        """
+        Profile an attribute in a single pass over its values, collecting the statistics used by both
+        `compute_stats` and `compute_data_type`.
+        Apart from finding the distinct values and counting the missing ones, all statistics are derived
+        from the distinct values (or a small sample for string lengths) instead of the full column.
 
-            if isinstance(attribute, pd._libs.tslibs.timestamps.Timestamp):
-                # If timestamp, make the dictionary keys the _repr_ (e.g., TimeStamp('2020-04-05 00.000')--> '2020-04-05')
-                attribute_repr = str(attribute._date_repr)
+        Parameters
+        ----------
+        series : pandas.Series
+            Values of the attribute
+        encoding : tuple, optional
+            Dictionary encoding of the attribute (see `get_encoding`), by default None
+        detection : bool, optional
+            Whether to collect the statistics only used to detect the data type of the attribute ("integral",
+            "evenly_spaced", "str_length_mean", "str_length_std" and "datetime_parse"), by default True
+
+        Returns
+        -------
+        dict
+            Profile of the attribute, with the following keys (None when not applicable to the attribute):
+            "dtype_class" ("integer", "float", "datetime", "string" or "other"), "null_count",
+            "cardinality", "unique_values" (at most `lux.config.max_unique_values` values: the most
+            frequent ones when the attribute has more distinct values), "value_counts" (number of
+            occurrences of these most frequent values), "min" and "max" (integer and float attributes),
+            "integral" (whether a float attribute only holds whole numbers), "evenly_spaced" (whether the
+            values of an integer attribute are evenly spaced), "str_length_mean" and "str_length_std"
+            (string attributes, on a sample of 50 values) and "datetime_parse" (fraction of the values of
+            a string or integer attribute that can be parsed as datetimes, estimated on a sample).
+        """
+        from pandas.api.types import is_datetime64_any_dtype as is_datetime
+
+        dtype = series.dtype
+        profile = dict.fromkeys(
+            [
+                "min",
+                "max",
+                "integral",
+                "evenly_spaced",
+                "str_length_mean",
+                "str_length_std",
+                "datetime_parse",
+            ]
+        )
+        if is_datetime(dtype):
+            profile["dtype_class"] = "datetime"
+        elif pd.api.types.is_float_dtype(dtype):
+            profile["dtype_class"] = "float"
+        elif pd.api.types.is_integer_dtype(dtype):
+            profile["dtype_class"] = "integer"
+        elif pd.api.types.is_string_dtype(dtype):
+            profile["dtype_class"] = "string"
+        else:
+            profile["dtype_class"] = "other"
+
+        if encoding is not None:
+            unique_values = PandasExecutor._encoded_unique_values(series, encoding)
+            distinct = pd.Series(unique_values, dtype=object)
+            profile["null_count"] = int((encoding[0] == -1).sum())
+        else:
+            uniques = series.unique()
+            distinct = pd.Series(uniques)
+            unique_values = list(uniques)
+            profile["null_count"] = int(series.isna().sum())
+        profile["cardinality"] = len(unique_values)
+        profile["value_counts"] = None
+        if profile["cardinality"] > lux.config.max_unique_values:
+            # only keep the most frequent values (heavy hitters) of high-cardinality attributes,
+            # in order of appearance (as with Series.unique)
+            codes, values = pd.factorize(series, **FACTORIZE_KEEP_NA)
+            counts = np.bincount(codes)
+            top = np.sort(np.argsort(-counts, kind="stable")[: lux.config.max_unique_values])
+            unique_values = np.asarray(values.take(top))
+            profile["value_counts"] = counts[top]
+        profile["unique_values"] = unique_values
+
+        if profile["dtype_class"] in ("integer", "float"):
+            profile["min"] = distinct.min()
+            profile["max"] = distinct.max()
+        if not detection:
+            return profile
+        if profile["dtype_class"] in ("integer", "float"):
+            valid = distinct[distinct.notna()].to_numpy()
+            if profile["dtype_class"] == "float":
+                # int columns gets coerced into floats if contain NaN (same check as `convert_dtypes`)
+                profile["integral"] = bool((valid.astype(int) == valid).all())
             else:
-                attribute_repr = attribute
+                # evenly spaced values are either all equal, or all distinct (the distinct values, in order
+                # of appearance, are then the values of the column)
+                if len(series) <= 1:
+                    profile["evenly_spaced"] = True
+                elif profile["null_count"] > 0 or 1 < profile["cardinality"] < len(series):
+                    profile["evenly_spaced"] = False
+                else:
+                    diff = np.diff(distinct.to_numpy(dtype=float))
+                    profile["evenly_spaced"] = bool((diff == diff[0]).all()) if len(diff) > 0 else True
+        if profile["dtype_class"] == "string":
+            sampled = series.sample(50, random_state=99) if len(series) > 50 else series
+            lengths = sampled.apply(lambda x: type(x) == str and len(x))
+            profile["str_length_mean"] = lengths.mean()
+            profile["str_length_std"] = lengths.std()
+        if dtype == object:
+            profile["datetime_parse"] = PandasExecutor._datetime_parse_fraction(distinct, numeric=False)
+        elif dtype == int:
+            profile["datetime_parse"] = PandasExecutor._datetime_parse_fraction(distinct, numeric=True)
+        return profile
+
+    @staticmethod
+    def _datetime_parse_fraction(values: pd.Series, numeric: bool) -> float:
+        """
+        Fraction of the (distinct) values of an attribute that can be parsed as datetimes.
+        Values that can be parsed as numbers are not considered to be datetimes, unless they come
+        from an integer attribute (e.g., years such as 1998).
 
-            ldf.unique_values[attribute_repr] = list(ldf[attribute_repr].unique())
-            ldf.cardinality[attribute_repr] = len(ldf.unique_values[attribute_repr])
+        Parameters
+        ----------
+        values : pandas.Series
+            Distinct values of the attribute
+        numeric : bool
+            Whether the values come from an integer attribute
 
-            if pd.api.types.is_float_dtype(ldf.dtypes[attribute]) or pd.api.types.is_integer_dtype(
-                ldf.dtypes[attribute]
-            ):
-                ldf._min_max[attribute_repr] = (
-                    ldf[attribute].min(),
-                    ldf[attribute].max(),
-                )
+        Returns
+        -------
+        float
+            Fraction of the values that can be parsed as datetimes (estimated on a sample, see `_parse_fraction`)
+        """
+        if numeric:
+            return PandasExecutor._parse_fraction(
+                values, lambda sample, **kwargs: pd.to_datetime(sample.astype(str), **kwargs)
+            )
+        if PandasExecutor._parse_fraction(values, pd.to_numeric) >= lux.config.detection_confidence:
+            return 0.0
+        return PandasExecutor._parse_fraction(values, pd.to_datetime)
+
+    @staticmethod
+    def _parse_fraction(values: pd.Series, parser) -> float:
+        """
+        Fraction of the non-missing values that can be parsed by `parser` (e.g., pd.to_numeric).
+        The fraction is first estimated on a random sample of `lux.config.detection_sample_size` values,
+        and only computed on all the values when the estimate is within three standard errors of
+        `lux.config.detection_confidence` (i.e., the sample is not enough to decide).
+
+        Parameters
+        ----------
+        values : pandas.Series
+            Values of the attribute
+        parser : Callable
+            Parsing function, accepting an `errors` keyword argument as pd.to_numeric and pd.to_datetime
+
+        Returns
+        -------
+        float
+            Fraction of the values that can be parsed
+        """
+        values = values[values.notna()]
+        sample_size = lux.config.detection_sample_size
+        confidence = lux.config.detection_confidence
+        if len(values) > sample_size:
+            positions = np.random.default_rng(99).choice(len(values), sample_size, replace=False)
+            fraction = PandasExecutor._try_parse(values.iloc[positions], parser)
+            margin = 3 * np.sqrt(max(confidence * (1 - confidence), 1 / sample_size) / sample_size)
+            if abs(fraction - confidence) > margin:
+                return fraction
+        return PandasExecutor._try_parse(values, parser)
+
+    @staticmethod
+    def _try_parse(values: pd.Series, parser) -> float:
+        """
+        Fraction of the values that can be parsed by `parser`, without parsing the values one by one
+        when they can all be parsed at once
+        """
+        if len(values) == 0:
+            return 0.0
+        try:
+            parser(values)
+            return 1.0
+        except Exception:
+            pass
+        try:
+            return float(parser(values, errors="coerce").notna().mean())
+        except Exception:
+            return 0.0
+
+    @staticmethod
+    def _encoded_unique_values(series: pd.Series, encoding: tuple) -> list:
+        """
+        Unique values of a dictionary encoded attribute, in order of appearance (as with Series.unique)
+        """
+        codes, categories, _ = encoding
+        unique_codes = pd.unique(codes)
+        values = np.append(np.asarray(categories, dtype=object), None)
+        unique_values = list(values.take(np.where(unique_codes == -1, len(categories), unique_codes)))
+        missing = np.flatnonzero(unique_codes == -1)
+        if len(missing) > 0:
+            # the missing values (None, NaN, ...) are not encoded, so they are looked up on the series
+            i = missing[0]
+            unique_values[i : i + 1] = list(series[codes == -1].unique())
+        return unique_values
 
-        if not pd.api.types.is_integer_dtype(ldf.index):
+    def compute_stats(self, ldf: LuxDataFrame, attributes: list = None, detection: bool = True):
+        """
+        Compute the statistics of the attributes of the dataframe (`unique_values`, `cardinality` and
+        `_min_max` in the frame metadata), along with their profiles (see `profile_column`).
+
+        Parameters
+        ----------
+        ldf : lux.core.frame
+            LuxDataFrame to compute the statistics of
+        attributes : list, optional
+            Attributes modified since the statistics were last computed, by default None (the statistics of
+            all the attributes are computed). The statistics of the other attributes are kept, and those of
+            the attributes no longer in the dataframe are dropped.
+        detection : bool, optional
+            Whether to profile the attributes for the detection of their data types, by default True
+            (see `profile_column`)
+        """
+        # precompute statistics
+        if attributes is None:
+            ldf.unique_values = ValueCatalog(limit=lux.config.max_unique_values)
+            ldf._min_max = {}
+            ldf.cardinality = {}
+            ldf._column_profile = {}
+            columns = ldf.columns
+        else:
+            # replace rather than update the metadata, since the series and dataframes derived from this one refer to it.
+            # The entries of the attributes no longer in the dataframe are dropped, and the others are ordered
+            # as the columns (followed by the index)
+            kept = [PandasExecutor._attribute_repr(attribute) for attribute in ldf.columns]
+            kept = [attr for attr in kept if attr in ldf._column_profile] + [
+                attr for attr in ldf.cardinality if attr not in ldf._column_profile
+            ]
+            ldf.unique_values = ldf.unique_values.copy(kept)
+            ldf._min_max = {attr: ldf._min_max[attr] for attr in kept if attr in ldf._min_max}
+            ldf.cardinality = {attr: ldf.cardinality[attr] for attr in kept}
+            ldf._column_profile = {
+                attr: ldf._column_profile[attr] for attr in kept if attr in ldf._column_profile
+            }
+            columns = attributes
+
+        for attribute in columns:
+            # stop when the background job computing the metadata is cancelled
+            scheduler.check_cancelled()
+            attribute_repr = PandasExecutor._attribute_repr(attribute)
+            profile = PandasExecutor.profile_column(
+                ldf[attribute_repr], PandasExecutor.get_encoding(ldf, attribute_repr), detection
+            )
+            ldf._column_profile[attribute_repr] = profile
+            ldf.unique_values.add(
+                attribute_repr,
+                profile["unique_values"],
+                counts=profile["value_counts"],
+                distinct_count=profile["cardinality"],
+            )
+            ldf.cardinality[attribute_repr] = profile["cardinality"]
+
+            ldf._min_max.pop(attribute_repr, None)
+            if profile["dtype_class"] in ("integer", "float"):
+                ldf._min_max[attribute_repr] = (profile["min"], profile["max"])
+
+        if attributes is None and not pd.api.types.is_integer_dtype(ldf.index):
             index_column_name = ldf.index.name
-            ldf.unique_values[index_column_name] = list(ldf.index)
+            ldf.unique_values.add(index_column_name, ldf.index.to_numpy(), distinct_count=len(ldf.index))
             ldf.cardinality[index_column_name] = len(ldf.index)
+
+    @staticmethod
+    def _attribute_repr(attribute):
+        if isinstance(attribute, pd._libs.tslibs.timestamps.Timestamp):
+            # If timestamp, make the dictionary keys the _repr_ (e.g., TimeStamp('2020-04-05 00.000')--> '2020-04-05')
+            return str(attribute._date_repr)
+        return attribute
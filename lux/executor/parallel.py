@@ -0,0 +1,317 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+import lux
+
+# minimum number of rows of the (sampled) dataframe for its vis to be computed in worker processes
+PROCESS_MIN_ROWS = 100000
+# number of shared columns that each worker process keeps attached
+WORKER_ATTACHED_COLUMNS = 64
+
+_pool = None
+_pool_size = 0
+_lock = threading.Lock()
+# columns published in shared memory, by id of the dataframe (see `SharedColumns`)
+_published = {}
+# shared columns attached by a worker process, by name of their shared memory block
+_attached = OrderedDict()
+
+
+def available() -> bool:
+    """
+    Whether columns can be published in shared memory (`multiprocessing.shared_memory`, Python 3.8+)
+    """
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        return False
+    return True
+
+
+def enabled(df: pd.DataFrame) -> bool:
+    """
+    Whether the vis of the dataframe are computed in worker processes (see `lux.config.process_workers`)
+    """
+    return lux.config.process_workers > 0 and len(df) >= PROCESS_MIN_ROWS
+
+
+class SharedColumns:
+    """
+    Columns of a dataframe published in shared memory, so that the worker processes read them without
+    the dataframe being pickled: numeric and datetime columns as their values, and nominal columns as
+    their dictionary codes (see `PandasExecutor.get_encoding`). The columns are published once, the first
+    time a vis needs them, and the shared memory is released along with the dataframe.
+
+    Parameters
+    ----------
+    df : LuxDataFrame
+        Dataframe whose columns are published
+    """
+
+    def __init__(self, df):
+        # the encodings of the dataframe are replaced whenever its values change (see `expire_encodings`)
+        if df._encodings is None:
+            df._encodings = {}
+        self.encodings = df._encodings
+        # description of the shared column of each attribute (None when it cannot be shared), see `publish`
+        self.specs = {}
+        # categories of the nominal attributes, along with NaN for the code of missing values
+        self.decoders = {}
+        self._blocks = []
+
+    def publish(self, df, attribute) -> bool:
+        """
+        Publish the column of the attribute, if not done already
+
+        Returns
+        -------
+        bool
+            Whether the attribute is shared
+        """
+        from lux.executor.PandasExecutor import PandasExecutor
+
+        if attribute in self.specs:
+            return self.specs[attribute] is not None
+        self.specs[attribute] = None
+        series = df[attribute]
+        if not isinstance(series, pd.Series):
+            return False
+        n_categories = None
+        encoding = PandasExecutor.get_encoding(df, attribute)
+        if encoding is not None:
+            codes, categories, is_sorted = encoding
+            if not is_sorted:
+                # the values of mixed types are grouped by value rather than by code
+                return False
+            values = np.asarray(codes)
+            n_categories = len(categories)
+            self.decoders[attribute] = np.append(np.asarray(categories, dtype=object), np.nan)
+        elif series.dtype.kind in "biufM" and isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+        else:
+            return False
+        from multiprocessing import shared_memory
+
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        self._blocks.append(block)
+        np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+        self.specs[attribute] = (block.name, values.dtype.str, len(values), n_categories)
+        return True
+
+    def release(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def execute(df, histograms: dict, aggregates: dict):
+    """
+    Compute histograms and group-by aggregations of the dataframe in worker processes
+    (see `lux.config.process_workers`).
+    The workers read the columns published in shared memory (see `SharedColumns`) and only receive the
+    attributes to bin or aggregate, and send back the bins or the aggregated values. The tasks whose
+    columns cannot be shared are left out, to be computed in the current process.
+
+    Parameters
+    ----------
+    df : LuxDataFrame
+        Dataframe to bin or aggregate (the sample of the dataframe the vis are computed for)
+    histograms : dict
+        Maps each key to a (bin attribute, number of bins) pair
+    aggregates : dict
+        Maps each key to a (group-by attributes, measures) pair, where the measures are (measure attribute,
+        aggregation function) pairs as in `PandasExecutor.execute_shared_aggregate`
+
+    Returns
+    -------
+    tuple
+        (dict mapping the key of each histogram computed to its binned dataframe, or None when all the values
+        are missing, dict mapping the key of each aggregation computed to its results by measure)
+    """
+    with _lock:
+        columns = _get_shared_columns(df)
+        tasks = {}
+        for key, (attribute, bin_size) in histograms.items():
+            if df[attribute].dtype.kind in "iuf" and columns.publish(df, attribute):
+                tasks[("histogram", key)] = ("histogram", attribute, bin_size)
+        for key, (groupby_attrs, measures) in aggregates.items():
+            attributes = list(groupby_attrs) + [attr for attr, _ in measures if attr != "Record"]
+            if all(columns.publish(df, attr) for attr in attributes):
+                tasks[("aggregate", key)] = ("aggregate", tuple(groupby_attrs), list(measures))
+        pool = _get_pool()
+    specs = {
+        task_key: {attr: columns.specs[attr] for attr in _task_attributes(task)}
+        for task_key, task in tasks.items()
+    }
+    futures = {
+        task_key: pool.submit(_run_task, specs[task_key], task) for task_key, task in tasks.items()
+    }
+    binned, aggregated = {}, {}
+    try:
+        for (kind, key), future in futures.items():
+            result = future.result()
+            if kind == "histogram":
+                binned[key] = _to_binned_data(histograms[key][0], result)
+            else:
+                aggregated[key] = _to_aggregate_results(df, aggregates[key][0], columns, result)
+    except BrokenProcessPool:
+        # a worker died (e.g., out of memory): compute the remaining tasks in the current process
+        shutdown()
+    return binned, aggregated
+
+
+def shutdown() -> None:
+    """
+    Stop the worker processes
+    """
+    global _pool, _pool_size
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _pool_size = 0
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool, _pool_size
+    if _pool is None or _pool_size != lux.config.process_workers:
+        if _pool is not None:
+            _pool.shutdown()
+        # the workers are spawned rather than forked, as the lux threads (e.g., the background jobs
+        # computing recommendations) may be holding locks at the time of the fork
+        _pool = ProcessPoolExecutor(
+            max_workers=lux.config.process_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        _pool_size = lux.config.process_workers
+    return _pool
+
+
+def _get_shared_columns(df) -> SharedColumns:
+    columns = _published.get(id(df))
+    if columns is not None and columns.encodings is df._encodings:
+        return columns
+    if columns is not None:
+        # the values of the dataframe have changed since its columns were published
+        columns.release()
+    else:
+        weakref.finalize(df, _release, id(df))
+    columns = _published[id(df)] = SharedColumns(df)
+    return columns
+
+
+def _release(df_id) -> None:
+    columns = _published.pop(df_id, None)
+    if columns is not None:
+        columns.release()
+
+
+def _task_attributes(task) -> list:
+    if task[0] == "histogram":
+        return [task[1]]
+    _, groupby_attrs, measures = task
+    return list(groupby_attrs) + [attr for attr, _ in measures if attr != "Record"]
+
+
+def _to_binned_data(attribute, result) -> pd.DataFrame:
+    # same layout as `PandasExecutor.execute_binning`
+    if result is None:
+        return None
+    bin_start, counts = result
+    return pd.DataFrame(np.array([bin_start, counts]).T, columns=[attribute, "Number of Records"])
+
+
+def _to_aggregate_results(df, groupby_attrs, columns: SharedColumns, result) -> dict:
+    # same layout as `PandasExecutor.execute_shared_aggregate`
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    decoders = [(attr, columns.decoders.get(attr)) for attr in groupby_attrs]
+    results = {}
+    for (attr, agg_func), (index_arrays, values) in result.items():
+        if len(index_arrays) > 1:
+            index = pd.MultiIndex.from_arrays(index_arrays, names=list(groupby_attrs))
+        else:
+            index = pd.Index(index_arrays[0], name=groupby_attrs[0])
+        index = PandasExecutor._decode_index(index, decoders)
+        series = pd.Series(values, index=index, name=attr)
+        results[(attr, agg_func)] = series.reset_index().__finalize__(df)
+    return results
+
+
+#######################################################
+############## Run in the worker processes ############
+#######################################################
+
+
+def _attach(spec) -> np.ndarray:
+    from multiprocessing import shared_memory
+
+    name, dtype, length, _ = spec
+    if name in _attached:
+        _attached.move_to_end(name)
+        return _attached[name][1]
+    block = shared_memory.SharedMemory(name=name)
+    _attached[name] = (block, np.ndarray(length, dtype=np.dtype(dtype), buffer=block.buf))
+    while len(_attached) > WORKER_ATTACHED_COLUMNS:
+        _, (block, _) = _attached.popitem(last=False)
+        try:
+            block.close()
+        except BufferError:
+            # the column is still referenced, the block is closed along with the array
+            pass
+    return _attached[name][1]
+
+
+def _run_task(specs: dict, task):
+    from lux.core import originalSeries
+
+    if task[0] == "histogram":
+        _, attribute, bin_size = task
+        values = _attach(specs[attribute])
+        valid = ~np.isnan(values)
+        if not valid.any():
+            return None
+        counts, bin_edges = np.histogram(values[valid], bins=bin_size)
+        return bin_edges[0:-1], counts
+    _, groupby_attrs, measures = task
+    keys = []
+    for attr in groupby_attrs:
+        values = _attach(specs[attr])
+        n_categories = specs[attr][3]
+        if n_categories is not None:
+            # missing values are given the last code, as in `PandasExecutor._groupby_encoded`
+            values = np.where(values == -1, n_categories, values)
+        keys.append(values)
+    rows = originalSeries(keys[0], copy=False)
+    if len(keys) == 1:
+        keys = keys[0]
+    result = {}
+    for attr, agg_func in measures:
+        if attr == "Record":
+            aggregated = rows.groupby(keys, dropna=False).size()
+        else:
+            column = originalSeries(_attach(specs[attr]), copy=False)
+            aggregated = column.groupby(keys, dropna=False).agg(agg_func)
+        index = aggregated.index
+        index_arrays = [index.get_level_values(i).to_numpy() for i in range(index.nlevels)]
+        result[(attr, agg_func)] = (index_arrays, aggregated.to_numpy())
+    return result
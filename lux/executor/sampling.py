@@ -0,0 +1,88 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import numpy as np
+import pandas as pd
+
+# expected number of rows sampled from each category of the stratifying attributes (all the rows of the
+# less frequent categories are kept)
+STRATUM_MIN_ROWS = 30
+# maximum number of distinct values of the nominal attributes the sample is stratified by
+MAX_STRATUM_CARDINALITY = 100
+
+
+def stratified_sample(ldf, n_rows: int, random_state: int = 1):
+    """
+    Sample of about n_rows rows of the dataframe, stratified by its low-cardinality nominal attributes so
+    that their rare categories are preserved: each row is sampled with a probability that is at least the
+    one giving each of its categories STRATUM_MIN_ROWS expected rows, and otherwise uniform.
+
+    Each row of the sample is weighted by the inverse of its probability of being sampled, so that counts,
+    sums and means computed on the sample estimate the ones of the whole dataframe
+    (see `PandasExecutor.get_sample_weights`).
+
+    Parameters
+    ----------
+    ldf : lux.core.frame
+        LuxDataFrame to sample, whose metadata is computed
+    n_rows : int
+        Expected number of rows of the sample (exceeded when the rare categories need more rows)
+    random_state : int, optional
+        Seed of the sampling, by default 1
+
+    Returns
+    -------
+    tuple
+        (positions of the sampled rows, weight of each sampled row), or None when the dataframe has no
+        attribute to stratify by (or no unique index)
+    """
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    if not ldf.index.is_unique or not ldf.columns.is_unique or ldf.cardinality is None:
+        return None
+    strata = [
+        attr
+        for attr, data_type in ldf.data_type.items()
+        if data_type == "nominal" and ldf.cardinality.get(attr, 0) <= MAX_STRATUM_CARDINALITY
+    ]
+    if len(strata) == 0:
+        return None
+    # smallest probability of each row to be sampled for the categories of its attributes to be preserved
+    minimum = np.zeros(len(ldf))
+    for attr in strata:
+        encoding = PandasExecutor.get_encoding(ldf, attr)
+        if encoding is not None:
+            codes = encoding[0]
+        else:
+            codes = pd.factorize(ldf[attr])[0]
+        counts = np.bincount(codes + 1)
+        minimum = np.maximum(minimum, np.minimum(1.0, STRATUM_MIN_ROWS / counts[codes + 1]))
+    probabilities = np.maximum(minimum, _uniform_probability(minimum, n_rows))
+    sampled = np.random.RandomState(random_state).random_sample(len(ldf)) < probabilities
+    positions = np.flatnonzero(sampled)
+    return positions, 1.0 / probabilities[positions]
+
+
+def _uniform_probability(minimum: np.ndarray, n_rows: int) -> float:
+    # probability p such that sampling each row with probability max(p, minimum) gives n_rows rows on average
+    if minimum.sum() >= n_rows:
+        return 0.0
+    low, high = 0.0, 1.0
+    for _ in range(50):
+        middle = (low + high) / 2
+        if np.maximum(minimum, middle).sum() < n_rows:
+            low = middle
+        else:
+            high = middle
+    return high
@@ -179,6 +179,49 @@ def get_filtered_size(filter_specs, ldf):
     return len(result)
 
 
+def get_unfiltered_data(vis: Vis, ldf: LuxDataFrame):
+    """
+    Data of the vis with its filters removed.
+    The result is cached on the dataframe, keyed by the mark and the attribute/aggregation signature of the vis,
+    so that the "Overall" vis is only computed once for all the filtered vis that share it.
+
+    Parameters
+    ----------
+    vis : Vis
+    ldf : LuxDataFrame
+
+    Returns
+    -------
+    pandas.DataFrame
+            Data of the unfiltered vis
+    """
+    import copy
+
+    attr_specs = utils.get_attrs_specs(vis._inferred_intent)
+    key = (vis.mark,) + tuple(
+        (clause.attribute, clause.channel, clause._aggregation_name, clause.bin_size)
+        for clause in attr_specs
+    )
+    if ldf._baseline_data is None:
+        ldf._baseline_data = {}
+    try:
+        if key in ldf._baseline_data:
+            return ldf._baseline_data[key]
+    except TypeError:
+        # unhashable signature, compute the unfiltered vis without caching
+        key = None
+    unfiltered_vis = copy.copy(vis)
+    # Remove filters, keep only attribute intent
+    unfiltered_vis._inferred_intent = attr_specs
+    # Keep every group so that the overall data lines up with the (zero-padded) filtered data
+    unfiltered_vis._omitted_groups = None
+    lux.config.executor.execute([unfiltered_vis], ldf)
+    # The budget may have expired before the vis was processed, retry on the next call
+    if key is not None and unfiltered_vis.data is not None:
+        ldf._baseline_data[key] = unfiltered_vis.data
+    return unfiltered_vis.data
+
+
 def skewness(v):
     from scipy.stats import skew
 
@@ -225,7 +268,10 @@ def deviation_from_overall(
     int
             Score describing how different the vis is from the overall vis
     """
-    v_filter_size = get_filtered_size(filter_specs, ldf)
+    if vis._filter_size is not None:
+        v_filter_size = vis._filter_size
+    else:
+        v_filter_size = get_filtered_size(filter_specs, ldf)
 
     if exclude_nan:
         vdata = vis.data.dropna()
@@ -237,17 +283,12 @@ def deviation_from_overall(
     v_filter = v_filter / total  # normalize by total to get ratio
     if total == 0:
         return 0
-    # Generate an "Overall" Vis (TODO: This is computed multiple times for every vis, alternative is to directly access df.current_vis but we do not have guaruntee that will always be unfiltered vis (in the non-Filter action scenario))
-    import copy
-
-    unfiltered_vis = copy.copy(vis)
-    # Remove filters, keep only attribute intent
-    unfiltered_vis._inferred_intent = utils.get_attrs_specs(vis._inferred_intent)
-    lux.config.executor.execute([unfiltered_vis], ldf)
+    # Generate an "Overall" Vis (shared by all the filtered vis with the same attributes)
+    unfiltered_data = get_unfiltered_data(vis, ldf)
     if exclude_nan:
-        uv = unfiltered_vis.data.dropna()
+        uv = unfiltered_data.dropna()
     else:
-        uv = unfiltered_vis.data
+        uv = unfiltered_data
     v = uv[msr_attribute]
     v = v / v.sum()
     assert len(v) == len(v_filter), "Data for filtered and unfiltered vis have unequal length."
@@ -296,7 +337,10 @@ def unevenness(vis: Vis, ldf: LuxDataFrame, measure_lst: list, dimension_lst: li
             Score describing how uneven the bar chart is.
     """
     v = vis.data[measure_lst[0].attribute]
-    v = v / v.sum()  # normalize by total to get ratio
+    # The executor may only keep the top groups of a bar chart, with the sums of the omitted groups on the side
+    omitted_total = vis._omitted_total if vis._omitted_groups else None
+    total = v.sum() if omitted_total is None else v.sum() + omitted_total
+    v = v / total  # normalize by total to get ratio
     v = v.fillna(0)  # Some bar values may be NaN
     attr = dimension_lst[0].attribute
     if isinstance(attr, pd._libs.tslibs.timestamps.Timestamp):
@@ -308,9 +352,17 @@ def unevenness(vis: Vis, ldf: LuxDataFrame, measure_lst: list, dimension_lst: li
     if is_datetime(v):
         v = v.astype("int")
     try:
-        return D * euclidean(v, v_flat)
+        distance = euclidean(v, v_flat)
     except (ValueError):
         return 0.01
+    if omitted_total is not None:
+        # add the squared distance of the omitted groups, expanded over their sum and sum of squares
+        n_omitted = vis._omitted_groups
+        omitted_distance = (
+            vis._omitted_squares / total**2 - 2 * omitted_total / (total * C) + n_omitted / C**2
+        )
+        distance = np.sqrt(max(distance**2 + omitted_distance, 0))
+    return D * distance
 
 
 def mutual_information(v_x: list, v_y: list) -> int:
@@ -321,6 +373,47 @@ def mutual_information(v_x: list, v_y: list) -> int:
     return mutual_info_score(v_x, v_y)
 
 
+def pairwise_monotonicity(data: pd.DataFrame, attributes: list) -> np.ndarray:
+    """
+    Vectorized counterpart of monotonicity, scoring every pair of attributes with a single correlation matrix.
+    As in monotonicity, each pair is scored with the absolute Pearson's correlation over the rows where both
+    attributes are present, and pairs that are undefined (identity, uniform or fewer than two values) are scored as -1.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+            Data containing the attributes
+    attributes : list
+            List of quantitative attribute names
+
+    Returns
+    -------
+    numpy.ndarray
+            Matrix of scores, where entry [i, j] is the score of the pair (attributes[i], attributes[j])
+    """
+    values = data[attributes].to_numpy(dtype=float, na_value=np.nan)
+    valid = ~np.isnan(values)
+    weights = valid.astype(float)
+    # center the columns so that the sums of squares below remain numerically stable
+    values = np.where(valid, values, 0)
+    values = np.where(valid, values - values.sum(axis=0) / np.maximum(weights.sum(axis=0), 1), 0)
+    # pairwise-complete sums: entry [i, j] only counts the rows where both attribute i and attribute j are present
+    n = weights.T @ weights
+    sum_x = values.T @ weights
+    sum_xx = (values**2).T @ weights
+    sum_xy = values.T @ values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sum_xy - sum_x * sum_x.T / n
+        var = sum_xx - sum_x**2 / n
+        corr = cov / np.sqrt(var * var.T)
+    # uniform attributes have (up to rounding errors) zero variance over the common rows
+    uniform = var <= 1e-12 * sum_xx
+    score = np.abs(np.clip(corr, -1, 1))
+    score[(n < 2) | uniform | uniform.T | ~np.isfinite(corr)] = -1
+    np.fill_diagonal(score, -1)
+    return score
+
+
 def monotonicity(vis: Vis, attr_specs: list, ignore_identity: bool = True) -> int:
     """
     Monotonicity measures there is a monotonic trend in the scatterplot, whether linear or not.
@@ -73,8 +73,8 @@ class Validator:
                             if not clause.attribute in list(ldf.columns):
                                 search_val = clause.attribute
                                 match_attr = False
-                                for attr, val_list in ldf.unique_values.items():
-                                    if search_val in val_list:
+                                for attr in ldf.unique_values:
+                                    if ldf.unique_values.contains(attr, search_val):
                                         match_attr = attr
                                 if match_attr:
                                     warn_msg = f"\n- The input '{search_val}' looks like a value that belongs to the '{match_attr}' attribute. \n  Please specify the value fully, as something like {match_attr}={search_val}."
@@ -71,39 +71,6 @@ def get_agg_title(clause):
         return f"{clause._aggregation_name.capitalize()} of {attr}"
 
 
-def check_if_id_like(df, attribute):
-    import re
-
-    # Strong signals
-    # so that aggregated reset_index fields don't get misclassified
-    high_cardinality = df.cardinality[attribute] > 500
-    attribute_contain_id = re.search(r"id|ID|iD|Id", str(attribute)) is not None
-    almost_all_vals_unique = df.cardinality[attribute] >= 0.98 * len(df)
-    is_string = pd.api.types.is_string_dtype(df[attribute])
-    if is_string:
-        # For string IDs, usually serial numbers or codes with alphanumerics have a consistent length (eg., CG-39405) with little deviation. For a high cardinality string field but not ID field (like Name or Brand), there is less uniformity across the string lengths.
-        if len(df) > 50:
-            sampled = df[attribute].sample(50, random_state=99)
-        else:
-            sampled = df[attribute]
-        str_length_uniformity = sampled.apply(lambda x: type(x) == str and len(x)).std() < 3
-        return (
-            high_cardinality
-            and (attribute_contain_id or almost_all_vals_unique)
-            and str_length_uniformity
-        )
-    else:
-        if len(df) >= 2:
-            series = df[attribute]
-            diff = series.diff()
-            evenly_spaced = all(diff.iloc[1:] == diff.iloc[1])
-        else:
-            evenly_spaced = True
-        if attribute_contain_id:
-            almost_all_vals_unique = df.cardinality[attribute] >= 0.75 * len(df)
-        return high_cardinality and (almost_all_vals_unique or evenly_spaced)
-
-
 def like_nan(val):
     if isinstance(val, str):
         return val.lower() == "nan"
@@ -18,6 +18,10 @@ from lux.utils.utils import check_import_lux_widget
 import lux
 import warnings
 
+# number of bars rendered by a bar chart, which are the groups the executor keeps for bar charts with more
+# than `lux.config.max_bar_groups` groups
+MAX_BARS = 10
+
 
 class Vis:
     """
@@ -33,6 +37,13 @@ class Vis:
         self._mark = ""
         self._min_max = {}
         self._postbin = None
+        self._filter_size = None  # estimated number of rows satisfying the filters (set by the executor)
+        # number of groups left out of a bar chart's data by the executor, or None when the executor must
+        # keep every group (e.g., for the unfiltered baseline of a filtered bar chart)
+        self._omitted_groups = 0
+        # sum and sum of squares of the aggregated measure of the omitted groups
+        self._omitted_total = None
+        self._omitted_squares = None
         self.title = title
         self.score = score
         self.refresh_source(self._source)
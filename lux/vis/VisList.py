@@ -275,7 +275,7 @@ class VisList:
         self._widget = luxwidget.LuxWidget(currentVis={}, recommendations=recJSON, intent="", message="")
         display(self._widget)
 
-    def refresh_source(self, ldf):
+    def refresh_source(self, ldf, execute: bool = True):
         """
         Loading the source into the visualizations in the VisList, then populating each visualization
         based on the new source data, effectively "materializing" the visualization collection.
@@ -283,6 +283,9 @@ class VisList:
         ----------
         ldf : LuxDataframe
                 Input Dataframe to be attached to the VisList
+        execute : bool, optional
+                Whether the visualizations are executed, or only compiled (e.g., to be executed as they are
+                ranked, see `lux.action.ranking`), by default True
         Returns
         -------
         VisList
@@ -315,4 +318,5 @@ class VisList:
                     self._inferred_intent = Parser.parse(self._intent)
                     Validator.validate_intent(self._inferred_intent, ldf)
                     self._collection = Compiler.compile_intent(ldf, self._inferred_intent)
-                lux.config.executor.execute(self._collection, ldf)
+                if execute:
+                    lux.config.executor.execute(self._collection, ldf)
@@ -13,6 +13,7 @@
 #  limitations under the License.
 
 from lux.vislib.altair.AltairChart import AltairChart
+from lux.vis.Vis import MAX_BARS
 import altair as alt
 
 alt.data_transformers.disable_max_rows()
@@ -91,12 +92,14 @@ class BarChart(AltairChart):
             if x_attr.sort == "ascending":
                 x_attr_field.sort = "-y"
                 x_attr_field_code = f"alt.X('{x_attr.attribute}', type= '{x_attr.data_type}', axis=alt.Axis(labelOverlap=True, title='{x_attr_abv}'),sort='-y')"
-        k = 10
+        k = MAX_BARS
         self._topkcode = ""
         n_bars = len(self.data.iloc[:, 0].unique())
-
-        if n_bars > k:  # Truncating to only top k
-            remaining_bars = n_bars - k
+        remaining_bars = n_bars - k
+        if self.vis._omitted_groups:
+            # the executor already kept only the top bars
+            remaining_bars = max(n_bars - k, 0) + self.vis._omitted_groups
+        if remaining_bars > 0:  # Truncating to only top k
             self.data = self.data.nlargest(k, columns=measure_attr)
             self.data = AltairChart.sanitize_dataframe(self.data)
             self.text = alt.Chart(self.data).mark_text(
@@ -13,6 +13,7 @@
 #  limitations under the License.
 
 from lux.vislib.matplotlib.MatplotlibChart import MatplotlibChart
+from lux.vis.Vis import MAX_BARS
 from lux.utils.utils import get_agg_title
 import pandas as pd
 import numpy as np
@@ -61,11 +62,14 @@ class BarChart(MatplotlibChart):
             measure_attr = y_attr.attribute
             bar_attr = x_attr.attribute
 
-        k = 10
+        k = MAX_BARS
         self._topkcode = ""
         n_bars = len(self.data.iloc[:, 0].unique())
-        if n_bars > k:  # Truncating to only top k
-            remaining_bars = n_bars - k
+        remaining_bars = n_bars - k
+        if self.vis._omitted_groups:
+            # the executor already kept only the top bars
+            remaining_bars = max(n_bars - k, 0) + self.vis._omitted_groups
+        if remaining_bars > 0:  # Truncating to only top k
             self.data = self.data.nlargest(k, measure_attr)
             self.ax.text(
                 0.95,
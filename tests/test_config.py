@@ -17,6 +17,7 @@ import pytest
 import pandas as pd
 import time
 from lux.vis.VisList import VisList
+from lux.vis.Vis import Vis
 import lux
 
 
@@ -145,6 +146,25 @@ def test_remove_invalid_action(global_var):
         lux.config.remove_action("bars")
 
 
+def test_max_bar_groups(global_var, monkeypatch):
+    df = pd.read_csv("lux/data/car.csv")
+    n_names = df["Name"].nunique()
+    monkeypatch.setattr(lux.config, "max_bar_groups", 50)
+    vis = Vis(["Name"], df)
+    assert len(vis.data) == 10
+    assert vis._omitted_groups == n_names - 10
+    assert vis.data["Record"].sum() + vis._omitted_total == len(df)
+    assert f"+ {n_names - 10} more ..." in vis.to_Altair()
+    vis = Vis(["Name", "Origin=USA"], df)
+    assert len(vis.data) == n_names, "Filtered bar charts keep all of their groups"
+    monkeypatch.setattr(lux.config, "max_bar_groups", False)
+    vis = Vis(["Name"], df)
+    assert len(vis.data) == n_names
+    with pytest.warns(UserWarning, match="must be a positive integer or False"):
+        lux.config.max_bar_groups = -5
+    assert lux.config.max_bar_groups == False
+
+
 # TODO: This test does not pass in pytest but is working in Jupyter notebook.
 def test_remove_default_actions(global_var):
     df = pytest.car_df
@@ -164,6 +164,25 @@ def test_binning(global_var):
     assert len(vis.data) == nbins
 
 
+def test_2D_binning(global_var):
+    df = pytest.car_df
+    vis = Vis(["Horsepower", "Weight", "Origin"], df)
+    PandasExecutor.execute_2D_binning(vis)
+    nbins = lux.config.heatmap_bin_size
+    assert list(vis.data.columns) == ["count", "Origin", "xBinStart", "xBinEnd", "yBinStart", "yBinEnd"]
+    assert vis.data["count"].sum() == len(df)
+    assert len(vis.data) <= nbins * nbins and (vis.data["count"] > 0).all()
+    # bins span the precomputed range of the attributes
+    assert vis.data["xBinStart"].min() == df["Horsepower"].min()
+    assert vis.data["xBinEnd"].max() == df["Horsepower"].max()
+    assert set(vis.data["Origin"]) <= set(df["Origin"])
+
+    vis = Vis(["Horsepower", "Weight", "Acceleration"], df)
+    PandasExecutor.execute_2D_binning(vis)
+    assert vis.data["count"].sum() == len(df)
+    assert vis.data["Acceleration"].between(df["Acceleration"].min(), df["Acceleration"].max()).all()
+
+
 def test_record(global_var):
     df = pytest.car_df
     vis = Vis([lux.Clause(attribute="Cylinders")], df)
@@ -187,6 +206,29 @@ def test_filter_aggregation_fillzero_aligned(global_var):
     assert result[result["Cylinders"] == 6]["MilesPerGal"].values[0] == externalValidation[6]
 
 
+def test_aggregation_fillzero_order(global_var):
+    df = pytest.car_df.copy()
+    df.loc[::7, "Brand"] = None
+    vis = Vis(["Horsepower", "Brand", "Origin=Japan"], df)
+    result = vis.data
+    # one row per Brand in sorted order, with the missing group last
+    assert len(result) == len(df.unique_values["Brand"])
+    assert list(result["Brand"].iloc[:-1]) == sorted(df["Brand"].dropna().unique())
+    assert pd.isna(result["Brand"].iloc[-1])
+    assert result[result["Brand"] == "ford"]["Horsepower"].values[0] == 0
+    # the order of the values is kept in the metadata, rather than sorted for every vis
+    order, sortable = df.unique_values.order("Brand")
+    assert sortable and order[:-1] == list(result["Brand"].iloc[:-1])
+    assert df.unique_values.order("Brand")[0] is order
+
+    vis = Vis(["Cylinders", "MilesPerGal", "Origin"], pytest.car_df)
+    result = vis.data
+    assert len(result) == 5 * 3
+    assert list(result["Cylinders"]) == sorted(result["Cylinders"])
+    assert list(result["Origin"].iloc[:3]) == ["Europe", "Japan", "USA"]
+    assert result[(result["Cylinders"] == 3) & (result["Origin"] == "USA")]["MilesPerGal"].values[0] == 0
+
+
 def test_exclude_attribute(global_var):
     df = pytest.car_df
     intent = [lux.Clause("?", exclude=["Name", "Year"]), lux.Clause("Horsepower")]
@@ -196,3 +238,143 @@ def test_exclude_attribute(global_var):
         assert vis.get_attr_by_channel("x")[0].attribute != "Name"
         assert vis.get_attr_by_channel("y")[0].attribute != "Year"
         assert vis.get_attr_by_channel("y")[0].attribute != "Year"
+
+
+def test_shared_aggregate_batch(global_var):
+    df = pytest.car_df
+    intent = [
+        lux.Clause(attribute=["Horsepower", "Weight", "Acceleration"]),
+        lux.Clause(attribute="Cylinders"),
+        lux.Clause("Origin=Japan"),
+    ]
+    vislist = VisList(intent, df)
+    assert len(vislist) == 3
+    batched_data = [vis.data for vis in vislist]
+    for vis, batched in zip(vislist, batched_data):
+        # executing the vis on its own should give the same result as the batched group-by
+        PandasExecutor.execute([vis], df)
+        assert list(batched.columns) == list(vis.data.columns)
+        assert batched.to_pandas().equals(vis.data.to_pandas())
+    result = vislist[0].data
+    assert result[result["Cylinders"] == 8]["Horsepower"].values[0] == 0
+
+
+def test_filter_family_single_groupby(global_var):
+    df = pytest.car_df
+    intent = [
+        lux.Clause(attribute="Horsepower"),
+        lux.Clause(attribute="Cylinders"),
+        lux.Clause(attribute="Origin", value="?"),
+    ]
+    vislist = VisList(intent, df)
+    assert len(vislist) == len(df.unique_values["Origin"])
+    family_data = [vis.data for vis in vislist]
+    for vis, family_result in zip(vislist, family_data):
+        # the partition of the shared group-by must match the result of filtering the data for the vis
+        PandasExecutor.execute([vis], df)
+        result = vis.data[list(family_result.columns)]
+        assert family_result.to_pandas().equals(result.to_pandas())
+        assert len(family_result) == len(df.unique_values["Cylinders"])
+
+
+def test_dictionary_encoding(global_var):
+    df = pd.read_csv("lux/data/car.csv")
+    df.loc[::10, "Origin"] = None
+    df.maintain_metadata()
+    codes, categories, is_sorted = PandasExecutor.get_encoding(df, "Origin")
+    assert is_sorted and list(categories) == sorted(df["Origin"].dropna().unique())
+    assert (codes == -1).sum() == df["Origin"].isna().sum()
+    assert df.unique_values["Origin"] == list(df["Origin"].unique())
+    assert PandasExecutor.get_encoding(df, "Horsepower") is None
+
+    filtered = PandasExecutor.apply_filter(df, "Origin", "=", "Japan")
+    assert filtered.equals(df[df["Origin"] == "Japan"])
+    assert PandasExecutor.apply_filter(df, "Origin", "!=", "Japan").equals(df[df["Origin"] != "Japan"])
+    assert len(PandasExecutor.apply_filter(df, "Origin", "=", "Mars")) == 0
+    # the filtered dataframe derives its encoding from the one of the original dataframe
+    filtered_codes, filtered_categories, _ = PandasExecutor.get_encoding(filtered, "Origin")
+    assert filtered_categories is categories and (filtered_codes == categories.get_loc("Japan")).all()
+
+    vis = Vis(["Horsepower", "Origin"], df)
+    expected = df.groupby("Origin", dropna=False, history=False)["Horsepower"].mean().reset_index()
+    assert vis.data.equals(expected)
+
+    # encodings are invalidated when the column is modified
+    df.loc[0, "Origin"] = "Mars"
+    assert len(PandasExecutor.apply_filter(df, "Origin", "=", "Mars")) == 1
+    df.iloc[1, df.columns.get_loc("Origin")] = "Mars"
+    assert len(PandasExecutor.apply_filter(df, "Origin", "=", "Mars")) == 2
+    df.maintain_metadata()
+    assert "Mars" in df.unique_values["Origin"]
+    df["Origin"] = "Japan"
+    assert len(PandasExecutor.apply_filter(df, "Origin", "=", "Japan")) == len(df)
+
+
+def test_unique_value_catalog(global_var, monkeypatch):
+    monkeypatch.setattr(lux.config, "max_unique_values", 5)
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    brand_counts = df["Brand"].value_counts()
+    # high-cardinality attributes only keep their most frequent values, with the exact number of distinct values
+    assert not df.unique_values.is_complete("Brand")
+    assert df.unique_values.distinct_count("Brand") == df.cardinality["Brand"] == df["Brand"].nunique()
+    assert sorted(df.unique_values.counts("Brand"), reverse=True) == list(brand_counts.iloc[:5])
+    assert df.unique_values.contains("Brand", brand_counts.index[0])
+    assert df.unique_values.is_complete("Origin") and len(df.unique_values["Origin"]) == 3
+
+    # filtered bar charts still have a group for every value of the attribute
+    vis = Vis(["Horsepower", "Brand", "Origin=Japan"], df)
+    assert len(vis.data) == df["Brand"].nunique()
+    # the values left out of the catalog are only looked up once
+    values = df.unique_values.all_values("Brand", lambda: df["Brand"].unique())
+    assert sorted(values) == sorted(df["Brand"].unique())
+    assert df.unique_values.all_values("Brand", lambda: []) is values
+
+
+def test_stratified_sampling(global_var, monkeypatch):
+    import numpy as np
+
+    n = 50000
+    categories = np.array(["common"] * (n - 12) + ["rare"] * 10 + ["very rare"] * 2, dtype=object)
+    np.random.RandomState(0).shuffle(categories)
+    data = pd.DataFrame({"category": categories, "value": np.arange(n) % 100})
+    monkeypatch.setattr(lux.config, "sampling_strategy", "stratified")
+    df = pd.DataFrame(data)
+    df.maintain_metadata()
+    df.maintain_recs()
+    assert len(df._sampled) < 32000, "The sample is capped at lux.config.sampling_cap rows on average"
+    assert set(df._sampled["category"]) == {"common", "rare", "very rare"}, "Rare categories are kept"
+    occurrence = df.recommendation["Occurrence"][0].data.set_index("category")["Record"]
+    assert occurrence["rare"] == 10 and occurrence["very rare"] == 2
+    assert abs(occurrence["common"] - (n - 12)) < 0.05 * n, "Counts are estimated from the weighted rows"
+    monkeypatch.setattr(lux.config, "sampling_strategy", "uniform")
+    df = pd.DataFrame(data)
+    df.maintain_metadata()
+    df.maintain_recs()
+    assert df._sampled._sample_weights is None
+
+
+def test_sample_lifecycle(global_var):
+    import numpy as np
+
+    n = 40000
+    data = pd.DataFrame(
+        {"category": np.array(["a", "b", "c", "d"])[np.arange(n) % 4], "value": np.arange(n)}
+    )
+    df = pd.DataFrame(data)
+    df.maintain_metadata()
+    df.maintain_recs()
+    assert df._sampled.equals(df.sample(n=30000, random_state=1))
+    positions = df._sample_rows[2]
+    df.intent = ["category"]
+    df.maintain_recs()
+    assert df._sample_rows[2] is positions, "The sample is reused across intents"
+    df["value"] = df["value"] * 2
+    df.maintain_recs()
+    assert df._sample_rows[2] is positions, "The sample is reused when the values of a column change"
+    assert df._sampled["value"].equals(df["value"].take(positions))
+    df = df.iloc[:35000]
+    df.maintain_recs()
+    assert (
+        df._sample_rows[1] == 35000 and len(df._sampled) == 30000
+    ), "The sample is drawn for the new rows"
@@ -301,3 +301,84 @@ def test_interestingness_deviation_nan():
     assert np.isclose(smaller_diff_score, 0.29, rtol=0.1)
     assert np.isclose(bigger_diff_score, 0.94, rtol=0.1)
     assert smaller_diff_score < bigger_diff_score
+
+
+def test_interestingness_deviation_baseline_cache(global_var):
+    from lux.vis.Vis import Vis
+    from lux.interestingness.interestingness import get_filtered_size
+    from lux.utils import utils
+
+    df = pd.read_csv("lux/data/car.csv")
+    vis = Vis(["Horsepower", "Cylinders", "Origin=Japan"], df)
+    vis2 = Vis(["Horsepower", "Cylinders", "Origin=Europe"], df)
+    for v in [vis, vis2]:
+        assert v._filter_size == get_filtered_size(utils.get_filter_specs(v._inferred_intent), df)
+
+    score = interestingness(vis, df)
+    assert len(df._baseline_data) == 1
+    interestingness(vis2, df)
+    # both filtered vis share the same unfiltered baseline
+    assert len(df._baseline_data) == 1
+
+    df._baseline_data = None
+    vis._filter_size = None
+    assert interestingness(vis, df) == score
+
+
+def test_baseline_cache_expired_budget(global_var):
+    from lux.vis.Vis import Vis
+    from lux.action import scheduler
+    from lux.interestingness.interestingness import get_unfiltered_data
+
+    df = pd.read_csv("lux/data/car.csv")
+    vis = Vis(["Horsepower", "Cylinders", "Origin=Japan"], df)
+    with scheduler.running(0):
+        assert get_unfiltered_data(vis, df) is None
+    # the baseline left without data by the expired budget is not cached
+    assert df._baseline_data == {}
+    assert get_unfiltered_data(vis, df) is not None
+    assert len(df._baseline_data) == 1
+
+
+def test_pairwise_monotonicity(global_var):
+    from lux.vis.Vis import Vis
+    from lux.interestingness.interestingness import monotonicity, pairwise_monotonicity
+
+    df = pd.read_csv("lux/data/college.csv")
+    df.loc[::3, "SATAverage"] = np.nan
+    df["Constant"] = 1.0
+    measures = ["SATAverage", "ACTMedian", "AverageCost", "Constant"]
+    scores = pairwise_monotonicity(df, measures)
+    # uniform attributes can not be correlated
+    assert (scores[3] == -1).all() and (scores[:, 3] == -1).all()
+    for i, x in enumerate(measures[:3]):
+        for j, y in enumerate(measures[:3]):
+            if i == j:
+                assert scores[i, j] == -1
+                continue
+            vis = Vis([x, y], df)
+            assert np.isclose(scores[i, j], monotonicity(vis, vis._inferred_intent))
+
+    df.intent = []
+    df._repr_html_()
+    correlation = df.recommendation["Correlation"]
+    assert len(correlation) == lux.config.topk
+    scores = [vis.score for vis in correlation]
+    assert scores == sorted(scores, reverse=True)
+    assert all(vis.data is not None for vis in correlation)
+
+
+def test_unevenness_top_groups(global_var, monkeypatch):
+    from lux.vis.Vis import Vis
+
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    for aggregation in ["mean", "count"]:
+        monkeypatch.setattr(lux.config, "max_bar_groups", 50)
+        vis = Vis(["Name", lux.Clause("Horsepower", aggregation=aggregation)], df)
+        assert vis._omitted_groups > 0
+        truncated = interestingness(vis, df)
+        monkeypatch.setattr(lux.config, "max_bar_groups", False)
+        vis = Vis(["Name", lux.Clause("Horsepower", aggregation=aggregation)], df)
+        assert vis._omitted_groups == 0
+        assert truncated == pytest.approx(interestingness(vis, df), rel=1e-9)
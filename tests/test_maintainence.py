@@ -81,3 +81,210 @@ def test_recs_inplace_operation(global_var):
     df._repr_html_()
     assert len(df.recommendation["Occurrence"]) == 5
     assert df._recs_fresh == True, "Failed to maintain recommendation after display df"
+
+
+def test_column_read_write(global_var):
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    df.Horsepower
+    df["Horsepower"]
+    assert df._metadata_fresh == True, "Reading a column should not expire metadata"
+    assert df._recs_fresh == True, "Reading a column should not expire recommendations"
+
+    n_cached = len(df._vis_cache)
+    df["Weight"] = df["Weight"] * 2
+    assert df._metadata_fresh == False
+    assert df._recs_fresh == False
+    # only the processed data of the vis involving the modified column is dropped
+    assert 0 < len(df._vis_cache) < n_cached
+    for key in df._vis_cache:
+        assert "Weight" not in [part[0] for part in key if isinstance(part, tuple)]
+    df._repr_html_()
+    weight_vis = [
+        vis for vis in df.recommendation["Distribution"] if vis.get_attr_by_attr_name("Weight")
+    ]
+    assert weight_vis[0].data["Weight"].max() > df["Weight"].max() / 2
+
+
+def test_incremental_metadata(global_var):
+    df = pd.read_csv("lux/data/car.csv")
+    df.set_data_type({"Cylinders": "quantitative"})
+    profiles = dict(df._column_profile)
+    df["Ratio"] = df["Horsepower"] / df["Weight"]
+    df["Weight"] = df["Weight"] * 2
+    assert df._metadata_fresh == False
+    df.maintain_metadata()
+    # only the added and modified columns are profiled again
+    for attr in profiles:
+        assert (df._column_profile[attr] is profiles[attr]) == (attr != "Weight")
+    assert df.data_type["Ratio"] == "quantitative"
+    assert df.data_type["Cylinders"] == "quantitative", "Type overrides should be kept"
+    assert df._min_max["Weight"] == (df["Weight"].min(), df["Weight"].max())
+
+    del df["Ratio"]
+    assert "Ratio" not in df.data_type
+    assert "Ratio" not in df.cardinality and "Ratio" not in df.unique_values
+
+    expected = pd.read_csv("lux/data/car.csv")
+    expected["Weight"] = expected["Weight"] * 2
+    expected.set_data_type({"Cylinders": "quantitative"})
+    assert df.data_type == expected.data_type
+    assert df.cardinality == expected.cardinality
+    assert df._min_max == expected._min_max
+
+
+def test_derived_metadata(global_var):
+    df = pd.read_csv("lux/data/car.csv")
+    df.set_data_type({"Cylinders": "quantitative"})
+    df.maintain_metadata()
+
+    projection = df[["Name", "Origin"]]
+    projection.maintain_metadata()
+    assert list(projection.data_type) == ["Name", "Origin"]
+    assert projection._column_profile["Name"] is df._column_profile["Name"]
+    assert projection.cardinality["Origin"] == df.cardinality["Origin"]
+
+    subset = df[df["Horsepower"] > 100]
+    subset.maintain_metadata()
+    assert subset.data_type["Cylinders"] == "quantitative", "Data types should be inherited"
+    expected = pd.read_csv("lux/data/car.csv")
+    expected = expected[expected["Horsepower"] > 100]
+    expected.maintain_metadata()
+    assert subset.cardinality == expected.cardinality
+    assert subset._min_max == expected._min_max
+    assert subset.unique_values["Origin"] == expected.unique_values["Origin"]
+
+    # the derived dataframes do not keep the original dataframe alive
+    import gc
+    import weakref
+
+    original = weakref.ref(df)
+    del df
+    gc.collect()
+    assert original() is None
+    assert projection.cardinality["Origin"] == 3 and len(subset.unique_values["Origin"]) == 3
+
+
+def test_metadata_cache(global_var, monkeypatch):
+    from lux.core.cache import fingerprint, metadata_cache
+
+    monkeypatch.setattr(lux.config, "cache_size", 64)
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    assert len(metadata_cache) == 1
+
+    same = pd.read_csv("lux/data/car.csv")
+    same.maintain_metadata()
+    assert same._column_profile is df._column_profile
+    same.maintain_recs()
+    assert list(same.recommendation) == list(df.recommendation)
+    assert same._rec_info[0]["collection"]._source is same
+    assert same.recommendation["Correlation"][0].data is df.recommendation["Correlation"][0].data
+
+    modified = df.copy()
+    modified["Weight"] = modified["Weight"] * 2
+    modified.maintain_metadata()
+    assert modified._column_profile["Weight"] is not df._column_profile["Weight"]
+    assert len(metadata_cache) == 2
+
+    # every row is fingerprinted, so that copies with a few edited rows do not share the metadata
+    large = pd.DataFrame({"value": list(range(10000)), "category": ["a", "b"] * 5000})
+    large.maintain_metadata()
+    edited = large.copy()
+    edited.loc[1234, ["value", "category"]] = [10 ** 9, "zzz"]
+    edited.maintain_metadata()
+    assert edited._min_max["value"] == (0, 10 ** 9)
+    assert "zzz" in edited.unique_values["category"]
+
+    # frames with the same values but other column or index names do not share the metadata
+    int_columns = pd.DataFrame({1: [1.5, 2.5, 3.5] * 10, 2: ["a", "b", "c"] * 10})
+    int_columns.maintain_metadata()
+    str_columns = pd.DataFrame({"1": [1.5, 2.5, 3.5] * 10, "2": ["a", "b", "c"] * 10})
+    str_columns.maintain_metadata()
+    assert list(str_columns.data_type) == ["1", "2"]
+    named_index = pd.DataFrame({1: [1.5, 2.5, 3.5] * 10, 2: ["a", "b", "c"] * 10})
+    named_index.index.name = "id"
+    assert fingerprint(named_index) != fingerprint(int_columns)
+
+    lux.config.cache_size = 0
+    assert len(metadata_cache) == 0
+
+
+def test_disk_cache(global_var, tmp_path, monkeypatch):
+    from lux.core import cache
+
+    monkeypatch.setattr(lux.config, "cache_dir", str(tmp_path))
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+    # a new session only finds the entry on disk
+    cache.metadata_cache.clear()
+    same = pd.read_csv("lux/data/car.csv")
+    same._repr_html_()
+    assert list(same.recommendation) == list(df.recommendation)
+    assert same._rec_specs is not None and same._rec_specs[0] is same._rec_info
+    assert same.cardinality == df.cardinality
+
+    # the dataframes read from a file are found without hashing their values, until they are modified
+    assert same._source_key is not None and same._cache_key[0] == same._source_key
+    cache.metadata_cache.clear()
+    monkeypatch.setattr(lux.core.frame, "fingerprint", lambda df: None)
+    same = pd.read_csv("lux/data/car.csv")
+    same.maintain_metadata()
+    assert same.cardinality == df.cardinality
+    same["Weight"] = same["Weight"] * 2
+    assert same._source_key is None and same._get_cache_key() is None
+    monkeypatch.undo()
+    monkeypatch.setattr(lux.config, "cache_dir", str(tmp_path))
+
+    # a file edited in place is profiled again, even when the edited rows are few
+    path = tmp_path / "large.csv"
+    pd.DataFrame({"value": list(range(10000))}).to_csv(path, index=False)
+    pd.read_csv(path).maintain_metadata()
+    edited = pd.read_csv(path)
+    edited.loc[1234, "value"] = 10 ** 9
+    edited.to_csv(path, index=False)
+    cache.metadata_cache.clear()
+    edited = pd.read_csv(path)
+    edited.maintain_metadata()
+    assert edited._min_max["value"] == (0, 10 ** 9)
+
+    # the entries written by another version are not read
+    cache.metadata_cache.clear()
+    monkeypatch.setattr(cache, "DISK_CACHE_FORMAT", cache.DISK_CACHE_FORMAT + 1)
+    other = pd.read_csv("lux/data/car.csv")
+    assert cache.metadata_cache.get(other._get_cache_key()) is None
+    cache.metadata_cache.clear()
+
+
+def test_metadata_modified_in_background(global_var, monkeypatch):
+    import threading
+    import time
+    from lux.action.scheduler import BackgroundJob
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    profiling = threading.Event()
+    compute_dataset_metadata = PandasExecutor.compute_dataset_metadata
+
+    def slow_compute_dataset_metadata(self, ldf, attributes=None):
+        profiling.set()
+        time.sleep(0.3)
+        compute_dataset_metadata(self, ldf, attributes)
+
+    monkeypatch.setattr(PandasExecutor, "compute_dataset_metadata", slow_compute_dataset_metadata)
+    df = pd.read_csv("lux/data/car.csv")
+    df["Weight"] = df["Weight"] + 0.5
+    df._recs_job = job = BackgroundJob(None)
+    job.submit(lambda: df._compute_recs(job))
+    profiling.wait()
+    # the write waits for the worker to release the dataframe, instead of being overwritten by it
+    df["Acceleration"] = df["Acceleration"] * 2
+    job.wait()
+    assert job.cancelled
+    assert not df._metadata_fresh and df._stale_columns == {"Acceleration"}
+    df.maintain_metadata()
+    assert df._min_max["Acceleration"] == (
+        df["Acceleration"].min(),
+        df["Acceleration"].max(),
+    )
@@ -16,6 +16,7 @@ from .context import lux
 import pytest
 import pandas as pd
 import time
+from lux.vis.VisList import VisList
 
 
 # To run the script and see the printed result, run:
@@ -55,3 +56,252 @@ def test_q1_performance_census(global_var):
         "native-country": "nominal",
         "income": "nominal",
     }
+
+
+def test_time_budget(global_var, monkeypatch):
+    from lux.action import scheduler
+
+    df = pd.read_csv("lux/data/car.csv")
+    monkeypatch.setattr(lux.config, "time_budget", 1e-9)
+    df._repr_html_()
+    assert "time budget" in df._message.to_html()
+    assert df.recommendation == {}
+
+    monkeypatch.setattr(lux.config, "time_budget", 60)
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    assert list(df.recommendation) == ["Correlation", "Distribution", "Occurrence", "Temporal"]
+
+    # the visualizations that are not executed in time are left out
+    df = pd.read_csv("lux/data/car.csv")
+    with scheduler.running(0):
+        vlist = VisList(["?"], df)
+    recommendation = {"action": "Distribution", "collection": vlist}
+    assert scheduler.drop_unexecuted(recommendation) == len(vlist)
+    assert len(recommendation["collection"]) == 0
+
+    with pytest.warns(UserWarning, match="must be a positive number or None"):
+        lux.config.time_budget = -1
+
+
+def test_async_recommendations(global_var, monkeypatch):
+    monkeypatch.setattr(lux.config, "async_recommendations", True)
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    widget = df.widget
+    pushed = []
+    widget.observe(lambda change: pushed.append(len(change["new"])), names="recommendations")
+    df._recs_job.wait()
+    assert df.widget is widget, "The displayed widget is updated in place"
+    assert len(widget.recommendations) == len(df.recommendation) == 4
+    assert pushed[0] < 4, "Actions are pushed to the widget one at a time"
+
+    # modifying the dataframe cancels the pending actions
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    job = df._recs_job
+    df["Weight"] = df["Weight"] * 2
+    assert job.cancelled
+    job.wait()
+    assert df._widget is None
+
+
+def test_async_cancelled_during_metadata(global_var, monkeypatch):
+    import threading
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    profile_column = PandasExecutor.profile_column
+    started = threading.Event()
+
+    def slow_profile_column(*args, **kwargs):
+        started.set()
+        time.sleep(0.5)
+        return profile_column(*args, **kwargs)
+
+    monkeypatch.setattr(PandasExecutor, "profile_column", staticmethod(slow_profile_column))
+    monkeypatch.setattr(lux.config, "async_recommendations", True)
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    job = df._recs_job
+    assert started.wait(5)
+    start = time.perf_counter()
+    df["Weight"] = df["Weight"] * 2
+    assert time.perf_counter() - start < 0.5 * len(df.columns) / 2, "The write stops the profiling"
+    job.wait()
+    assert job.cancelled and df._widget is None
+    monkeypatch.setattr(PandasExecutor, "profile_column", staticmethod(profile_column))
+    assert df.data_type["Weight"] == "quantitative"
+
+
+def test_progressive_levels(global_var, monkeypatch):
+    monkeypatch.setattr(lux.config, "async_recommendations", True)
+    monkeypatch.setattr(lux.config, "progressive_levels", [100, 200, 1000])
+    # the titles of the vis are those of the approximate vis
+    monkeypatch.setattr(lux.config, "plotting_style", None)
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    widget = df.widget
+    titles = []
+    widget.observe(
+        lambda change: titles.append(
+            [vspec.get("title") for rec in change["new"] for vspec in rec["vspec"]]
+        ),
+        names="recommendations",
+    )
+    df._recs_job.wait()
+    approximate = [title for pushed in titles for title in pushed if title]
+    assert all(title.startswith("≈") for title in titles[0]), "Approximate vis are flagged"
+    assert any("±" in title for title in approximate), "Counts are shown with their margin of error"
+    assert len(widget.recommendations) == len(df.recommendation) == 4
+    assert not any(
+        vspec.get("title") for rec in widget.recommendations for vspec in rec["vspec"]
+    ), "Approximate vis are replaced by the exact ones"
+
+
+def test_lazy_display(global_var, monkeypatch):
+    monkeypatch.setattr(lux.config, "lazy_display", True)
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    assert df._widget is None, "The widget is only computed when toggling to Lux"
+    assert len(df.recommendation) == 4
+
+    monkeypatch.setattr(lux.config, "lazy_display_delay", 0)
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    job = df._recs_job
+    while job.future is None:
+        time.sleep(0.01)
+    job.wait()
+    assert df._recs_fresh and df._widget is not None, "The widget is computed once the notebook is idle"
+
+    # the recommendations needed before the delay are computed right away
+    monkeypatch.setattr(lux.config, "lazy_display_delay", 60)
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    job = df._recs_job
+    assert len(df.recommendation) == 4
+    assert job.cancelled and job.future is None
+
+
+def test_lazy_display_cancelled(global_var, monkeypatch):
+    import threading
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    execute_aggregate = PandasExecutor.execute_aggregate
+    started = threading.Event()
+
+    def slow_execute_aggregate(*args, **kwargs):
+        started.set()
+        time.sleep(0.2)
+        return execute_aggregate(*args, **kwargs)
+
+    # the recommendations computed once the notebook is idle stop when the dataframe is modified
+    monkeypatch.setattr(PandasExecutor, "execute_aggregate", staticmethod(slow_execute_aggregate))
+    monkeypatch.setattr(lux.config, "lazy_display", True)
+    monkeypatch.setattr(lux.config, "lazy_display_delay", 0)
+    df._repr_html_()
+    job = df._recs_job
+    assert started.wait(5)
+    start = time.perf_counter()
+    df["Weight"] = df["Weight"] * 2
+    assert time.perf_counter() - start < 1, "The write does not wait for the recommendations"
+    job.wait()
+    assert job.cancelled and not df._recs_fresh and df._widget is None
+
+
+def test_action_workers(global_var, monkeypatch):
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    expected = dict(df.recommendation)
+
+    monkeypatch.setattr(lux.config, "action_workers", 4)
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    assert list(df.recommendation) == list(expected), "The actions are returned in registration order"
+    for action, vlist in df.recommendation.items():
+        assert [str(vis) for vis in vlist] == [str(vis) for vis in expected[action]]
+        for vis, expected_vis in zip(vlist, expected[action]):
+            assert vis.data.equals(expected_vis.data)
+
+    # an action that fails does not prevent the others from being displayed
+    def failing_action(ldf):
+        raise ValueError("failing action")
+
+    monkeypatch.setattr(lux.config, "pandas_fallback", True)
+    lux.config.register_action("failing", failing_action)
+    try:
+        df = pd.read_csv("lux/data/car.csv")
+        with pytest.warns(UserWarning, match="failing recommendations"):
+            df._repr_html_()
+        assert list(df.recommendation) == list(expected)
+    finally:
+        lux.config.remove_action("failing")
+
+
+def test_process_workers(global_var, monkeypatch):
+    from lux.executor import parallel
+
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    expected = df.recommendation
+
+    monkeypatch.setattr(parallel, "PROCESS_MIN_ROWS", 0)
+    monkeypatch.setattr(lux.config, "process_workers", 2)
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    recommendation = df.recommendation
+    assert id(df._sampled) in parallel._published, "The columns are shared with the worker processes"
+    assert list(recommendation) == list(expected)
+    for action, vlist in recommendation.items():
+        assert [str(vis) for vis in vlist] == [str(vis) for vis in expected[action]]
+        for vis, expected_vis in zip(vlist, expected[action]):
+            assert vis.data.equals(expected_vis.data)
+
+
+def test_ranking_strategy(global_var, monkeypatch):
+    import numpy as np
+
+    random = np.random.RandomState(0)
+    x = random.normal(size=5000)
+    columns = {"x": x}
+    for i in range(60):
+        # the first columns are increasingly noisy copies of x, the others are independent of x
+        columns[f"y{i}"] = (
+            x + random.normal(scale=0.1 * (i + 1), size=5000) if i < 5 else random.normal(size=5000)
+        )
+    data = pd.DataFrame(columns)
+    df = pd.DataFrame(data)
+    df.intent = ["x"]
+    df.maintain_recs()
+    expected = df.recommendation["Enhance"]
+
+    monkeypatch.setattr(lux.config, "ranking_strategy", "successive_halving")
+    df = pd.DataFrame(data)
+    df.intent = ["x"]
+    df.maintain_recs()
+    enhance = df.recommendation["Enhance"]
+    assert len(enhance) == len(expected) == 15
+    assert [str(vis) for vis in enhance[:5]] == [str(vis) for vis in expected[:5]], "Best vis are kept"
+    for vis, expected_vis in zip(enhance[:5], expected[:5]):
+        assert vis.score == expected_vis.score, "Kept vis are scored on the sample"
+        assert vis.data.equals(expected_vis.data)
+
+    # the pruned top k matches the exhaustive one when the top k stands out from the other candidates
+    monkeypatch.setattr(lux.config, "topk", 5)
+    df = pd.DataFrame(data)
+    df.intent = ["x"]
+    df.maintain_recs()
+    enhance = df.recommendation["Enhance"]
+    assert [str(vis) for vis in enhance] == [str(vis) for vis in expected[:5]]
+    assert [vis.score for vis in enhance] == [vis.score for vis in expected[:5]]
+
+
+def test_process_workers_unavailable(global_var, monkeypatch):
+    from lux.executor import parallel
+
+    monkeypatch.setattr(parallel, "available", lambda: False)
+    with pytest.warns(UserWarning, match="requires multiprocessing.shared_memory"):
+        lux.config.process_workers = 2
+    assert lux.config.process_workers == 0
@@ -382,3 +382,51 @@ def test_id_absenteeism_data():
         "Body mass index": "nominal",
         "Absenteeism time in hours": "nominal",
     }
+
+
+def test_column_profile():
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    df = pd.DataFrame(
+        {
+            "date": ["2020-01-01", "2020-01-02", None, "2020-01-02"],
+            "mixed": ["2020-01-01", "hello", "2020-01-02", "world"],
+            "year": [1998, 2001, 2001, 2004],
+            "rating": [1.0, 2.0, None, 2.0],
+            "price": [1.5, 2.0, 3.25, 2.0],
+        }
+    )
+    df.maintain_metadata()
+    profile = df._column_profile
+    assert profile["date"]["dtype_class"] == "string"
+    assert profile["date"]["null_count"] == 1
+    assert profile["date"]["cardinality"] == 3
+    assert profile["date"]["datetime_parse"] == 1
+    assert profile["mixed"]["datetime_parse"] == 0.5
+    assert profile["year"]["evenly_spaced"] == False
+    assert (profile["year"]["min"], profile["year"]["max"]) == (1998, 2004)
+    assert profile["rating"]["integral"] and not profile["price"]["integral"]
+    assert df._min_max["price"] == (1.5, 3.25)
+    assert df.data_type["date"] == "temporal"
+    assert df.data_type["mixed"] == "nominal"
+    assert df.data_type["year"] == "temporal"
+    assert df.data_type["rating"] == "nominal"
+    assert PandasExecutor.profile_column(pd.Series(range(600)))["evenly_spaced"]
+
+
+def test_detection_sample(monkeypatch):
+    dates = pd.date_range("2000-01-01", periods=1000).astype(str).tolist()
+    df = pd.DataFrame({"start": dates[:-1] + ["not a date"], "name": [f"name {i}" for i in range(1000)]})
+    df.maintain_metadata()
+    assert df.data_type["start"] != "temporal"
+    assert df._column_profile["name"]["datetime_parse"] < 0.5
+
+    monkeypatch.setattr(lux.config, "detection_sample_size", 50)
+    monkeypatch.setattr(lux.config, "detection_confidence", 0.95)
+    df = pd.DataFrame({"start": dates[:-1] + ["not a date"], "name": [f"name {i}" for i in range(1000)]})
+    df.maintain_metadata()
+    assert df.data_type["start"] == "temporal"
+    assert df.data_type["name"] != "temporal"
+    with pytest.warns(UserWarning, match="must be a number between 0"):
+        lux.config.detection_confidence = 1.5
+    assert lux.config.detection_confidence == 0.95